@@ -1,4 +1,19 @@
-from .color_modes import ColorMode, get_color_mode
+from .aio import AsyncColorWriter, acprint
+from .binary import colored_bytes, cprint_bytes, get_ansi_code_bytes
+from .color_modes import ColorMode, get_color_mode, refresh_color_mode
 from .colors import RGBColor
-from .core import aware_colored, colored, cprint, get_ansi_code, remove_ansi_codes
+from .compiled_style import Style
+from .core import (aware_colored, colored, cprint, disable_ansi_code_cache, enable_ansi_code_cache, get_ansi_code,
+                   iter_remove_ansi_codes, remove_ansi_codes)
+from .files import strip_file, transcode_file
+from .highlight import Highlighter
+from .instrumentation import stats
+from .palettes import PaletteTable
+from .spans import render_spans
 from .styles import TextStyle
+from .table import render_table
+from .text import ColoredText
+from .threaded import ThreadSafePrinter
+from .transcode import iter_transcode, transcode
+from .width import center, ljust, rjust, truncate, visible_width, wrap
+from .writer import ColorWriter
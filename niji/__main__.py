@@ -0,0 +1,183 @@
+"""Command-line filters for ANSI text: `python -m niji strip|downgrade|highlight`."""
+
+import argparse
+import mmap
+import os
+import re
+import stat
+import sys
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import BinaryIO
+
+from .ansi import split_unfinished, strip_escape_sequences
+from .color_modes import ColorMode, get_color_mode
+from .compiled_style import Style
+from .highlight import Highlighter
+from .styles import TextStyle
+from .transcode import transcode
+
+CHUNK_SIZE = 1 << 20
+
+_MODES = {
+    "24bit": ColorMode.TRUE_COLOR,
+    "256": ColorMode.EXTENDED_256,
+    "16": ColorMode.STANDARD_16,
+    "none": ColorMode.NONE,
+}
+
+
+def _iter_file_chunks(file: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """Read a binary file in large chunks, memory-mapping it if it's a regular file."""
+    try:
+        fd = file.fileno()
+        info = os.fstat(fd)
+    except (AttributeError, OSError, ValueError):
+        # not backed by a real file (e.g., a BytesIO)
+        fd = None
+
+    if fd is not None and stat.S_ISREG(info.st_mode) and info.st_size > 0:
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, len(mapped), chunk_size):
+                yield mapped[start:start + chunk_size]
+
+        return
+
+    # read1 returns whatever is available (up to chunk_size), so that output from a pipe isn't held back
+    read = getattr(file, "read1", file.read)
+    while chunk := read(chunk_size):
+        yield chunk
+
+
+def _iter_input_chunks(paths: Sequence[str], stdin: BinaryIO, chunk_size: int,
+                       on_error: Callable[[str, OSError], None]) -> Iterator[bytes]:
+    """Yield the contents of the given files (or of stdin, for "-" or when there are no files) in binary chunks. A file
+    which can't be read is passed to on_error, and skipped (like cat does).
+    """
+    for path in paths or ["-"]:
+        if path == "-":
+            yield from _iter_file_chunks(stdin, chunk_size)
+            continue
+
+        try:
+            with open(path, "rb") as file:
+                yield from _iter_file_chunks(file, chunk_size)
+        except OSError as e:
+            on_error(path, e)
+
+
+def _iter_complete(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Re-split chunks so that no escape sequence is split between two of them."""
+    pending = b""
+    for chunk in chunks:
+        head, pending = split_unfinished(pending + chunk if pending else chunk)
+        if head:
+            yield head
+
+    if pending:
+        yield pending
+
+
+def parse_style(spec: str) -> Style:
+    """Parse a comma-separated style description, e.g., "bold,#FF0000,bg:#000080".
+
+    Each item is a TextStyle name (case-insensitive), a hex foreground color (optionally written as fg:COLOR), or a
+    background color (bg:COLOR). Colors can also be 256-color indices (e.g., fg:196).
+    """
+    fg: str | int | None = None
+    bg: str | int | None = None
+    styles = TextStyle.NONE
+
+    for item in filter(None, (item.strip() for item in spec.split(","))):
+        role, _, value = item.rpartition(":")
+        color: str | int = int(value) if value.isdigit() else value
+
+        if role == "bg":
+            bg = color
+        elif role == "fg" or (not role and (value.startswith("#") or re.fullmatch(r"[0-9A-Fa-f]{6}", value))):
+            fg = color
+        elif not role and item.upper() in TextStyle.__members__:
+            styles |= TextStyle[item.upper()]
+        else:
+            raise ValueError(f"Invalid style item: {item!r}. Expected a text style, a color, fg:COLOR, or bg:COLOR.")
+
+    return Style(fg=fg, bg=bg, styles=styles or None)
+
+
+def parse_rule(rule: str) -> tuple[str, Style]:
+    """Parse a PATTERN=STYLE highlighting rule. The pattern may itself contain "=": the style is after the last one."""
+    pattern, sep, spec = rule.rpartition("=")
+    if not sep or not pattern:
+        raise ValueError(f"Invalid highlighting rule: {rule!r}. Expected PATTERN=STYLE.")
+
+    return pattern, parse_style(spec)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m niji", description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    strip = subparsers.add_parser("strip", help="remove every ANSI escape sequence")
+    strip.add_argument("files", nargs="*", metavar="FILE", help="files to read (default: stdin)")
+
+    downgrade = subparsers.add_parser("downgrade", help="convert colors for a terminal with fewer colors")
+    downgrade.add_argument("--mode", "-m", required=True, choices=["256", "16", "none"])
+    downgrade.add_argument("files", nargs="*", metavar="FILE", help="files to read (default: stdin)")
+
+    highlight = subparsers.add_parser("highlight", help="color the text matching regular expressions")
+    highlight.add_argument("rules", nargs="+", metavar="PATTERN=STYLE",
+                           help='e.g., "ERROR=bold,#FF0000" or "\\d+=fg:#00AAFF,bg:#000000"')
+    highlight.add_argument("--mode", "-m", default="auto", choices=["auto", *_MODES],
+                           help="color mode (default: detected from stdout)")
+    highlight.add_argument("--input", "-i", action="append", default=[], metavar="FILE",
+                           help="file to read (can be repeated; default: stdin)")
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None, stdin: BinaryIO | None = None, stdout: BinaryIO | None = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    stdin = sys.stdin.buffer if stdin is None else stdin
+    stdout = sys.stdout.buffer if stdout is None else stdout
+
+    failed = []
+
+    def report(path: str, error: OSError) -> None:
+        # (everything before the failed file is written out first, so that the message appears in the right place)
+        stdout.flush()
+        print(f"niji: {path}: {error.strerror or error}", file=sys.stderr)
+        failed.append(path)
+
+    def read_input(paths: Sequence[str]) -> Iterator[bytes]:
+        return _iter_input_chunks(paths, stdin, CHUNK_SIZE, report)
+
+    if args.command == "highlight":
+        try:
+            highlighter = Highlighter(parse_rule(rule) for rule in args.rules)
+        except (ValueError, re.error) as e:
+            parser.error(str(e))
+
+        mode = get_color_mode(sys.stdout) if args.mode == "auto" else _MODES[args.mode]
+        output = highlighter.iter_highlight(read_input(args.input), mode)
+    elif args.command == "downgrade":
+        mode = _MODES[args.mode]
+        output = (transcode(chunk, mode) for chunk in _iter_complete(read_input(args.files)))
+    else:
+        output = (strip_escape_sequences(chunk) for chunk in _iter_complete(read_input(args.files)))
+
+    try:
+        for chunk in output:
+            stdout.write(chunk)
+
+        stdout.flush()
+    except BrokenPipeError:
+        # the reader went away (e.g., `| head`): stop quietly, and keep Python from complaining when it flushes stdout
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
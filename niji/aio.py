@@ -0,0 +1,233 @@
+import asyncio
+import io
+import os
+from collections import deque
+from collections.abc import Callable
+from types import TracebackType
+from typing import IO, Any
+
+from . import instrumentation
+from .color_modes import ColorMode, get_color_mode
+from .colors import ColorInput
+from .compiled_style import Style
+from .styles import TextStyle
+from .writer import ColorWriter
+
+
+class _PipeProtocol(asyncio.Protocol):
+    """The protocol for a pipe which is only written to: it tracks whether the transport's buffer is full, and when the
+    pipe is closed (calling on_close then, if given).
+    """
+
+    def __init__(self, on_close: Callable[[], object] | None = None) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._on_close = on_close
+        self._paused = False
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._closed: asyncio.Future[None] = self._loop.create_future()
+
+    def pause_writing(self) -> None:
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        self._paused = False
+        self._wake_waiters(None)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._paused = False
+        self._wake_waiters(exc)
+
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+        if self._on_close is not None:
+            self._on_close()
+
+    def _wake_waiters(self, exc: Exception | None) -> None:
+        for waiter in self._waiters:
+            if not waiter.done():
+                if exc is None:
+                    waiter.set_result(None)
+                else:
+                    waiter.set_exception(exc)
+
+    async def drain(self) -> None:
+        """Wait until the transport can take more data."""
+        if not self._paused:
+            return
+
+        waiter = self._loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        finally:
+            self._waiters.remove(waiter)
+
+
+class _PipeWriter:
+    """The parts of asyncio.StreamWriter which AsyncColorWriter uses, for a transport connected to a _PipeProtocol."""
+
+    def __init__(self, transport: asyncio.WriteTransport, protocol: _PipeProtocol) -> None:
+        self.transport = transport
+        self.protocol = protocol
+
+    def get_extra_info(self, name: str, default: Any = None) -> Any:
+        return self.transport.get_extra_info(name, default)
+
+    def write(self, data: bytes) -> None:
+        self.transport.write(data)
+
+    async def drain(self) -> None:
+        await self.protocol.drain()
+
+    def close(self) -> None:
+        self.transport.close()
+
+    async def wait_closed(self) -> None:
+        await asyncio.shield(self.protocol._closed)
+
+
+class AsyncColorWriter(ColorWriter):
+    """Buffer styled text for an asyncio.StreamWriter, without ever blocking the event loop.
+
+    Styles are resolved and merged exactly like in ColorWriter. Everything written during one iteration of the event
+    loop (e.g., by many coroutines logging at once) is encoded and handed to the transport as a single batch, at the end
+    of the iteration, or sooner if the buffer reaches buffer_size characters. The transport never blocks: to respect its
+    backpressure, use `awrite`/`aprint` (or `acprint`), which wait while the transport's buffer is full.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, *, mode: ColorMode = ColorMode.AUTO, buffer_size: int = 8192,
+                 encoding: str = "utf-8", errors: str = "strict") -> None:
+        """Wrap the stream writer. For ColorMode.AUTO, the mode is detected from the pipe behind the writer's transport,
+        if it has one (and otherwise, the writer is treated as not being a terminal).
+        """
+        if mode == ColorMode.AUTO:
+            pipe = writer.get_extra_info("pipe")
+            # (an in-memory stream is never a terminal, but still lets NO_COLOR/FORCE_COLOR apply)
+            mode = get_color_mode(pipe if hasattr(pipe, "isatty") else io.StringIO())
+
+        super().__init__(writer, mode=mode, buffer_size=buffer_size)  # type: ignore[arg-type]
+
+        self.writer = writer
+        self.encoding = encoding
+        self.errors = errors
+
+        self._flush_handle: asyncio.Handle | None = None
+        self._drain_lock = asyncio.Lock()
+
+    def write(self, text: str, style: Style | None = None, *, fg: ColorInput | None = None,
+              bg: ColorInput | None = None, styles: TextStyle | None = None) -> None:
+        """Buffer the text, formatted with either the given Style or the given fg/bg/styles configuration. The buffer is
+        handed to the transport at the end of the current iteration of the event loop.
+        """
+        super().write(text, style, fg=fg, bg=bg, styles=styles)
+
+        if self._size and self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_soon(self.flush)
+
+    async def awrite(self, text: str, style: Style | None = None, *, fg: ColorInput | None = None,
+                     bg: ColorInput | None = None, styles: TextStyle | None = None) -> None:
+        """Buffer the text like write, then wait until the transport can take more data."""
+        self.write(text, style, fg=fg, bg=bg, styles=styles)
+        await self._wait_writable()
+
+    async def aprint(self, text: str, style: Style | None = None, *, fg: ColorInput | None = None,
+                     bg: ColorInput | None = None, styles: TextStyle | None = None, end: str = "\n") -> None:
+        """Buffer the text like print, then wait until the transport can take more data."""
+        self.print(text, style, fg=fg, bg=bg, styles=styles, end=end)
+        await self._wait_writable()
+
+    def flush(self) -> None:
+        """Hand everything that is buffered to the transport (without waiting for it to be sent)."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        self._write_buffer()
+
+    async def drain(self) -> None:
+        """Hand everything that is buffered to the transport, and wait until the transport can take more data."""
+        self.flush()
+        await self._wait_writable()
+
+    async def aclose(self) -> None:
+        """Drain the buffer, then close the stream writer."""
+        await self.drain()
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def _wait_writable(self) -> None:
+        # StreamWriter.drain only waits while the transport is paused, so this is cheap when the reader keeps up; the
+        # lock makes the coroutines take turns, instead of all waking up at once when the transport resumes
+        async with self._drain_lock:
+            await self.writer.drain()
+
+    def _write_buffer(self) -> None:
+        self._close_run()
+
+        if self._parts:
+            data = "".join(self._parts).encode(self.encoding, self.errors)
+
+            if instrumentation._enabled:
+                instrumentation.timed_write(self.writer.write, data)
+            else:
+                self.writer.write(data)
+
+            self._parts = []
+
+        self._size = 0
+
+    async def __aenter__(self) -> "AsyncColorWriter":
+        return self
+
+    async def __aexit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None,
+                        traceback: TracebackType | None) -> None:
+        await self.drain()
+
+
+async def from_pipe(pipe: IO, *, mode: ColorMode = ColorMode.AUTO, buffer_size: int = 8192,
+                    encoding: str = "utf-8") -> AsyncColorWriter:
+    """Return an AsyncColorWriter for a pipe, pty, or socket file (e.g., sys.stdout), connected to the running event
+    loop. The color mode is detected from the pipe itself, for ColorMode.AUTO. Regular files aren't supported (asyncio
+    raises a ValueError), since writing to them doesn't block the way writing to a pipe does.
+
+    The writer uses a duplicate of the pipe's file descriptor, so closing it leaves the pipe open. However, asyncio
+    switches the pipe to non-blocking mode, and the duplicate shares that mode with the pipe (and with every other
+    descriptor for it, e.g., in a parent shell): until the writer is closed, ordinary (synchronous) writes to the pipe,
+    like print, can fail with BlockingIOError or be cut short. Close the writer with aclose before the event loop exits,
+    which puts the pipe back in its original mode.
+    """
+    if mode == ColorMode.AUTO:
+        mode = get_color_mode(pipe)  # type: ignore[arg-type]
+
+    # anything already written to the pipe's own buffer should come first
+    pipe.flush()
+
+    fd = pipe.fileno()
+    blocking = os.get_blocking(fd)
+
+    def restore_blocking() -> None:
+        # (through the original descriptor, which shares its mode with the duplicate, and outlives it)
+        if not pipe.closed and os.get_blocking(fd) != blocking:
+            os.set_blocking(fd, blocking)
+
+    loop = asyncio.get_running_loop()
+    duplicate = os.fdopen(os.dup(fd), "wb", buffering=0)
+    try:
+        transport, protocol = await loop.connect_write_pipe(lambda: _PipeProtocol(restore_blocking), duplicate)
+    except BaseException:
+        duplicate.close()
+        restore_blocking()
+        raise
+
+    writer = _PipeWriter(transport, protocol)
+
+    return AsyncColorWriter(writer, mode=mode, buffer_size=buffer_size, encoding=encoding)  # type: ignore[arg-type]
+
+
+async def acprint(text: str, style: Style | None = None, *, fg: ColorInput | None = None, bg: ColorInput | None = None,
+                  styles: TextStyle | None = None, file: AsyncColorWriter, end: str = "\n") -> None:
+    """Same as `cprint`, but for asyncio: the text is batched with everything else printed to the file during the same
+    iteration of the event loop, and this waits (without blocking the loop) while the stream can't take more data.
+    """
+    await file.aprint(text, style, fg=fg, bg=bg, styles=styles, end=end)
@@ -0,0 +1,150 @@
+import re
+from collections.abc import Iterator
+from enum import Enum, auto
+from typing import AnyStr, NamedTuple
+
+
+class TokenKind(Enum):
+    TEXT = auto()  # plain text
+    CSI = auto()  # control sequence, ESC [ ... (e.g., SGR codes, cursor movement)
+    OSC = auto()  # operating system command, ESC ] ... (e.g., window titles, hyperlinks)
+    DCS = auto()  # device control string, ESC P ...
+    SOS = auto()  # start of string, ESC X ...
+    PM = auto()  # privacy message, ESC ^ ...
+    APC = auto()  # application program command, ESC _ ...
+    ESC = auto()  # any other escape sequence (e.g., ESC 7, ESC ( B)
+
+
+class Token(NamedTuple):
+    kind: TokenKind
+    payload: str | bytes  # the text, or the sequence without its introducer and string terminator (e.g., "1;31m")
+
+
+# the longest payload of an OSC, DCS, SOS, PM, or APC sequence
+MAX_STRING_LENGTH = 4096
+
+# Every ESC starts exactly one sequence, following ECMA-48:
+#   - CSI: parameter bytes (0x30-0x3F), intermediate bytes (0x20-0x2F), then a final byte (0x40-0x7E)
+#   - OSC: any text up to BEL or ST (ESC \)
+#   - DCS/SOS/PM/APC: any text up to ST
+#   - otherwise: intermediate bytes, then a final byte (0x30-0x7E)
+# Like a terminal, a sequence is cut short by the ESC of the next one, or by the end of the input. A CSI containing any
+# other byte is malformed, and only its ESC [ is treated as a sequence. A lone ESC is a sequence of its own.
+# An unterminated string sequence (OSC, DCS, SOS, PM, APC) is also cut short by a newline, or after MAX_STRING_LENGTH
+# characters, so that a stray introducer can't swallow the rest of the input.
+_SEQUENCE_SOURCE = (
+    r"\x1b(?:"
+    r"\[(?P<csi>[0-?]*[ -/]*(?:[@-~]|(?=\x1b)|\Z))"
+    rf"|\](?P<osc>[^\x07\x1b\n]{{0,{MAX_STRING_LENGTH}}})(?:\x07|\x1b\\)?"
+    rf"|(?P<intro>[PX^_])(?P<string>[^\x1b\n]{{0,{MAX_STRING_LENGTH}}})(?:\x1b\\)?"
+    r"|(?P<esc>[ -/]*[0-~]?)"
+    r")"
+)
+
+_SEQUENCE = re.compile(_SEQUENCE_SOURCE)
+_SEQUENCE_BYTES = re.compile(_SEQUENCE_SOURCE.encode())
+
+_STRING_KINDS = {"P": TokenKind.DCS, "X": TokenKind.SOS, "^": TokenKind.PM, "_": TokenKind.APC}
+_STRING_KINDS_BYTES = {ord(intro): kind for intro, kind in _STRING_KINDS.items()}
+
+
+def _sequence_pattern(s: AnyStr) -> "re.Pattern[AnyStr]":
+    return _SEQUENCE if isinstance(s, str) else _SEQUENCE_BYTES  # type: ignore[return-value]
+
+
+def _kind_of(match: "re.Match[AnyStr]") -> TokenKind:
+    group = match.lastgroup
+    if group == "string":
+        intro = match.group("intro")
+        return _STRING_KINDS[intro] if isinstance(intro, str) else _STRING_KINDS_BYTES[intro[0]]
+
+    return TokenKind.CSI if group == "csi" else TokenKind.OSC if group == "osc" else TokenKind.ESC
+
+
+def _is_finished(match: "re.Match[AnyStr]") -> bool:
+    """Return whether the matched sequence was properly terminated (rather than being cut short)."""
+    group = match.lastgroup
+    assert group is not None
+
+    if group in ("osc", "string"):
+        # the terminator follows the payload (and a payload of the maximum length is cut off there, either way)
+        return match.end() > match.end(group) or match.end(group) - match.start(group) >= MAX_STRING_LENGTH
+
+    payload = match.group(group)
+    final = payload[-1:]
+    if not final:
+        return False
+
+    # CSI final bytes are 0x40-0x7E, and other sequences' final bytes are 0x30-0x7E
+    return ord(final) >= (0x40 if group == "csi" else 0x30)
+
+
+def _scan(s: AnyStr) -> Iterator[tuple[TokenKind, AnyStr, int, int]]:
+    """Yield (kind, payload, start, end) for each token, where s[start:end] is the token's raw text."""
+    pattern = _sequence_pattern(s)
+    esc = "\x1b" if isinstance(s, str) else b"\x1b"
+    position, length = 0, len(s)
+
+    while position < length:
+        # skip straight over plain text
+        index = s.find(esc, position)  # type: ignore[arg-type]
+        if index == -1:
+            yield TokenKind.TEXT, s[position:], position, length
+            return
+
+        if index > position:
+            yield TokenKind.TEXT, s[position:index], position, index
+
+        match = pattern.match(s, index)
+        assert match is not None  # every ESC starts a sequence
+
+        yield _kind_of(match), match.group(match.lastgroup), index, match.end()
+        position = match.end()
+
+
+def tokenize(s: AnyStr, /) -> Iterator[Token]:
+    """Split a str or bytes into plain text and escape sequences, in a single pass.
+
+    Recognizes CSI (including SGR), OSC (including hyperlinks and window titles), DCS, SOS, PM, APC, and other escape
+    sequences, yielding a (kind, payload) Token for each one, and for each run of plain text in between.
+    """
+    for kind, payload, _, _ in _scan(s):
+        yield Token(kind, payload)
+
+
+def strip_escape_sequences(s: AnyStr, /) -> AnyStr:
+    """Return a copy of the str or bytes with every escape sequence removed (i.e., only its TEXT tokens)."""
+    if isinstance(s, str):
+        if "\x1b" not in s:
+            return s
+
+        return _SEQUENCE.sub("", s)
+
+    if b"\x1b" not in s:
+        return s
+
+    return _SEQUENCE_BYTES.sub(b"", s)
+
+
+def split_unfinished(buffer: AnyStr, /) -> tuple[AnyStr, AnyStr]:
+    """Split a chunk of a stream into a head which can be processed now, and a tail holding the start of an escape
+    sequence which the next chunk might finish (or an empty tail if there isn't one).
+
+    Processing the head and then (tail + next chunk) gives the same text as processing the joined chunks. (The only
+    difference in tokens is when a string terminator, ESC \\, is itself split: its sequence then ends at the ESC, and
+    the terminator becomes a separate ESC token.)
+    """
+    esc = "\x1b" if isinstance(buffer, str) else b"\x1b"
+
+    # sequences can't contain an ESC (except as part of their terminator), so an unfinished one starts at the last ESC
+    index = buffer.rfind(esc)  # type: ignore[arg-type]
+    if index == -1:
+        return buffer, buffer[:0]
+
+    match = _sequence_pattern(buffer).match(buffer, index)
+    assert match is not None
+
+    if match.end() == len(buffer) and not _is_finished(match):
+        return buffer[:index], buffer[index:]
+
+    return buffer, buffer[:0]
@@ -0,0 +1,320 @@
+"""Benchmarks for niji's hot paths: `python -m niji.bench`.
+
+Each function is timed (in operations per second) for every color mode and color input type, and its memory use is
+measured with tracemalloc. The results can be saved as a JSON baseline and compared against on later runs.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from typing import Any, NamedTuple, TextIO
+
+from .color_modes import ColorMode, get_color_mode, refresh_color_mode
+from .colors import ColorInput, RGBColor, parse_color_input
+from .compiled_style import Style
+from .core import colored, cprint, remove_ansi_codes
+from .indexed_colors import find_quantized_index
+from .styles import TextStyle
+from .threaded import ThreadSafePrinter
+
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32)
+
+# the same color, in each of the ways it can be given
+COLOR_INPUTS: dict[str, ColorInput] = {
+    "int": 202,
+    "hex": "#FF5F00",
+    "tuple": (255, 95, 0),
+    "RGBColor": RGBColor(255, 95, 0),
+}
+
+# (AUTO isn't a rendering mode: it's resolved by get_color_mode, which is measured separately)
+MODES = (ColorMode.TRUE_COLOR, ColorMode.EXTENDED_256, ColorMode.STANDARD_16, ColorMode.NONE)
+
+_STYLE = Style(fg="#FF5F00", styles=TextStyle.BOLD)
+
+_PLAIN_LINE = "2024-05-01 12:00:00 INFO  request handled in 12.5ms (200 OK) " * 2
+_STYLED_LINE = colored("2024-05-01 12:00:00", styles=TextStyle.DIM) + " " + colored("INFO", fg="#00AA00") + \
+    " request handled in " + colored("12.5ms", fg=(0, 170, 255), styles=TextStyle.BOLD) + " (200 OK)"
+
+
+class Benchmark(NamedTuple):
+    name: str
+    func: Callable[[], object]
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    ops_per_sec: float
+    peak_bytes: int  # the most memory allocated at once during a call
+    retained_bytes: int  # the memory still allocated after a call (e.g., by caches), on average
+
+
+def _benchmarks(stream: TextIO, terminal: TextIO | None = None) -> Iterator[Benchmark]:
+    """Yield every benchmark. The get_color_mode benchmarks use the given stream (which should have a file descriptor,
+    but not be a terminal), and the given terminal, if any.
+    """
+    for input_name, color in COLOR_INPUTS.items():
+        yield Benchmark(f"parse_color_input[{input_name}]", lambda color=color: parse_color_input(color))
+
+    target = RGBColor(255, 95, 0)
+    for mode in (ColorMode.EXTENDED_256, ColorMode.STANDARD_16):
+        yield Benchmark(f"find_quantized_index[{mode.name}]", lambda mode=mode: find_quantized_index(target, mode))
+
+    for mode in MODES:
+        for input_name, color in COLOR_INPUTS.items():
+            yield Benchmark(f"colored[{mode.name},{input_name}]",
+                            lambda color=color, mode=mode: colored("some text", fg=color, mode=mode))
+
+    yield Benchmark("remove_ansi_codes[plain]", lambda: remove_ansi_codes(_PLAIN_LINE))
+    yield Benchmark("remove_ansi_codes[styled]", lambda: remove_ansi_codes(_STYLED_LINE))
+
+    # a stream with a file descriptor hits the detection cache (compare with detecting it every time); an in-memory
+    # stream is always detected
+    streams = {"file": stream} if terminal is None else {"file": stream, "tty": terminal}
+    for stream_name, file in streams.items():
+        yield Benchmark(f"get_color_mode[cached,{stream_name}]", lambda file=file: get_color_mode(file))
+        yield Benchmark(f"get_color_mode[detect,{stream_name}]", lambda file=file: _detect(file))
+
+    in_memory = io.StringIO()
+    yield Benchmark("get_color_mode[in-memory]", lambda: get_color_mode(in_memory))
+
+
+def _detect(stream: TextIO) -> ColorMode:
+    refresh_color_mode(stream)
+    return get_color_mode(stream)
+
+
+@contextlib.contextmanager
+def _open_terminal() -> Iterator[TextIO | None]:
+    """Open a pseudo-terminal to write to, or yield None where there aren't any (e.g., on Windows)."""
+    try:
+        leader, follower = os.openpty()  # type: ignore[attr-defined]
+    except (AttributeError, OSError):
+        yield None
+        return
+
+    try:
+        with open(follower, "w") as terminal:
+            yield terminal
+    finally:
+        os.close(leader)
+
+
+def _measure_speed(func: Callable[[], object], repeat: int) -> float:
+    """Return the best of `repeat` measurements of func's calls per second."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return number / min(timer.repeat(repeat=repeat, number=number))
+
+
+def _measure_memory(func: Callable[[], object], calls: int = 100) -> tuple[int, int]:
+    """Return the peak memory allocated during one call of func, and the memory retained per call (on average)."""
+    func()  # warm up any caches, so that they don't count as retained memory
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        peak = 0
+
+        for _ in range(calls):
+            start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - start)
+
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak, max(0, after - before) // calls
+
+
+def run_benchmarks(names: Sequence[str] = (), *, repeat: int = 3) -> list[BenchmarkResult]:
+    """Run every benchmark whose name contains one of the given strings (or every benchmark, if none are given)."""
+    if repeat < 1:
+        raise ValueError(f"Number of repeats should be at least 1, not {repeat!r}.")
+
+    results = []
+    with open(os.devnull, "w") as stream, _open_terminal() as terminal:
+        for benchmark in _benchmarks(stream, terminal):
+            if names and not any(name in benchmark.name for name in names):
+                continue
+
+            ops_per_sec = _measure_speed(benchmark.func, repeat)
+            peak_bytes, retained_bytes = _measure_memory(benchmark.func)
+            results.append(BenchmarkResult(benchmark.name, ops_per_sec, peak_bytes, retained_bytes))
+
+    return results
+
+
+def save_baseline(results: Sequence[BenchmarkResult], path: str | os.PathLike[str]) -> None:
+    """Write the results to a JSON file, to be compared against later (see load_baseline and find_regressions)."""
+    data = {
+        "python": sys.version.split()[0],
+        "results": {result.name: result._asdict() for result in results},
+    }
+
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+        file.write("\n")
+
+
+def load_baseline(path: str | os.PathLike[str]) -> dict[str, BenchmarkResult]:
+    """Read results saved by save_baseline, by benchmark name."""
+    with open(path) as file:
+        data: dict[str, Any] = json.load(file)
+
+    return {name: BenchmarkResult(**result) for name, result in data["results"].items()}
+
+
+def find_regressions(results: Sequence[BenchmarkResult], baseline: Mapping[str, BenchmarkResult],
+                     threshold: float) -> list[BenchmarkResult]:
+    """Return the results which are more than `threshold` (e.g., 0.1 for 10%) slower than their baseline. Benchmarks
+    missing from the baseline are skipped.
+    """
+    if not 0 <= threshold < 1:
+        raise ValueError(f"Regression threshold should be 0 <= x < 1, not {threshold!r}.")
+
+    return [
+        result for result in results
+        if result.name in baseline and result.ops_per_sec < baseline[result.name].ops_per_sec * (1 - threshold)
+    ]
+
+
+def format_results(results: Sequence[BenchmarkResult], baseline: Mapping[str, BenchmarkResult] | None = None) -> str:
+    """Format the results as a table, along with the change in speed from the baseline (if given)."""
+    width = max((len(result.name) for result in results), default=9)
+    header = f"{'benchmark':<{width}}  {'ops/s':>13}  {'peak B':>7}  {'kept B':>7}"
+    lines = [header + "  vs baseline" if baseline else header]
+
+    for result in results:
+        line = f"{result.name:<{width}}  {result.ops_per_sec:>13,.0f}  {result.peak_bytes:>7}"
+        line += f"  {result.retained_bytes:>7}"
+
+        if baseline and (base := baseline.get(result.name)) is not None:
+            line += f"  {result.ops_per_sec / base.ops_per_sec - 1:>+11.1%}"
+
+        lines.append(line)
+
+    return "\n".join(lines)
+
+
+def _run_threads(threads: int, lines_per_thread: int, print_line: Callable[[int], None]) -> float:
+    """Run print_line(i) lines_per_thread times in each of the threads, returning the elapsed time in seconds."""
+    barrier = threading.Barrier(threads + 1)
+
+    def work() -> None:
+        barrier.wait()
+        for i in range(lines_per_thread):
+            print_line(i)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+
+    return time.perf_counter() - start
+
+
+def bench_thread_scaling(file: TextIO, thread_counts: Sequence[int] = THREAD_COUNTS,
+                         lines_per_thread: int = 10_000) -> list[tuple[int, float, float]]:
+    """Measure the throughput of printing styled lines from several threads at once, returning (threads, lines/s with
+    ThreadSafePrinter, lines/s with cprint under one global lock) for each thread count.
+    """
+    printer = ThreadSafePrinter(file, mode=ColorMode.TRUE_COLOR)
+    global_lock = threading.Lock()
+
+    def print_safe(i: int) -> None:
+        with printer.line():
+            printer.write("worker ", _STYLE)
+            printer.write(f"line {i}")
+
+    def print_locked(i: int) -> None:
+        # the usual workaround: serialize every cprint call, including its formatting
+        with global_lock:
+            cprint("worker ", fg="#FF5F00", styles=TextStyle.BOLD, mode=ColorMode.TRUE_COLOR, file=file, end="")
+            cprint(f"line {i}", mode=ColorMode.TRUE_COLOR, file=file)
+
+    results = []
+    for threads in thread_counts:
+        lines = threads * lines_per_thread
+        safe = lines / _run_threads(threads, lines_per_thread, print_safe)
+        locked = lines / _run_threads(threads, lines_per_thread, print_locked)
+        results.append((threads, safe, locked))
+
+    return results
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m niji.bench", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", metavar="NAME",
+                        help="only run the benchmarks whose names contain one of these (e.g., colored[EXTENDED_256)")
+    parser.add_argument("--repeat", type=int, default=3, metavar="N", help="timing runs per benchmark (default: 3)")
+    parser.add_argument("--save", metavar="FILE", help="save the results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="compare against a saved baseline, exiting with status 1 if anything got slower")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="the slowdown which counts as a regression (default: 0.1, i.e., 10%%)")
+
+    threads = parser.add_argument_group("thread scaling (instead of the benchmarks above)")
+    threads.add_argument("--threads", type=int, nargs="+", metavar="N",
+                         help=f"print from each number of threads (e.g., {' '.join(map(str, THREAD_COUNTS))})")
+    threads.add_argument("--lines", type=int, default=10_000, metavar="N", help="lines printed per thread")
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    if args.threads:
+        with open(os.devnull, "w") as sink:
+            scaling = bench_thread_scaling(sink, args.threads, args.lines)
+
+        print(f"{'threads':>7}  {'ThreadSafePrinter':>17}  {'cprint + lock':>13}  (lines/s)")
+        for threads, safe, locked in scaling:
+            print(f"{threads:>7}  {safe:>17,.0f}  {locked:>13,.0f}")
+
+        return 0
+
+    try:
+        baseline = load_baseline(args.baseline) if args.baseline else None
+        results = run_benchmarks(args.names, repeat=args.repeat)
+        regressions = find_regressions(results, baseline, args.threshold) if baseline else []
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        parser.error(str(e))
+
+    if not results:
+        parser.error(f"No benchmark matches {' or '.join(map(repr, args.names))}.")
+
+    print(format_results(results, baseline))
+
+    if args.save:
+        save_baseline(results, args.save)
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) more than {args.threshold:.0%} slower than the baseline:")
+        for result in regressions:
+            print(f"  {result.name}")
+
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import sys
+from collections.abc import Hashable
+from typing import BinaryIO
+
+from . import instrumentation
+from .cache import LRUCache
+from .color_modes import ColorMode, get_color_mode
+from .colors import ColorInput
+from .compiled_style import Style
+from .core import _color_cache_key, get_ansi_code
+from .styles import TextStyle
+
+ANSI_RESET_BYTES = b"\033[0m"
+
+BytesLike = bytes | bytearray | memoryview
+
+# (code, prefix) for each style and mode, keyed either by (Style, mode) or by (fg, bg, styles, mode)
+_prefixes: LRUCache[tuple[Hashable, ...], tuple[bytes, bytes]] = LRUCache(maxsize=256)
+
+
+def _get_code_and_prefix(style: Style | None, fg: ColorInput | None, bg: ColorInput | None,
+                         styles: TextStyle | None, mode: ColorMode) -> tuple[bytes, bytes]:
+    if mode == ColorMode.AUTO:
+        raise ValueError(f"Bytes rendering with mode={mode!r} is not supported.")
+
+    if style is not None:
+        if fg is not None or bg is not None or styles is not None:
+            raise ValueError("Bytes rendering takes either a style or fg/bg/styles, not both.")
+
+        key: tuple[Hashable, ...] = (style, mode)
+    else:
+        key = (_color_cache_key(fg), _color_cache_key(bg), styles, mode)
+
+    if (cached := _prefixes.get(key)) is not None:
+        return cached
+
+    if style is not None:
+        prefix = style.prefix(mode).encode("ascii")
+        code = prefix[2:-1]
+    else:
+        code = get_ansi_code(fg=fg, bg=bg, styles=styles, mode=mode).encode("ascii")
+        prefix = b"\033[" + code + b"m" if code else b""
+
+    _prefixes.put(key, (code, prefix))
+    return code, prefix
+
+
+def get_ansi_code_bytes(*, fg: ColorInput | None = None, bg: ColorInput | None = None,
+                        styles: TextStyle | None = None, mode: ColorMode) -> bytes:
+    """Same as `get_ansi_code`, but returning bytes. The result is cached per fg/bg/styles and mode."""
+    return _get_code_and_prefix(None, fg, bg, styles, mode)[0]
+
+
+def colored_bytes(text: BytesLike, style: Style | None = None, *, fg: ColorInput | None = None,
+                  bg: ColorInput | None = None, styles: TextStyle | None = None,
+                  mode: ColorMode = ColorMode.TRUE_COLOR) -> bytes:
+    """Same as `colored`, but for bytes (or any bytes-like payload, such as a memoryview, which isn't decoded). The
+    formatting is either the given Style or the given fg/bg/styles configuration, and its ANSI prefix is cached as bytes
+    per style and mode.
+    """
+    _, prefix = _get_code_and_prefix(style, fg, bg, styles, mode)
+
+    if prefix:
+        return b"".join((prefix, text, ANSI_RESET_BYTES))
+
+    return text if isinstance(text, bytes) else bytes(text)
+
+
+def cprint_bytes(text: BytesLike, style: Style | None = None, *, fg: ColorInput | None = None,
+                 bg: ColorInput | None = None, styles: TextStyle | None = None, mode: ColorMode = ColorMode.AUTO,
+                 file: BinaryIO | None = None, end: bytes = b"\n") -> None:
+    """Same as `cprint`, but writing bytes to a binary stream (sys.stdout.buffer by default) in a single write call."""
+    if file is None:
+        file = sys.stdout.buffer
+
+    if mode == ColorMode.AUTO:
+        mode = get_color_mode(file)  # type: ignore[arg-type]
+
+    _, prefix = _get_code_and_prefix(style, fg, bg, styles, mode)
+
+    content = b"".join((prefix, text, ANSI_RESET_BYTES, end) if prefix else (text, end))
+
+    if instrumentation._enabled:
+        instrumentation.timed_write(file.write, content)
+    else:
+        file.write(content)
@@ -3,6 +3,8 @@ import sys
 from enum import Enum, auto
 from typing import TextIO
 
+from . import instrumentation
+
 
 class ColorMode(Enum):
     NONE = 0  # force plain text
@@ -12,17 +14,81 @@ class ColorMode(Enum):
     STANDARD_16 = auto()  # 4-bit (16 colors)
 
 
+# the environment variables which affect color mode detection
+_COLOR_ENV_VARS = ("NO_COLOR", "FORCE_COLOR", "TERM", "COLORTERM")
+
+# The same variables, as keys of the dict behind os.environ. Looking up a missing variable through os.environ raises
+# and catches a KeyError, which costs more than the whole cache lookup, so cache hits check the dict directly.
+_COLOR_ENV_KEYS = tuple(map(os.environ.encodekey, _COLOR_ENV_VARS))
+
+# detected color modes per file descriptor, along with the values of _COLOR_ENV_VARS they were detected with
+_detected_modes: dict[int, tuple[tuple[object, ...], ColorMode]] = {}
+
+
+def _stream_fileno(stream: TextIO) -> int | None:
+    try:
+        return stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        # in-memory streams (like StringIO) and closed files don't have a file descriptor
+        return None
+
+
 def get_color_mode(stream: TextIO = sys.stdout) -> ColorMode:
-    """Determine the color mode for the active terminal."""
+    """Determine the color mode for the active terminal.
+
+    The result is cached per file descriptor, so repeated calls don't query the stream again. The cached result is
+    discarded whenever NO_COLOR, FORCE_COLOR, TERM, or COLORTERM change, or when refresh_color_mode is called.
+    """
+    if instrumentation._enabled:
+        return instrumentation.timed("detect", _get_color_mode, stream)
+
+    return _get_color_mode(stream)
+
+
+def _env_snapshot() -> tuple[object, ...]:
+    """Return the values of _COLOR_ENV_VARS, as cheaply as possible (in whatever form os.environ stores them)."""
+    if (data := getattr(os.environ, "_data", None)) is not None:
+        return tuple(map(data.get, _COLOR_ENV_KEYS))
+
+    # (e.g., os.environ was replaced by a plain dict)
+    return tuple(map(os.environ.get, _COLOR_ENV_VARS))
+
+
+def _get_color_mode(stream: TextIO) -> ColorMode:
+    if (fd := _stream_fileno(stream)) is None:
+        return _detect_color_mode(stream, tuple(map(os.environ.get, _COLOR_ENV_VARS)))
+
+    snapshot = _env_snapshot()
+    cached = _detected_modes.get(fd)
+    if cached is not None and cached[0] == snapshot:
+        return cached[1]
+
+    mode = _detect_color_mode(stream, tuple(map(os.environ.get, _COLOR_ENV_VARS)))
+    _detected_modes[fd] = (snapshot, mode)
+    return mode
+
+
+def refresh_color_mode(stream: TextIO | None = None) -> None:
+    """Forget the cached color mode of the given stream (or of every stream), so that the next get_color_mode call
+    detects it again.
+    """
+    if stream is None:
+        _detected_modes.clear()
+    elif (fd := _stream_fileno(stream)) is not None:
+        _detected_modes.pop(fd, None)
+
+
+def _detect_color_mode(stream: TextIO, env: tuple[str | None, ...]) -> ColorMode:
+    no_color, force_color, term, colorterm = env
 
-    if "NO_COLOR" in os.environ:
+    if no_color is not None:
         return ColorMode.NONE
 
-    if "FORCE_COLOR" not in os.environ and not stream.isatty():
+    if force_color is None and not stream.isatty():
         return ColorMode.NONE
 
-    env_term = os.environ.get("TERM", "").lower()
-    env_colorterm = os.environ.get("COLORTERM", "").lower()
+    env_term = (term or "").lower()
+    env_colorterm = (colorterm or "").lower()
 
     if env_colorterm in ("truecolor", "24bit"):
         return ColorMode.TRUE_COLOR
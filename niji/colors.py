@@ -1,13 +1,29 @@
 import re
+from array import array
 from collections.abc import Sequence
 from typing import NamedTuple, cast
 
+from . import instrumentation
+
 
 class RGBColor(NamedTuple):
     red: int
     green: int
     blue: int
 
+    @property
+    def packed(self) -> int:
+        """The color as a single 24-bit integer, 0xRRGGBB."""
+        return (self.red << 16) | (self.green << 8) | self.blue
+
+    @classmethod
+    def from_packed(cls, value: int) -> "RGBColor":
+        """Create a color from a 24-bit integer, 0xRRGGBB (the inverse of `packed`)."""
+        if not (0 <= value <= 0xFFFFFF):
+            raise ValueError(f"Packed color should be 0 <= x <= 0xFFFFFF, not {value!r}.")
+
+        return cls(value >> 16, (value >> 8) & 0xFF, value & 0xFF)
+
 
 # An ordered collection of the indexed colors.
 # 256-color mode can use all of them; 16-color mode can only use indices 0-15.
@@ -272,6 +288,9 @@ COLOR_MAP_256 = [
     RGBColor(238, 238, 238),
 ]
 
+# The same colors, packed (see RGBColor.packed) into contiguous memory.
+COLOR_MAP_256_PACKED = array("I", (color.packed for color in COLOR_MAP_256))
+
 
 def color_distance(p: RGBColor, q: RGBColor, /) -> float:
     """Calculate the Euclidean distance between two colours."""
@@ -287,6 +306,13 @@ ColorInput = int | str | tuple[int, int, int] | RGBColor | Sequence[int]
 
 
 def parse_color_input(color: ColorInput) -> RGBColor:
+    if instrumentation._enabled:
+        return instrumentation.timed("parse", _parse_color_input, color)
+
+    return _parse_color_input(color)
+
+
+def _parse_color_input(color: ColorInput) -> RGBColor:
     match color:
         case RGBColor():
             # simple passthrough
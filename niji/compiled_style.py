@@ -0,0 +1,72 @@
+from .color_modes import ColorMode
+from .colors import ColorInput, RGBColor, parse_color_input
+from .core import ANSI_RESET, get_ansi_code
+from .styles import TextStyle
+
+
+class Style:
+    """A reusable fg/bg/styles combination.
+
+    The colors are parsed once, when the Style is created, and the ANSI prefix is generated at most once per ColorMode,
+    so rendering text is just a string concatenation.
+    """
+
+    __slots__ = ("_fg", "_bg", "_styles", "_prefixes")
+
+    def __init__(self, *, fg: ColorInput | None = None, bg: ColorInput | None = None,
+                 styles: TextStyle | None = None) -> None:
+        self._fg = None if fg is None else parse_color_input(fg)
+        self._bg = None if bg is None else parse_color_input(bg)
+        self._styles = styles
+        self._prefixes: dict[ColorMode, str] = {}
+
+    @property
+    def fg(self) -> RGBColor | None:
+        return self._fg
+
+    @property
+    def bg(self) -> RGBColor | None:
+        return self._bg
+
+    @property
+    def styles(self) -> TextStyle | None:
+        return self._styles
+
+    def prefix(self, mode: ColorMode = ColorMode.TRUE_COLOR) -> str:
+        """Return the ANSI sequence which applies this style in the given mode, or "" if there is nothing to apply."""
+        try:
+            return self._prefixes[mode]
+        except KeyError:
+            pass
+
+        if mode == ColorMode.AUTO:
+            raise ValueError(f"Style.prefix(..., mode={mode!r}) is not supported.")
+
+        code = get_ansi_code(fg=self._fg, bg=self._bg, styles=self._styles, mode=mode)
+        prefix = f"\033[{code}m" if code else ""
+        self._prefixes[mode] = prefix
+        return prefix
+
+    def render(self, text: str, mode: ColorMode = ColorMode.TRUE_COLOR) -> str:
+        """Return the text wrapped in this style's ANSI codes.
+        This is equivalent to `colored` with the same arguments.
+        """
+        if prefix := self.prefix(mode):
+            return prefix + text + ANSI_RESET
+
+        return text
+
+    def __call__(self, text: str, mode: ColorMode = ColorMode.TRUE_COLOR) -> str:
+        return self.render(text, mode)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Style):
+            return NotImplemented
+
+        return (self._fg, self._bg, self._styles) == (other._fg, other._bg, other._styles)
+
+    def __hash__(self) -> int:
+        return hash((self._fg, self._bg, self._styles))
+
+    def __repr__(self) -> str:
+        return f"Style(fg={self._fg!r}, bg={self._bg!r}, styles={self._styles!r})"
@@ -1,24 +1,87 @@
-import re
 import sys
-from typing import TextIO
+from collections.abc import Hashable, Iterable, Iterator
+from typing import IO, AnyStr, TextIO
 
+from . import instrumentation
+from .ansi import split_unfinished, strip_escape_sequences
+from .cache import LRUCache
 from .color_modes import ColorMode, get_color_mode
-from .colors import ColorInput, parse_color_input
+from .colors import ColorInput, RGBColor, parse_color_input
 from .indexed_colors import get_color_ansi_code_component_indexed
 from .roles import ColorRole
 from .styles import TextStyle, get_style_ansi_code_component
 from .truecolor import get_color_ansi_code_component_24bit
 
+ANSI_RESET = "\033[0m"
+
+
+# opt-in memoization of get_ansi_code (see enable_ansi_code_cache)
+_ansi_code_cache: LRUCache[tuple[Hashable, Hashable, TextStyle | None, ColorMode], str] | None = None
+
+
+def enable_ansi_code_cache(maxsize: int = 256) -> LRUCache:
+    """Memoize get_ansi_code in a size-bounded LRU cache and return the cache (e.g., to inspect its stats).
+    If the cache is already enabled, it is kept (with the new maxsize).
+    """
+    global _ansi_code_cache
+
+    if _ansi_code_cache is None:
+        _ansi_code_cache = LRUCache(maxsize)
+    else:
+        _ansi_code_cache.maxsize = maxsize
+
+    return _ansi_code_cache
+
+
+def disable_ansi_code_cache() -> None:
+    """Stop memoizing get_ansi_code, dropping the cache."""
+    global _ansi_code_cache
+    _ansi_code_cache = None
+
+
+def get_ansi_code_cache() -> LRUCache | None:
+    """Return the get_ansi_code cache, or None if it is not enabled."""
+    return _ansi_code_cache
+
+
+def _color_cache_key(color: ColorInput | None) -> Hashable:
+    # RGBColor, int, and str inputs are hashable and can't be confused with one another, so they can be used as they
+    # are (and on a hit, hex strings aren't parsed at all). Anything else, like list[int] or a tuple which might hold
+    # floats, is normalized to an RGBColor first, which also validates it.
+    if color is None or type(color) in (RGBColor, int, str):
+        return color
+
+    return parse_color_input(color)
+
 
 def get_ansi_code(*, fg: ColorInput | None = None, bg: ColorInput | None = None, styles: TextStyle | None = None,
                   mode: ColorMode) -> str:
     """Get the ANSI code sequence for the given combination of foreground (fg), background (bg) colors, using the given terminal mode."""
+    if instrumentation._enabled:
+        return instrumentation.timed("style", _get_ansi_code, fg, bg, styles, mode)
+
+    return _get_ansi_code(fg, bg, styles, mode)
+
+
+def _get_ansi_code(fg: ColorInput | None, bg: ColorInput | None, styles: TextStyle | None, mode: ColorMode) -> str:
     if mode == ColorMode.AUTO:
         raise ValueError(f"get_ansi_code(..., mode={mode!r}) is not supported.")
 
     if mode == ColorMode.NONE:
         return ""
 
+    if (cache := _ansi_code_cache) is None:
+        return _build_ansi_code(fg, bg, styles, mode)
+
+    key = (_color_cache_key(fg), _color_cache_key(bg), styles, mode)
+    if (code := cache.get(key)) is None:
+        code = _build_ansi_code(fg, bg, styles, mode)
+        cache.put(key, code)
+
+    return code
+
+
+def _build_ansi_code(fg: ColorInput | None, bg: ColorInput | None, styles: TextStyle | None, mode: ColorMode) -> str:
     blocks: list[str] = []
 
     if styles is not None:
@@ -47,9 +110,7 @@ def colored(text: str, *, fg: ColorInput | None = None, bg: ColorInput | None =
         raise ValueError(f"colored(..., mode={mode!r}) is not supported.")
 
     if ansi := get_ansi_code(fg=fg, bg=bg, styles=styles, mode=mode):
-        ansi_prefix = f"\033[{ansi}m"
-        ansi_reset = "\033[0m"
-        return f"{ansi_prefix}{text}{ansi_reset}"
+        return f"\033[{ansi}m{text}{ANSI_RESET}"
 
     return text
 
@@ -68,9 +129,39 @@ def cprint(text: str, *, fg: ColorInput | None = None, bg: ColorInput | None = N
         mode = get_color_mode(file)
 
     content = colored(text, fg=fg, bg=bg, styles=styles, mode=mode)
-    file.write(content + end)
+
+    if instrumentation._enabled:
+        instrumentation.timed_write(file.write, content + end)
+    else:
+        file.write(content + end)
 
 
 def remove_ansi_codes(s: str, /) -> str:
-    """Return a copy of the given string but with all ANSI codes removed."""
-    return re.sub(r"\033\[(.*?)m", "", s)
+    """Return a copy of the given string but with all ANSI codes removed.
+    This includes every kind of escape sequence (such as cursor movement and hyperlinks), not just colors and styles.
+    """
+    return strip_escape_sequences(s)
+
+
+def _read_chunks(file: IO[AnyStr], chunk_size: int) -> Iterator[AnyStr]:
+    while chunk := file.read(chunk_size):
+        yield chunk
+
+
+def iter_remove_ansi_codes(source: Iterable[AnyStr] | IO[AnyStr], /, *, chunk_size: int = 1 << 16) -> Iterator[AnyStr]:
+    """Remove all ANSI codes from a stream of str or bytes chunks (or a file object, read chunk_size at a time),
+    yielding the cleaned chunks. Codes which are split across chunks are removed as well. Only an unfinished code is
+    held back between chunks, and since an unterminated OSC or other string sequence ends at a newline or after
+    niji.ansi.MAX_STRING_LENGTH characters, memory use doesn't grow with the size of the stream.
+    """
+    chunks = _read_chunks(source, chunk_size) if hasattr(source, "read") else source
+
+    pending: AnyStr | None = None
+    for chunk in chunks:
+        head, pending = split_unfinished(pending + chunk if pending else chunk)
+
+        if head:
+            yield strip_escape_sequences(head)
+
+    if pending:
+        yield strip_escape_sequences(pending)
@@ -0,0 +1,96 @@
+import mmap
+import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from .ansi import strip_escape_sequences
+from .color_modes import ColorMode
+from .transcode import transcode
+
+StrPath = str | os.PathLike[str]
+
+
+def _chunk_ranges(mapped: mmap.mmap, chunk_size: int) -> Iterator[tuple[int, int]]:
+    """Split the mapped file into [start, end) ranges of about chunk_size bytes, each ending just after a newline (or at
+    the end of the file). Escape sequences never span a newline (see niji.ansi), so no range ends in the middle of one.
+    """
+    size = len(mapped)
+    start = 0
+
+    while start < size:
+        newline = mapped.find(b"\n", start + chunk_size - 1)
+        end = size if newline == -1 else newline + 1
+
+        yield start, end
+        start = end
+
+
+def _process_range(path: StrPath, start: int, end: int, mode: ColorMode | None) -> bytes:
+    """Strip (for mode=None) or transcode one range of the file. This runs in the worker processes."""
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        chunk = mapped[start:end]
+
+    return strip_escape_sequences(chunk) if mode is None else transcode(chunk, mode)
+
+
+def _process_file(src: StrPath, dst: StrPath, mode: ColorMode | None, workers: int | None, chunk_size: int) -> int:
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size should be at least 1, not {chunk_size!r}.")
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers < 1:
+        raise ValueError(f"Number of workers should be at least 1, not {workers!r}.")
+
+    # opening dst would truncate src before it's read
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise ValueError(f"The source and destination are the same file: {os.fspath(src)!r}.")
+
+    written = 0
+    with open(src, "rb") as source, open(dst, "wb") as destination:
+        if os.fstat(source.fileno()).st_size == 0:
+            return 0
+
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            ranges = _chunk_ranges(mapped, chunk_size)
+
+            if workers == 1:
+                for start, end in ranges:
+                    written += destination.write(_process_range(src, start, end, mode))
+
+                return written
+
+            # keep a bounded window of chunks in flight, so that memory use doesn't depend on the size of the file,
+            # and write the results out in order
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending: deque[Future[bytes]] = deque()
+
+                for start, end in ranges:
+                    pending.append(executor.submit(_process_range, src, start, end, mode))
+                    if len(pending) >= 2 * workers:
+                        written += destination.write(pending.popleft().result())
+
+                while pending:
+                    written += destination.write(pending.popleft().result())
+
+    return written
+
+
+def strip_file(src: StrPath, dst: StrPath, *, workers: int | None = None, chunk_size: int = 1 << 24) -> int:
+    """Write a copy of the file src to dst with every escape sequence removed, returning the number of bytes written.
+
+    The file is memory-mapped and split at newlines into chunks of about chunk_size bytes, which are processed in
+    parallel by `workers` processes (by default, one per CPU; with workers=1, everything is done in this process).
+    """
+    return _process_file(src, dst, None, workers, chunk_size)
+
+
+def transcode_file(src: StrPath, dst: StrPath, mode: ColorMode, *, workers: int | None = None,
+                   chunk_size: int = 1 << 24) -> int:
+    """Write a copy of the file src to dst with its SGR codes rewritten for the given mode (like `transcode`), returning
+    the number of bytes written. The file is processed in parallel, like `strip_file`.
+    """
+    if mode == ColorMode.AUTO:
+        raise ValueError(f"transcode_file(..., mode={mode!r}) is not supported.")
+
+    return _process_file(src, dst, mode, workers, chunk_size)
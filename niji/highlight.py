@@ -0,0 +1,235 @@
+import re
+from collections.abc import Iterable, Iterator
+from typing import IO, AnyStr
+
+from .ansi import _SEQUENCE_SOURCE
+from .color_modes import ColorMode
+from .compiled_style import Style
+from .core import ANSI_RESET, _read_chunks
+
+Rule = tuple[str, Style | None]
+
+# the names of the groups the Highlighter adds around the escape sequences and around each rule
+_GROUP_PREFIX = "_niji_"
+_ESCAPE_GROUP = f"{_GROUP_PREFIX}esc"
+
+# the escape sequences, without the named groups of niji.ansi (so that they can't clash with the rules' groups)
+_ESCAPE_SOURCE = re.sub(r"\(\?P<\w+>", "(?:", _SEQUENCE_SOURCE)
+
+_LEADING_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+_CONDITIONAL_REFERENCE = re.compile(r"\(\?\((\d+)\)")
+_OCTAL_DIGITS = "01234567"
+
+
+def _scope_leading_flags(pattern: str) -> str:
+    """Rewrite inline flags at the start of the pattern (e.g., "(?i)error") as a scoped group ("(?i:error)"), since
+    global flags are only allowed at the start of the whole pattern.
+    """
+    flags = ""
+    while match := _LEADING_FLAGS.match(pattern):
+        flags += match.group(1)
+        pattern = pattern[match.end():]
+
+    if not flags:
+        return pattern
+
+    # in verbose mode, a comment on the last line would swallow the closing parenthesis
+    return f"(?{flags}:{pattern}\n)" if "x" in flags else f"(?{flags}:{pattern})"
+
+
+def _renumber_references(pattern: str, offset: int) -> str:
+    """Shift the numbered backreferences in the pattern (\\N, and (?(N)...) conditions) by offset, for when its groups
+    are no longer numbered from 1.
+    """
+    if not offset or ("\\" not in pattern and "(?(" not in pattern):
+        return pattern
+
+    def shifted(number: int) -> str:
+        if number + offset > 99:
+            raise re.error(f"too many groups before the backreference \\{number} (at most 99 are supported)", pattern)
+
+        return str(number + offset)
+
+    parts = []
+    i, length = 0, len(pattern)
+    in_class = False
+
+    while i < length:
+        char = pattern[i]
+
+        if char == "\\":
+            digits = pattern[i + 1:i + 4]
+            if in_class or not digits[:1].isdigit() or digits[0] == "0" or (
+                    len(digits) == 3 and all(digit in _OCTAL_DIGITS for digit in digits)):
+                # any other escape, or an octal escape
+                parts.append(pattern[i:i + 2])
+                i += 2
+                continue
+
+            end = i + (3 if digits[1:2].isdigit() else 2)
+            parts.append("\\" + shifted(int(pattern[i + 1:end])))
+            i = end
+            continue
+
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            # a "]" at the very start of a class (after an optional "^") is a literal
+            end = i + 1 + (pattern[i + 1:i + 2] == "^")
+            end += pattern[end:end + 1] == "]"
+            parts.append(pattern[i:end])
+            i = end
+            in_class = True
+            continue
+        elif match := _CONDITIONAL_REFERENCE.match(pattern, i):
+            parts.append(f"(?({shifted(int(match.group(1)))})")
+            i = match.end()
+            continue
+
+        parts.append(char)
+        i += 1
+
+    return "".join(parts)
+
+
+class Highlighter:
+    """Color every match of a set of regular expressions, in a single pass over the text.
+
+    The rules are (pattern, Style) pairs, compiled together into one pattern. Where matches overlap, the leftmost match
+    wins, and among matches starting at the same place, the rule listed first wins (not the longest match). Escape
+    sequences already in the text are skipped over whole, so they are never highlighted or broken up. Matches never
+    span lines when highlighting a stream.
+
+    Bytes are highlighted as UTF-8 text (with any invalid bytes passed through unchanged), so that the rules match the
+    same characters in bytes as in str.
+
+    Each rule is compiled on its own first, so that an invalid pattern is reported for its rule. Since the rules then
+    share one pattern, a few things are rewritten or restricted:
+
+    - inline flags at the start of a rule (e.g., "(?i)error") only apply to that rule
+    - numbered backreferences (\\1, or (?(1)...)) are renumbered, and can't refer past the 99th group of the combined
+      pattern; named groups and (?P=name) references are unaffected, but names must be unique across the rules
+    - group names starting with "_niji_" are reserved
+    """
+
+    def __init__(self, rules: Iterable[Rule], *, flags: int = 0) -> None:
+        """Compile the (pattern, Style) rules, with the given re flags. A rule's Style may be None, to leave its matches
+        unstyled (and so to keep later rules from matching there).
+        """
+        self._rules: tuple[Rule, ...] = tuple(rules)
+        if not self._rules:
+            raise ValueError("Highlighter needs at least one rule.")
+
+        self._flags = flags
+
+        # escape sequences come first in the alternation, so that they're matched (and skipped) before any rule
+        alternatives = [f"(?P<{_ESCAPE_GROUP}>{_ESCAPE_SOURCE})"]
+        groups = 1
+
+        for i, (pattern, _) in enumerate(self._rules):
+            try:
+                compiled = re.compile(pattern, flags)
+            except re.error as e:
+                raise re.error(f"invalid pattern for highlighting rule {i}: {e.msg}", pattern, e.pos) from None
+
+            if reserved := [name for name in compiled.groupindex if name.startswith(_GROUP_PREFIX)]:
+                raise re.error(f"group names starting with {_GROUP_PREFIX!r} are reserved: {reserved[0]!r}", pattern)
+
+            # the rule's own groups come right after the group wrapping it
+            rewritten = _renumber_references(_scope_leading_flags(pattern), groups + 1)
+            alternatives.append(f"(?P<{_GROUP_PREFIX}r{i}>{rewritten})")
+            groups += 1 + compiled.groups
+
+        source = "|".join(alternatives)
+
+        self._pattern = re.compile(source, self._flags)
+        self._prefixes: dict[ColorMode, dict[str, str]] = {}
+
+    @property
+    def rules(self) -> tuple[Rule, ...]:
+        return self._rules
+
+    def _get_prefixes(self, mode: ColorMode) -> dict[str, str]:
+        """Return the ANSI prefix of each rule's group in the given mode (leaving out the rules with no styling)."""
+        try:
+            return self._prefixes[mode]
+        except KeyError:
+            pass
+
+        if mode == ColorMode.AUTO:
+            raise ValueError(f"Highlighter.highlight(..., mode={mode!r}) is not supported.")
+
+        prefixes = {}
+        for i, (_, style) in enumerate(self._rules):
+            if style is not None and (prefix := style.prefix(mode)):
+                prefixes[f"{_GROUP_PREFIX}r{i}"] = prefix
+
+        self._prefixes[mode] = prefixes
+        return prefixes
+
+    def highlight(self, text: AnyStr, /, mode: ColorMode = ColorMode.TRUE_COLOR) -> AnyStr:
+        """Return the str or bytes with every match styled by its rule."""
+        if isinstance(text, str):
+            return self._highlight(text, mode)
+
+        # (a bytes pattern would match the rules' non-ASCII characters byte by byte, and wrap each byte in codes)
+        decoded = text.decode("utf-8", "surrogateescape")
+        highlighted = self._highlight(decoded, mode)
+        return text if highlighted is decoded else highlighted.encode("utf-8", "surrogateescape")
+
+    def _highlight(self, text: str, mode: ColorMode) -> str:
+        prefixes = self._get_prefixes(mode)
+        if not prefixes:
+            return text
+
+        parts = []
+        position = 0
+        for match in self._pattern.finditer(text):
+            prefix = prefixes.get(match.lastgroup)  # type: ignore[arg-type]
+            if prefix is None or match.start() == match.end():
+                continue
+
+            parts.append(text[position:match.start()])
+            parts.append(prefix)
+            parts.append(match.group())
+            parts.append(ANSI_RESET)
+            position = match.end()
+
+        if not parts:
+            return text
+
+        parts.append(text[position:])
+        return "".join(parts)
+
+    def __call__(self, text: AnyStr, /, mode: ColorMode = ColorMode.TRUE_COLOR) -> AnyStr:
+        return self.highlight(text, mode)
+
+    def iter_highlight(self, source: Iterable[AnyStr] | IO[AnyStr], /, mode: ColorMode = ColorMode.TRUE_COLOR, *,
+                       chunk_size: int = 1 << 16) -> Iterator[AnyStr]:
+        """Highlight a stream of str or bytes chunks (or a file object, read chunk_size at a time), yielding the
+        highlighted chunks. The chunks are re-split at newlines, so that matches aren't cut in two by a chunk boundary.
+        """
+        chunks = _read_chunks(source, chunk_size) if hasattr(source, "read") else source
+
+        for lines in _iter_lines(chunks):
+            yield self.highlight(lines, mode)
+
+    def __repr__(self) -> str:
+        return f"Highlighter({list(self._rules)!r})"
+
+
+def _iter_lines(chunks: Iterable[AnyStr]) -> Iterator[AnyStr]:
+    """Re-split chunks at line boundaries, so that each one holds whole lines (except possibly the last)."""
+    pending: AnyStr | None = None
+    for chunk in chunks:
+        buffer = pending + chunk if pending else chunk
+        end = buffer.rfind("\n" if isinstance(buffer, str) else b"\n") + 1  # type: ignore[arg-type]
+
+        if end:
+            yield buffer[:end]
+
+        pending = buffer[end:]
+
+    if pending:
+        yield pending
+
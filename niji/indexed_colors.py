@@ -1,24 +1,228 @@
+import functools
+import sys
+from array import array
+from collections.abc import Iterable, Sequence
+from types import ModuleType
+from typing import Any
+
+from . import instrumentation
 from .color_modes import ColorMode
-from .colors import COLOR_MAP_256, RGBColor, color_distance
+from .colors import COLOR_MAP_256, COLOR_MAP_256_PACKED, RGBColor, parse_color_input
+from .palettes import PaletteTable
 from .roles import ColorRole
 
+# The 6x6x6 color cube (indices 16-231) uses these levels on each channel.
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+# For every channel value, the index of the nearest cube level (ties resolve to the lower level, which matches the
+# lower palette index a linear scan would pick).
+_CUBE_LEVEL_INDEX = bytes(min(range(6), key=lambda i: abs(_CUBE_LEVELS[i] - c)) for c in range(256))
+
+# For every channel sum r + g + b (0-765), the offset of the nearest grayscale ramp entry (232-255, which are
+# (8 + 10k, 8 + 10k, 8 + 10k)). The distance to a gray (v, v, v) only depends on |3v - (r + g + b)|.
+_GRAY_INDEX_BY_SUM = bytes(min(range(24), key=lambda i: abs(3 * (8 + 10 * i) - s)) for s in range(766))
+
+# The channels of COLOR_MAP_256 as parallel byte arrays, so that scans read plain bytes instead of unpacking an RGBColor
+# per entry, and interleaved (r0, g0, b0, r1, ...) for NumPy.
+_PALETTE_RED = bytes(packed >> 16 for packed in COLOR_MAP_256_PACKED)
+_PALETTE_GREEN = bytes((packed >> 8) & 0xFF for packed in COLOR_MAP_256_PACKED)
+_PALETTE_BLUE = bytes(packed & 0xFF for packed in COLOR_MAP_256_PACKED)
+_PALETTE_RGB = bytes(channel for color in COLOR_MAP_256 for channel in color)
+
+# Lookup tables for the palettes which aren't quantized analytically. These are built on first use.
+_PALETTE_TABLES = {
+    ColorMode.STANDARD_16: PaletteTable(COLOR_MAP_256[:16]),
+}
+
+
+def _find_quantized_index_256(target: RGBColor) -> int:
+    """Return the same index as a linear scan over COLOR_MAP_256, but by only checking the 16 base colors, the nearest
+    cube color, and the nearest gray instead of all 256 entries.
+    """
+    r, g, b = target
+    reds, greens, blues = _PALETTE_RED, _PALETTE_GREEN, _PALETTE_BLUE
+
+    # the base colors come first, so they win any ties against the cube and the ramp
+    best_index = 0
+    best_distance = (reds[0] - r) ** 2 + (greens[0] - g) ** 2 + (blues[0] - b) ** 2
+    for index in range(1, 16):
+        if (distance := (reds[index] - r) ** 2 + (greens[index] - g) ** 2 + (blues[index] - b) ** 2) < best_distance:
+            best_index = index
+            best_distance = distance
+
+    # Euclidean distance is separable per channel, so the nearest cube color is the nearest level on each channel
+    levels = _CUBE_LEVELS
+    lr, lg, lb = _CUBE_LEVEL_INDEX[r], _CUBE_LEVEL_INDEX[g], _CUBE_LEVEL_INDEX[b]
+    if (distance := (levels[lr] - r) ** 2 + (levels[lg] - g) ** 2 + (levels[lb] - b) ** 2) < best_distance:
+        best_index = 16 + 36 * lr + 6 * lg + lb
+        best_distance = distance
+
+    gray_offset = _GRAY_INDEX_BY_SUM[r + g + b]
+    gray = 8 + 10 * gray_offset
+    if (gray - r) ** 2 + (gray - g) ** 2 + (gray - b) ** 2 < best_distance:
+        best_index = 232 + gray_offset
+
+    return best_index
+
+
+def get_palette_table(mode: ColorMode) -> PaletteTable:
+    """Return the lookup table used to quantize colors in the given mode (e.g., to build it ahead of time)."""
+    if mode not in _PALETTE_TABLES:
+        raise ValueError(f"There is no palette lookup table for {mode!r}.")
+
+    return _PALETTE_TABLES[mode]
+
 
 def find_quantized_index(target: RGBColor, mode: ColorMode) -> int:
     """Return the index of the quantized color closest to the target within the given mode's space."""
+    if instrumentation._enabled:
+        return instrumentation.timed("quantize", _find_quantized_index, target, mode)
+
+    return _find_quantized_index(target, mode)
+
+
+def _find_quantized_index(target: RGBColor, mode: ColorMode) -> int:
+    if mode == ColorMode.EXTENDED_256:
+        return _find_quantized_index_256(target)
+
+    if mode == ColorMode.STANDARD_16:
+        return _PALETTE_TABLES[mode].lookup(target)
+
+    raise ValueError(f"Quantizing is only valid on 16/256 color modes, not {mode!r}.")
+
+
+@functools.cache
+def _import_numpy() -> ModuleType | None:
+    # NumPy is optional: find_quantized_indices uses it when it is installed, but niji doesn't depend on it
+    try:
+        import numpy
+    except ImportError:
+        return None
+
+    return numpy
+
+
+def find_quantized_indices(colors: Sequence[RGBColor] | bytes | bytearray | memoryview | array | Any,
+                           mode: ColorMode) -> Any:
+    """Return the quantized index (see find_quantized_index) of every color in a batch.
+
+    The colors can be given as a sequence of RGBColor (or RGB triples), as a flat buffer of RGB bytes such as
+    bytes([r0, g0, b0, r1, g1, b1, ...]) or array("B", ...), as an array("I") (or array("L")) of packed 0xRRGGBB colors
+    (see RGBColor.packed), or as an (N, 3) NumPy array. When NumPy is installed, the batch is quantized in vectorized
+    passes. NumPy arrays give back a NumPy uint8 array; every other input gives back an array("B"). Arrays of any other
+    typecode raise a TypeError.
+    """
     if mode not in (ColorMode.STANDARD_16, ColorMode.EXTENDED_256):
         raise ValueError(f"Quantizing is only valid on 16/256 color modes, not {mode!r}.")
 
-    pool = COLOR_MAP_256 if mode == ColorMode.EXTENDED_256 else COLOR_MAP_256[:16]
+    np = _import_numpy()
+    is_numpy_array = np is not None and isinstance(colors, np.ndarray)
 
-    best_index = 0
-    best_distance = float("inf")
+    if isinstance(colors, array) and colors.typecode not in ("B", *_PACKED_TYPECODES):
+        raise TypeError(f"Array of colors must have typecode 'B' (RGB bytes) or 'I'/'L' (packed colors), not "
+                        f"{colors.typecode!r}.")
 
-    for index, color in enumerate(pool):
-        if (distance := color_distance(color, target)) < best_distance:
-            best_index = index
-            best_distance = distance
+    if isinstance(colors, array) and colors.typecode in _PACKED_TYPECODES:
+        if colors and max(colors) > 0xFFFFFF:
+            raise ValueError("Packed colors should have values 0 <= x <= 0xFFFFFF.")
 
-    return best_index
+        if np is None:
+            return _find_quantized_indices_python(colors, mode)
+
+        packed = np.frombuffer(colors, dtype=np.dtype(f"u{colors.itemsize}"))
+        pixels = np.stack((packed >> 16, (packed >> 8) & 0xFF, packed & 0xFF), axis=1)
+
+    elif isinstance(colors, (bytes, bytearray, memoryview, array)):
+        buffer = memoryview(colors).cast("B")
+        if len(buffer) % 3:
+            raise ValueError(f"RGB buffer length should be a multiple of 3, not {len(buffer)}.")
+
+        if np is None:
+            return _find_quantized_indices_python(_pack_rgb_buffer(buffer), mode)
+
+        pixels = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, 3)
+
+    elif is_numpy_array:
+        pixels = colors
+        if pixels.ndim != 2 or pixels.shape[1] != 3:
+            raise ValueError(f"RGB array should have shape (N, 3), not {pixels.shape}.")
+
+        if pixels.dtype.kind not in "ui":
+            raise TypeError(f"RGB array must hold integers, not {pixels.dtype}.")
+
+        if pixels.size and (pixels.min() < 0 or pixels.max() > 255):
+            raise ValueError("RGB array should have values 0 <= x <= 255.")
+
+    elif np is None:
+        return _find_quantized_indices_python((parse_color_input(color).packed for color in colors), mode)
+
+    else:
+        pixels = np.array([parse_color_input(color) for color in colors], dtype=np.uint8).reshape(-1, 3)
+
+    indices = _find_quantized_indices_numpy(np, pixels, mode)
+    return indices if is_numpy_array else array("B", indices.tobytes())
+
+
+# array typecodes which hold packed colors (rather than raw RGB bytes) in find_quantized_indices
+_PACKED_TYPECODES = ("I", "L")
+
+
+def _pack_rgb_buffer(buffer: memoryview) -> array:
+    """Convert a flat buffer of RGB bytes into an array("I") of packed colors, without a Python-level loop."""
+    # spread the channels into big-endian 0x00RRGGBB words, then read them as native integers
+    words = bytearray(len(buffer) // 3 * 4)
+    words[1::4], words[2::4], words[3::4] = buffer[0::3], buffer[1::3], buffer[2::3]
+
+    packed = array("I", words)
+    if sys.byteorder == "little":
+        packed.byteswap()
+
+    return packed
+
+
+def _find_quantized_indices_python(colors: Iterable[int], mode: ColorMode) -> array:
+    # batches (gradients, images) tend to repeat colors, so each distinct (packed) color is only quantized once
+    known: dict[int, int] = {}
+    indices = array("B")
+
+    for packed in colors:
+        if (index := known.get(packed)) is None:
+            index = known[packed] = find_quantized_index(RGBColor.from_packed(packed), mode)
+
+        indices.append(index)
+
+    return indices
+
+
+# bound the size of the intermediate (rows x candidates x 3) distance arrays
+_NUMPY_CHUNK_ROWS = 1 << 16
+
+
+def _find_quantized_indices_numpy(np: ModuleType, pixels: Any, mode: ColorMode) -> Any:
+    palette = np.frombuffer(_PALETTE_RGB, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+    cube_level_index = np.frombuffer(_CUBE_LEVEL_INDEX, dtype=np.uint8)
+    gray_index_by_sum = np.frombuffer(_GRAY_INDEX_BY_SUM, dtype=np.uint8)
+
+    indices = np.empty(len(pixels), dtype=np.uint8)
+
+    for start in range(0, len(pixels), _NUMPY_CHUNK_ROWS):
+        chunk = pixels[start:start + _NUMPY_CHUNK_ROWS].astype(np.int32)
+        rows = len(chunk)
+
+        # the candidates for each color, in ascending palette order so that argmin's first-match tie-breaking
+        # matches the scalar version: the 16 base colors, then (in 256-color mode) the nearest cube color and gray
+        candidates = np.broadcast_to(np.arange(16, dtype=np.int32), (rows, 16))
+
+        if mode == ColorMode.EXTENDED_256:
+            levels = cube_level_index[chunk].astype(np.int32)
+            cube = 16 + 36 * levels[:, 0] + 6 * levels[:, 1] + levels[:, 2]
+            gray = 232 + gray_index_by_sum[chunk.sum(axis=1)].astype(np.int32)
+            candidates = np.concatenate((candidates, cube[:, None], gray[:, None]), axis=1)
+
+        distances = ((palette[candidates] - chunk[:, None, :]) ** 2).sum(axis=2)
+        indices[start:start + rows] = candidates[np.arange(rows), distances.argmin(axis=1)]
+
+    return indices
 
 
 def get_color_ansi_code_component_indexed(color: RGBColor | None, role: ColorRole, mode: ColorMode) -> str:
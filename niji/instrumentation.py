@@ -0,0 +1,143 @@
+"""Opt-in counters for where niji spends its time.
+
+When enabled, every call to one of the instrumented stages is counted and timed:
+
+- "parse": parse_color_input
+- "quantize": find_quantized_index
+- "style": get_ansi_code (which includes any parsing and quantizing it does, so the stages overlap)
+- "detect": get_color_mode
+- "write": the writes of cprint, cprint_bytes, ColorWriter, AsyncColorWriter, and ThreadSafePrinter
+
+Writes also count the bytes of escape sequences and of payload (the text itself, as UTF-8) they emit. When disabled
+(the default), each instrumented function only checks a flag.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from typing import AnyStr, NamedTuple, TypeVar
+
+from .ansi import strip_escape_sequences
+
+T = TypeVar("T")
+
+STAGES = ("parse", "quantize", "style", "detect", "write")
+
+
+class StageStats(NamedTuple):
+    calls: int
+    total_ns: int
+
+
+class Stats(NamedTuple):
+    stages: dict[str, StageStats]
+    escape_bytes: int  # bytes of escape sequences written
+    payload_bytes: int  # bytes of text written
+
+    @property
+    def escape_ratio(self) -> float:
+        """The fraction of the bytes written which were escape sequences."""
+        total = self.escape_bytes + self.payload_bytes
+        return self.escape_bytes / total if total else 0.0
+
+
+class Event(NamedTuple):
+    """One instrumented call, as passed to the callback (the byte counts are 0 for anything but writes)."""
+
+    stage: str
+    elapsed_ns: int
+    escape_bytes: int = 0
+    payload_bytes: int = 0
+
+
+# checked inline by every instrumented function
+_enabled = False
+
+_callback: Callable[[Event], None] | None = None
+
+_lock = threading.Lock()
+_calls = dict.fromkeys(STAGES, 0)
+_total_ns = dict.fromkeys(STAGES, 0)
+_escape_bytes = 0
+_payload_bytes = 0
+
+
+def enable(callback: Callable[[Event], None] | None = None) -> None:
+    """Start counting. If a callback is given, it's also called with an Event for every instrumented call (e.g., to
+    export them to a metrics system), replacing any previous callback.
+    """
+    global _enabled, _callback
+
+    if callback is not None:
+        _callback = callback
+
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop counting, and forget the callback. The counts so far are kept."""
+    global _enabled, _callback
+    _enabled = False
+    _callback = None
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Set every count back to zero."""
+    global _escape_bytes, _payload_bytes
+
+    with _lock:
+        for stage in STAGES:
+            _calls[stage] = 0
+            _total_ns[stage] = 0
+
+        _escape_bytes = 0
+        _payload_bytes = 0
+
+
+def stats() -> Stats:
+    """Return a snapshot of the counts."""
+    with _lock:
+        stages = {stage: StageStats(_calls[stage], _total_ns[stage]) for stage in STAGES}
+        return Stats(stages, _escape_bytes, _payload_bytes)
+
+
+def _record(event: Event) -> None:
+    global _escape_bytes, _payload_bytes
+
+    with _lock:
+        _calls[event.stage] += 1
+        _total_ns[event.stage] += event.elapsed_ns
+        _escape_bytes += event.escape_bytes
+        _payload_bytes += event.payload_bytes
+
+    if (callback := _callback) is not None:
+        callback(event)
+
+
+def timed(stage: str, func: Callable[..., T], /, *args: object) -> T:
+    """Call func(*args), recording the call under the given stage."""
+    start = time.perf_counter_ns()
+    try:
+        return func(*args)
+    finally:
+        _record(Event(stage, time.perf_counter_ns() - start))
+
+
+def timed_write(write: Callable[[AnyStr], object], data: AnyStr, /) -> None:
+    """Call write(data), recording the call as a write of data."""
+    start = time.perf_counter_ns()
+    try:
+        write(data)
+    finally:
+        elapsed_ns = time.perf_counter_ns() - start
+
+        # (escape sequences are ASCII, so in a str, they're as many bytes as characters)
+        payload = strip_escape_sequences(data)
+        escape_bytes = len(data) - len(payload)
+        payload_bytes = len(payload.encode("utf-8", "surrogatepass") if isinstance(payload, str) else payload)
+
+        _record(Event("write", elapsed_ns, escape_bytes, payload_bytes))
@@ -0,0 +1,118 @@
+import io
+import logging
+import re
+from collections.abc import Mapping
+from typing import Any, Literal, TextIO
+
+from .color_modes import ColorMode, get_color_mode
+from .compiled_style import Style
+from .core import ANSI_RESET
+from .styles import TextStyle
+
+DEFAULT_LEVEL_STYLES: dict[int, Style] = {
+    logging.DEBUG: Style(styles=TextStyle.DIM),
+    logging.INFO: Style(fg="#00AA00"),
+    logging.WARNING: Style(fg="#FFAA00"),
+    logging.ERROR: Style(fg="#FF0000"),
+    logging.CRITICAL: Style(fg="#FF0000", styles=TextStyle.BOLD),
+}
+
+# the placeholders of each format style, with the name of the field they refer to
+_PLACEHOLDERS = {
+    "%": re.compile(r"%\((?P<field>\w+)\)[#0+ -]*(?:\*|\d+)?(?:\.(?:\*|\d+))?[diouxXeEfFgGcrsa]"),
+    "{": re.compile(r"\{(?P<field>\w+)(?:![rsa])?(?::[^{}]*)?\}"),
+    "$": re.compile(r"\$\{(?P<field>\w+)\}|\$(?P<bare_field>\w+)"),
+}
+
+_FORMAT_STYLES: dict[str, type[logging.PercentStyle]] = {
+    "%": logging.PercentStyle,
+    "{": logging.StrFormatStyle,
+    "$": logging.StringTemplateStyle,
+}
+
+
+class ColorFormatter(logging.Formatter):
+    """A logging.Formatter which colors the fields of each record: `levelname` by the record's level (using the style
+    of the highest level in level_styles which is at most the record's level), and any other field by field_styles
+    (e.g., {"asctime": Style(styles=TextStyle.DIM)}).
+
+    The color mode is resolved once, and the styles are baked into a copy of the format string per level the first time
+    a record of that level is formatted, so formatting a record costs the same as with a plain Formatter. For
+    ColorMode.AUTO, the mode is detected from the handler's stream when set with install(handler), or else from the
+    given stream. Since a formatter can't tell which handler it's formatting for, with neither (e.g., when set with
+    handler.setFormatter, or by dictConfig), records are formatted as plain text, unless FORCE_COLOR is set.
+    """
+
+    def __init__(self, fmt: str | None = None, datefmt: str | None = None, style: Literal["%", "{", "$"] = "%",
+                 validate: bool = True, *, level_styles: Mapping[int, Style | None] | None = None,
+                 field_styles: Mapping[str, Style | None] | None = None, mode: ColorMode = ColorMode.AUTO,
+                 stream: TextIO | None = None, defaults: Mapping[str, Any] | None = None) -> None:
+        super().__init__(fmt, datefmt, style, validate, defaults=defaults)
+
+        self._style_char = style
+        self._defaults = defaults
+        self._level_styles = dict(DEFAULT_LEVEL_STYLES if level_styles is None else level_styles)
+        self._field_styles = dict(field_styles or {})
+
+        self._requested_mode = mode
+        self._stream = stream
+        self._mode: ColorMode | None = None  # resolved on first use
+        self._level_formats: dict[int, logging.PercentStyle] = {}
+
+    @property
+    def mode(self) -> ColorMode:
+        """The color mode records are formatted in (detected on first use, for ColorMode.AUTO)."""
+        if self._mode is None:
+            if self._requested_mode == ColorMode.AUTO:
+                # (an in-memory stream is never a terminal, but still lets NO_COLOR/FORCE_COLOR apply)
+                self._mode = get_color_mode(self._stream if self._stream is not None else io.StringIO())
+            else:
+                self._mode = self._requested_mode
+
+        return self._mode
+
+    def install(self, handler: logging.Handler) -> "ColorFormatter":
+        """Set this as the handler's formatter, detecting the color mode from the handler's stream. A handler without
+        a stream (e.g., a SocketHandler) is treated as not being a terminal.
+        """
+        self._stream = getattr(handler, "stream", None)
+
+        self._mode = None
+        self._level_formats.clear()
+
+        handler.setFormatter(self)
+        return self
+
+    def _level_style(self, levelno: int) -> Style | None:
+        levels = [level for level in self._level_styles if level <= levelno]
+        return self._level_styles[max(levels)] if levels else None
+
+    def _build_level_format(self, levelno: int) -> logging.PercentStyle:
+        """Return a copy of the format style with the ANSI codes for the given level baked into the format string."""
+        mode = self.mode
+        prefixes = {field: style.prefix(mode) for field, style in self._field_styles.items() if style is not None}
+
+        if (level_style := self._level_style(levelno)) is not None:
+            prefixes["levelname"] = level_style.prefix(mode)
+
+        def style_placeholder(match: re.Match[str]) -> str:
+            if prefix := prefixes.get(match.group(match.lastgroup)):  # type: ignore[arg-type]
+                return prefix + match.group() + ANSI_RESET
+
+            return match.group()
+
+        # (SGR codes never contain "%", "{", or "$", so they don't need escaping in any of the format styles)
+        fmt = _PLACEHOLDERS[self._style_char].sub(style_placeholder, self._fmt)
+        format_style = _FORMAT_STYLES[self._style_char](fmt, defaults=self._defaults)
+        self._level_formats[levelno] = format_style
+        return format_style
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        if self.mode == ColorMode.NONE:
+            return super().formatMessage(record)
+
+        format_style = self._level_formats.get(record.levelno)
+        if format_style is None:
+            format_style = self._build_level_format(record.levelno)
+
+        return format_style.format(record)
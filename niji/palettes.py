@@ -0,0 +1,149 @@
+import itertools
+import sys
+import time
+from array import array
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from .colors import RGBColor
+
+
+class PaletteTableStats(NamedTuple):
+    built: bool
+    build_time_ns: int  # 0 until the table has been built
+    nbytes: int  # memory held by the grid and the candidate groups
+    cells: int
+    ambiguous_cells: int  # cells which still need a (short) exact comparison at lookup time
+
+
+class PaletteTable:
+    """A lookup grid mapping RGB colors to the index of the nearest color in a palette.
+
+    The RGB cube is split into (2 ** bits) ** 3 cells. Each cell stores either the palette index that is nearest to
+    every color in the cell, or a reference to the few palette entries which could be nearest, which are then compared
+    exactly. Results are identical to a linear scan over the palette (including preferring the lowest index on ties).
+
+    The grid is built on first lookup, or explicitly by calling build().
+    """
+
+    def __init__(self, palette: Sequence[RGBColor], *, bits: int = 4) -> None:
+        if not palette:
+            raise ValueError("Cannot build a lookup table for an empty palette.")
+
+        if not (1 <= bits <= 6):
+            raise ValueError(f"Lookup table resolution should be 1 <= bits <= 6, not {bits!r}.")
+
+        self.palette = tuple(palette)
+        self.bits = bits
+
+        # the palette's channels as parallel arrays, for the exact comparisons in lookup()
+        self._reds = array("B", (color.red for color in self.palette))
+        self._greens = array("B", (color.green for color in self.palette))
+        self._blues = array("B", (color.blue for color in self.palette))
+
+        self._shift = 8 - bits
+        self._cells: array | None = None
+        self._groups: list[tuple[int, ...]] = []
+        self._build_time_ns = 0
+
+    @property
+    def is_built(self) -> bool:
+        return self._cells is not None
+
+    def build(self) -> None:
+        """Build the lookup grid, if it hasn't been already."""
+        if self._cells is not None:
+            return
+
+        start = time.perf_counter_ns()
+
+        size = 1 << self.bits
+        step = 1 << self._shift
+        palette = self.palette
+
+        # for each palette entry and channel, the smallest and largest squared distance from that channel's value to
+        # any value within each cell slice [k * step, (k + 1) * step - 1]
+        def channel_bounds(channel: int) -> tuple[list[list[int]], list[list[int]]]:
+            lows: list[list[int]] = []
+            highs: list[list[int]] = []
+            for color in palette:
+                value = color[channel]
+                low_row: list[int] = []
+                high_row: list[int] = []
+                for k in range(size):
+                    lo, hi = k * step, (k + 1) * step - 1
+                    low_row.append((lo - value) ** 2 if value < lo else (value - hi) ** 2 if value > hi else 0)
+                    high_row.append(max((value - lo) ** 2, (value - hi) ** 2))
+                lows.append(low_row)
+                highs.append(high_row)
+            return lows, highs
+
+        red_lows, red_highs = channel_bounds(0)
+        green_lows, green_highs = channel_bounds(1)
+        blue_lows, blue_highs = channel_bounds(2)
+
+        indices = range(len(palette))
+        group_ids: dict[tuple[int, ...], int] = {}
+        cells: list[int] = []
+
+        for kr, kg in itertools.product(range(size), repeat=2):
+            rg_lows = [red_lows[i][kr] + green_lows[i][kg] for i in indices]
+            rg_highs = [red_highs[i][kr] + green_highs[i][kg] for i in indices]
+
+            for kb in range(size):
+                lows = [rg_lows[i] + blue_lows[i][kb] for i in indices]
+                # no color in the cell can be farther than this from its nearest palette entry,
+                # so only entries that can come at least this close are candidates
+                bound = min(rg_highs[i] + blue_highs[i][kb] for i in indices)
+                candidates = tuple(i for i in indices if lows[i] <= bound)
+
+                if len(candidates) == 1:
+                    cells.append(candidates[0])
+                else:
+                    cells.append(len(palette) + group_ids.setdefault(candidates, len(group_ids)))
+
+        self._groups = list(group_ids)
+        self._cells = array("H" if len(palette) + len(group_ids) <= 0xFFFF else "I", cells)
+        self._build_time_ns = time.perf_counter_ns() - start
+
+    def lookup(self, target: RGBColor) -> int:
+        """Return the index of the palette color closest to the target."""
+        if self._cells is None:
+            self.build()
+            assert self._cells is not None
+
+        r, g, b = target
+        shift, bits = self._shift, self.bits
+        value = self._cells[(((r >> shift) << bits | (g >> shift)) << bits) | (b >> shift)]
+
+        n = len(self.palette)
+        if value < n:
+            return value
+
+        reds, greens, blues = self._reds, self._greens, self._blues
+        best_index = 0
+        best_distance = 195076  # larger than any squared distance within the RGB cube
+        for index in self._groups[value - n]:
+            distance = (reds[index] - r) ** 2 + (greens[index] - g) ** 2 + (blues[index] - b) ** 2
+            if distance < best_distance:
+                best_index = index
+                best_distance = distance
+
+        return best_index
+
+    def stats(self) -> PaletteTableStats:
+        """Report the build cost and memory footprint of the table."""
+        if self._cells is None:
+            return PaletteTableStats(built=False, build_time_ns=0, nbytes=0, cells=0, ambiguous_cells=0)
+
+        nbytes = sys.getsizeof(self._cells) + sys.getsizeof(self._groups)
+        nbytes += sum(sys.getsizeof(group) for group in self._groups)
+
+        n = len(self.palette)
+        return PaletteTableStats(
+            built=True,
+            build_time_ns=self._build_time_ns,
+            nbytes=nbytes,
+            cells=len(self._cells),
+            ambiguous_cells=sum(1 for value in self._cells if value >= n),
+        )
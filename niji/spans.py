@@ -0,0 +1,114 @@
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from .color_modes import ColorMode
+from .colors import RGBColor
+from .compiled_style import Style
+from .core import ANSI_RESET
+from .indexed_colors import get_color_ansi_code_component_indexed
+from .roles import ColorRole
+from .styles import _SGR_ATTRIBUTE_RESET_CODES, TextStyle, get_style_sgr_codes
+from .truecolor import get_color_ansi_code_component_24bit
+
+# the attributes which share the "normal intensity" reset code
+_INTENSITY = TextStyle.BOLD | TextStyle.DIM
+
+
+class SGRState(NamedTuple):
+    """The graphic rendition (SGR) state of a terminal: its active attributes and fg/bg color codes (None for the
+    terminal's default colors).
+    """
+    styles: TextStyle = TextStyle.NONE
+    fg: str | None = None
+    bg: str | None = None
+
+    @classmethod
+    def from_style(cls, style: Style | None, mode: ColorMode) -> "SGRState":
+        """Return the state a terminal is in after a reset followed by the given style's prefix."""
+        if style is None:
+            return cls()
+
+        return cls(
+            styles=style.styles or TextStyle.NONE,
+            fg=_color_component(style.fg, ColorRole.FOREGROUND, mode),
+            bg=_color_component(style.bg, ColorRole.BACKGROUND, mode),
+        )
+
+
+def _color_component(color: RGBColor | None, role: ColorRole, mode: ColorMode) -> str | None:
+    if color is None:
+        return None
+
+    if mode == ColorMode.TRUE_COLOR:
+        return get_color_ansi_code_component_24bit(color, role)
+
+    return get_color_ansi_code_component_indexed(color, role, mode)
+
+
+def sgr_transition(old: SGRState, new: SGRState) -> str:
+    """Return the SGR parameters which take a terminal from the old state to the new one (or "" if they're the same).
+
+    Only the attributes and colors which change are emitted, unless a full reset followed by the new state is shorter.
+    """
+    if old == new:
+        return ""
+
+    removed = old.styles & ~new.styles
+    added = new.styles & ~old.styles
+
+    if removed & _INTENSITY:
+        # the shared reset code turns off both BOLD and DIM, so whichever of them stays on has to be applied again
+        added |= new.styles & _INTENSITY
+
+    off_codes = sorted({code for style, code in _SGR_ATTRIBUTE_RESET_CODES.items() if style & removed})
+    blocks = [str(code) for code in (*off_codes, *get_style_sgr_codes(added))]
+
+    if new.fg != old.fg:
+        blocks.append(new.fg or "39")
+
+    if new.bg != old.bg:
+        blocks.append(new.bg or "49")
+
+    delta = ";".join(blocks)
+
+    reset_blocks = ["0"] + list(map(str, get_style_sgr_codes(new.styles)))
+    reset_blocks += [color for color in (new.fg, new.bg) if color is not None]
+    reset = ";".join(reset_blocks)
+
+    return reset if len(reset) < len(delta) else delta
+
+
+def render_spans(spans: Iterable[tuple[str, Style | None]], mode: ColorMode = ColorMode.TRUE_COLOR) -> str:
+    """Render consecutive (text, style) spans into one string.
+
+    Unlike joining colored() spans, this only emits the SGR changes between one span and the next (e.g., "22" to turn
+    off bold, or "39" to return to the default fg), and a single reset at the end.
+    """
+    if mode == ColorMode.AUTO:
+        raise ValueError(f"render_spans(..., mode={mode!r}) is not supported.")
+
+    if mode == ColorMode.NONE:
+        return "".join(text for text, _ in spans)
+
+    default = SGRState()
+    current = default
+    states: dict[Style | None, SGRState] = {}
+    parts: list[str] = []
+
+    for text, style in spans:
+        if not text:
+            continue
+
+        if (state := states.get(style)) is None:
+            state = states[style] = SGRState.from_style(style, mode)
+
+        if params := sgr_transition(current, state):
+            parts.append(f"\033[{params}m")
+            current = state
+
+        parts.append(text)
+
+    if current != default:
+        parts.append(ANSI_RESET)
+
+    return "".join(parts)
@@ -25,18 +25,54 @@ _SGR_ATTRIBUTE_CODES = {
     TextStyle.STRIKEOUT: 9
 }
 
+# the codes which turn each attribute back off
+# (note that 22, "normal intensity", turns off both BOLD and DIM)
+_SGR_ATTRIBUTE_RESET_CODES = {
+    TextStyle.BOLD: 22,
+    TextStyle.DIM: 22,
+    TextStyle.ITALIC: 23,
+    TextStyle.UNDERLINE: 24,
+    TextStyle.BLINK: 25,
+    TextStyle.REVERSE: 27,
+    TextStyle.CONCEALED: 28,
+    TextStyle.STRIKEOUT: 29
+}
+
+
+# The SGR codes of every combination of TextStyle flags, indexed by the combination's value. There are only 2^8 of them,
+# so they're all built at once, the first time any is needed.
+_style_codes: list[tuple[int, ...]] | None = None
+_style_code_strings: list[str] | None = None
+
+
+def _build_style_tables() -> tuple[list[tuple[int, ...]], list[str]]:
+    global _style_codes, _style_code_strings
+
+    combinations = sum(style.value for style in _SGR_ATTRIBUTE_CODES) + 1
+
+    codes: list[tuple[int, ...]] = []
+    for value in range(combinations):
+        codes.append(tuple(sorted(code for style, code in _SGR_ATTRIBUTE_CODES.items() if value & style.value)))
+
+    strings = [";".join(map(str, combination)) for combination in codes]
+    strings[TextStyle.NONE.value] = "0"  # no styles at all means a reset
+
+    _style_codes, _style_code_strings = codes, strings
+    return codes, strings
+
+
+def get_style_sgr_codes(styles: TextStyle) -> tuple[int, ...]:
+    """For the given collection of styles, return the SGR attribute codes which turn them on, in ascending order
+    (e.g., (1, 4) for TextStyle.BOLD | TextStyle.UNDERLINE, and () for TextStyle.NONE).
+    """
+    codes = _style_codes if _style_codes is not None else _build_style_tables()[0]
+    return codes[styles.value]
+
 
 def get_style_ansi_code_component(styles: TextStyle | None) -> str:
     """For the given collection of styles (e.g., TextStyle.BOLD | TextStyle.UNDERLINE), generate the corresponding attribute/style ANSI code (e.g., 1;4)."""
     if styles is None:
         return ""
 
-    if styles == TextStyle.NONE:
-        return "0"
-
-    codes: set[int] = set()
-    for style, code in _SGR_ATTRIBUTE_CODES.items():
-        if styles & style:
-            codes.add(code)
-
-    return ";".join(sorted(str(c) for c in codes))
+    strings = _style_code_strings if _style_code_strings is not None else _build_style_tables()[1]
+    return strings[styles.value]
@@ -0,0 +1,127 @@
+import functools
+import itertools
+import re
+from collections.abc import Iterable, Iterator, Sequence
+
+from .color_modes import ColorMode
+from .compiled_style import Style
+from .core import ANSI_RESET
+from .text import ColoredText
+from .width import _center_left, _last_sgr_reset, truncate, visible_width
+
+# table cells tend to repeat a lot (statuses, names, small numbers), so their widths are worth remembering
+_cell_width = functools.lru_cache(maxsize=4096)(visible_width)
+
+_ALIGNMENTS = ("<", ">", "^")
+
+_SGR = re.compile(r"\x1b\[([0-9;:]*)m")
+
+
+def _cell_text(cell: object, mode: ColorMode) -> str:
+    if isinstance(cell, str):
+        return cell
+
+    if isinstance(cell, ColoredText):
+        return cell.render(mode)
+
+    return str(cell)
+
+
+def _restore_after_resets(text: str, code: str) -> str:
+    """Re-apply the SGR code right after every reset in the text's SGR sequences (e.g., "0;1" becomes "0;<code>;1")."""
+    def restore(match: re.Match[str]) -> str:
+        params = match.group(1).split(";")
+        if (index := _last_sgr_reset(params)) is None:
+            return match.group()
+
+        params.insert(index + 1, code)
+        return f"\x1b[{';'.join(params)}m"
+
+    return _SGR.sub(restore, text)
+
+
+def _justify(text: str, width: int, align: str) -> str:
+    text_width = _cell_width(text)
+    if text_width > width:
+        return truncate(text, width, placeholder="…" if width else "")
+
+    padding = width - text_width
+    if align == "<":
+        return text + " " * padding
+
+    if align == ">":
+        return " " * padding + text
+
+    left = _center_left(padding, width)
+    return " " * left + text + " " * (padding - left)
+
+
+def render_table(rows: Iterable[Sequence[object]], styles: Sequence[Style | None] | None = None, *,
+                 header: Sequence[object] | None = None, header_style: Style | None = None,
+                 widths: Sequence[int] | None = None, align: str | Sequence[str] = "<", separator: str = "  ",
+                 sample: int | None = 1000, mode: ColorMode = ColorMode.TRUE_COLOR) -> Iterator[str]:
+    """Render rows of cells as aligned columns, yielding one line (without a newline) at a time.
+
+    Each column is styled with its Style from `styles` (None for plain), and aligned by `align` ("<", ">", or "^",
+    either for every column or per column). Cells can be str, ColoredText, or anything else, which is formatted with
+    str(). A cell's own styling is layered over its column's style, which still applies after the cell's resets (so to
+    its padding and to the "…" of a truncated cell, too).
+
+    Unless `widths` are given, each column is as wide as its widest cell among the header and the first `sample` rows
+    (or all of them, if sample is None). Only those rows are held in memory; the rest are streamed, and cells which are
+    too wide for their column are truncated with "…".
+    """
+    if mode == ColorMode.AUTO:
+        raise ValueError(f"render_table(..., mode={mode!r}) is not supported.")
+
+    rows = iter(rows)
+    sampled: list[list[str]] = []
+
+    if widths is None:
+        sampled = [[_cell_text(cell, mode) for cell in row] for row in itertools.islice(rows, sample)]
+        measured = sampled if header is None else [[_cell_text(cell, mode) for cell in header], *sampled]
+
+        columns = max(map(len, measured), default=0)
+        widths = [0] * columns
+        for cells in measured:
+            for i, text in enumerate(cells):
+                widths[i] = max(widths[i], _cell_width(text))
+
+    columns = len(widths)
+    aligns = [align] * columns if isinstance(align, str) else list(align)
+    prefixes = [style.prefix(mode) if style is not None else "" for style in (styles or [None] * columns)]
+
+    if len(aligns) != columns or len(prefixes) != columns:
+        raise ValueError(f"Expected alignments and styles for each of the {columns} columns.")
+
+    if any(a not in _ALIGNMENTS for a in aligns):
+        raise ValueError(f"Invalid column alignment; expected one of {_ALIGNMENTS}: {align!r}.")
+
+    def render_row(cells: Sequence[str], row_prefixes: Sequence[str]) -> str:
+        if len(cells) > columns:
+            raise ValueError(f"Row has {len(cells)} cells, but the table only has {columns} columns: {cells!r}.")
+
+        parts = []
+        for i, (width, column_align, prefix) in enumerate(zip(widths, aligns, row_prefixes)):
+            text = _justify(cells[i] if i < len(cells) else "", width, column_align)
+
+            if prefix:
+                if "\x1b" in text:
+                    # the cell's resets would cancel the column's style for the rest of the cell
+                    text = _restore_after_resets(text, prefix[2:-1])
+
+                text = prefix + text + ANSI_RESET
+
+            parts.append(text)
+
+        return separator.join(parts)
+
+    if header is not None:
+        header_prefix = header_style.prefix(mode) if header_style is not None else ""
+        yield render_row([_cell_text(cell, mode) for cell in header], [header_prefix] * columns)
+
+    for cells in sampled:
+        yield render_row(cells, prefixes)
+
+    for row in rows:
+        yield render_row([_cell_text(cell, mode) for cell in row], prefixes)
@@ -0,0 +1,149 @@
+from collections.abc import Iterable
+from typing import Union
+
+from .color_modes import ColorMode
+from .compiled_style import Style
+from .spans import render_spans
+
+Span = tuple[str, Style | None]
+
+# format specs accepted by ColoredText.__format__, besides the ColorMode names themselves
+_FORMAT_SPEC_MODES = {
+    "": ColorMode.TRUE_COLOR,
+    "24bit": ColorMode.TRUE_COLOR,
+    "256": ColorMode.EXTENDED_256,
+    "16": ColorMode.STANDARD_16,
+    "plain": ColorMode.NONE,
+}
+
+
+class ColoredText:
+    """Styled text which is only turned into ANSI codes when it is rendered.
+
+    A ColoredText is an immutable sequence of (text, Style) spans. It can be concatenated, joined, sliced, and measured
+    in terms of its visible text, and it is rendered for a given ColorMode by render(mode) or by formatting it
+    (f"{text:256}", with "" meaning TRUE_COLOR, like `colored`). Rendering is memoized per mode.
+    """
+
+    __slots__ = ("_spans", "_length", "_rendered")
+
+    def __init__(self, text: str = "", style: Style | None = None) -> None:
+        self._spans: tuple[Span, ...] = ((text, style),) if text else ()
+        self._length = len(text)
+        self._rendered: dict[ColorMode, str] = {}
+
+    @classmethod
+    def from_spans(cls, spans: Iterable[Span]) -> "ColoredText":
+        """Create a ColoredText from (text, Style) spans, merging neighbouring spans which have the same style."""
+        merged: list[Span] = []
+        for text, style in spans:
+            if not text:
+                continue
+
+            if merged and merged[-1][1] == style:
+                merged[-1] = (merged[-1][0] + text, style)
+            else:
+                merged.append((text, style))
+
+        instance = cls()
+        instance._spans = tuple(merged)
+        instance._length = sum(len(text) for text, _ in merged)
+        return instance
+
+    @property
+    def spans(self) -> tuple[Span, ...]:
+        return self._spans
+
+    @property
+    def plain(self) -> str:
+        """The visible text, without any styling."""
+        return "".join(text for text, _ in self._spans)
+
+    def render(self, mode: ColorMode = ColorMode.TRUE_COLOR) -> str:
+        """Return the text with the ANSI codes for the given mode."""
+        try:
+            return self._rendered[mode]
+        except KeyError:
+            rendered = self._rendered[mode] = render_spans(self._spans, mode)
+            return rendered
+
+    def join(self, items: Iterable[Union["ColoredText", str]]) -> "ColoredText":
+        """Concatenate the items with this text between each of them, like str.join."""
+        spans: list[Span] = []
+        for i, item in enumerate(items):
+            if i:
+                spans.extend(self._spans)
+
+            spans.extend(_spans_of(item))
+
+        return ColoredText.from_spans(spans)
+
+    def __add__(self, other: Union["ColoredText", str]) -> "ColoredText":
+        if not isinstance(other, (ColoredText, str)):
+            return NotImplemented
+
+        return ColoredText.from_spans(self._spans + _spans_of(other))
+
+    def __radd__(self, other: str) -> "ColoredText":
+        if not isinstance(other, str):
+            return NotImplemented
+
+        return ColoredText.from_spans(_spans_of(other) + self._spans)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key: int | slice) -> "ColoredText":
+        if isinstance(key, int):
+            index = key + self._length if key < 0 else key
+            if not (0 <= index < self._length):
+                raise IndexError("ColoredText index out of range")
+
+            key = slice(index, index + 1)
+
+        start, stop, step = key.indices(self._length)
+        if step != 1:
+            raise ValueError("ColoredText slices don't support steps.")
+
+        spans: list[Span] = []
+        offset = 0
+        for text, style in self._spans:
+            end = offset + len(text)
+            if end > start and offset < stop:
+                spans.append((text[max(start - offset, 0):stop - offset], style))
+
+            offset = end
+
+        return ColoredText.from_spans(spans)
+
+    def __format__(self, format_spec: str) -> str:
+        mode = _FORMAT_SPEC_MODES.get(format_spec.lower())
+        if mode is None:
+            try:
+                mode = ColorMode[format_spec.upper()]
+            except KeyError:
+                raise ValueError(f"Invalid format spec for ColoredText: {format_spec!r}.") from None
+
+        return self.render(mode)
+
+    def __str__(self) -> str:
+        return self.render(ColorMode.TRUE_COLOR)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ColoredText):
+            return NotImplemented
+
+        return self._spans == other._spans
+
+    def __hash__(self) -> int:
+        return hash(self._spans)
+
+    def __repr__(self) -> str:
+        return f"ColoredText.from_spans({list(self._spans)!r})"
+
+
+def _spans_of(item: ColoredText | str) -> tuple[Span, ...]:
+    if isinstance(item, ColoredText):
+        return item.spans
+
+    return ((item, None),) if item else ()
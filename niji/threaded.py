@@ -0,0 +1,143 @@
+import sys
+import threading
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TextIO
+
+from . import instrumentation
+from .color_modes import ColorMode, get_color_mode
+from .colors import ColorInput
+from .compiled_style import Style
+from .core import ANSI_RESET, get_ansi_code
+from .styles import TextStyle
+
+# one lock per stream, shared by every printer writing to it
+_stream_locks: weakref.WeakKeyDictionary[TextIO, threading.Lock] = weakref.WeakKeyDictionary()
+_stream_locks_lock = threading.Lock()
+
+
+def _get_stream_lock(file: TextIO) -> threading.Lock:
+    with _stream_locks_lock:
+        if (lock := _stream_locks.get(file)) is None:
+            lock = _stream_locks[file] = threading.Lock()
+
+        return lock
+
+
+class _LineBuffer:
+    """The styled segments of the line a thread is assembling."""
+
+    __slots__ = ("parts", "prefix", "depth")
+
+    def __init__(self) -> None:
+        self.parts: list[str] = []
+        self.prefix = ""  # the ANSI prefix in effect at the end of parts
+        self.depth = 0  # the number of line() blocks the thread is in
+
+
+class ThreadSafePrinter:
+    """Print styled text from many threads to one stream, without the output of different threads interleaving.
+
+    Each thread assembles its line in a buffer of its own, and the finished line (always ending in a reset, so that no
+    style leaks into the next line) is written with a single write call. A lock per stream is held only for that write,
+    so threads only wait on each other for the write itself, not while formatting.
+    """
+
+    def __init__(self, file: TextIO = sys.stdout, *, mode: ColorMode = ColorMode.AUTO) -> None:
+        self.file = file
+        self.mode = get_color_mode(file) if mode == ColorMode.AUTO else mode
+
+        self._lock = _get_stream_lock(file)
+        self._local = threading.local()
+
+    def _buffer(self) -> _LineBuffer:
+        try:
+            return self._local.buffer
+        except AttributeError:
+            buffer = self._local.buffer = _LineBuffer()
+            return buffer
+
+    def _prefix(self, style: Style | None, fg: ColorInput | None, bg: ColorInput | None,
+                styles: TextStyle | None) -> str:
+        if style is not None:
+            if fg is not None or bg is not None or styles is not None:
+                raise ValueError("ThreadSafePrinter takes either a style or fg/bg/styles, not both.")
+
+            return style.prefix(self.mode)
+
+        code = get_ansi_code(fg=fg, bg=bg, styles=styles, mode=self.mode)
+        return f"\033[{code}m" if code else ""
+
+    def write(self, text: str, style: Style | None = None, *, fg: ColorInput | None = None,
+              bg: ColorInput | None = None, styles: TextStyle | None = None) -> None:
+        """Add the text, formatted with either the given Style or the given fg/bg/styles configuration, to the calling
+        thread's line. Consecutive segments with the same style share one set of ANSI codes. Outside a `line()` block,
+        the line is written out immediately.
+        """
+        buffer = self._buffer()
+        prefix = self._prefix(style, fg, bg, styles)
+
+        if prefix != buffer.prefix:
+            if buffer.prefix:
+                buffer.parts.append(ANSI_RESET)
+
+            if prefix:
+                buffer.parts.append(prefix)
+
+            buffer.prefix = prefix
+
+        buffer.parts.append(text)
+
+        if not buffer.depth:
+            self._commit(buffer, "")
+
+    def print(self, text: str, style: Style | None = None, *, fg: ColorInput | None = None,
+              bg: ColorInput | None = None, styles: TextStyle | None = None, end: str = "\n") -> None:
+        """Print the text like cprint would: formatted, and followed by an unformatted end. Inside a `line()` block, the
+        text is added to the line (which is written out when the block ends); otherwise, it's written out immediately.
+        """
+        buffer = self._buffer()
+        buffer.depth += 1
+        try:
+            self.write(text, style, fg=fg, bg=bg, styles=styles)
+        finally:
+            buffer.depth -= 1
+
+        if buffer.depth:
+            self.write(end)
+        else:
+            self._commit(buffer, end)
+
+    @contextmanager
+    def line(self, end: str = "\n") -> Iterator["ThreadSafePrinter"]:
+        """Assemble a line from several writes, writing it out (followed by end) as one piece when the block ends.
+        Inside another line() block, the line is added to the outer one instead.
+        """
+        buffer = self._buffer()
+        buffer.depth += 1
+        try:
+            yield self
+        finally:
+            buffer.depth -= 1
+
+            if buffer.depth:
+                self.write(end)
+            else:
+                self._commit(buffer, end)
+
+    def _commit(self, buffer: _LineBuffer, end: str) -> None:
+        if self.mode != ColorMode.NONE:
+            buffer.parts.append(ANSI_RESET)
+
+        buffer.parts.append(end)
+        content = "".join(buffer.parts)
+
+        buffer.parts.clear()
+        buffer.prefix = ""
+
+        with self._lock:
+            if instrumentation._enabled:
+                instrumentation.timed_write(self.file.write, content)
+            else:
+                self.file.write(content)
@@ -0,0 +1,161 @@
+import re
+from collections.abc import Iterable, Iterator
+from typing import IO, AnyStr
+
+from .ansi import split_unfinished
+from .cache import LRUCache
+from .color_modes import ColorMode
+from .colors import COLOR_MAP_256, RGBColor
+from .core import _read_chunks
+from .indexed_colors import get_color_ansi_code_component_indexed
+from .roles import ColorRole
+
+# Every ESC starts exactly one sequence (see niji.ansi), so this only ever matches whole SGR sequences.
+_SGR_SOURCE = r"\x1b\[([0-9;:]*)m"
+_SGR = re.compile(_SGR_SOURCE)
+_SGR_BYTES = re.compile(_SGR_SOURCE.encode())
+
+_COLOR_ROLES = {"38": ColorRole.FOREGROUND, "48": ColorRole.BACKGROUND}
+
+# rewritten SGR sequences, keyed by (sequence, mode): streams tend to repeat the same few styles over and over
+_transcoded: LRUCache[tuple[str | bytes, ColorMode], str | bytes] = LRUCache(maxsize=1024)
+
+
+def _parse_color(args: list[str]) -> RGBColor | None:
+    """Parse the arguments of an extended color (what follows 38 or 48), returning None if they're not valid."""
+    try:
+        values = [int(arg) for arg in args]
+    except ValueError:
+        return None
+
+    if not all(0 <= value <= 255 for value in values):
+        return None
+
+    if len(values) == 4 and values[0] == 2:
+        return RGBColor(*values[1:])
+
+    if len(values) == 2 and values[0] == 5:
+        return COLOR_MAP_256[values[1]]
+
+    return None
+
+
+def _transcode_color(role: ColorRole, args: list[str], mode: ColorMode) -> list[str] | None:
+    """Return the SGR parameters for an extended color in the given mode, or None to leave it unchanged."""
+    if mode == ColorMode.EXTENDED_256 and args[:1] == ["5"]:
+        return None
+
+    color = _parse_color(args)
+    if color is None:
+        return None
+
+    return get_color_ansi_code_component_indexed(color, role, mode).split(";")
+
+
+def _transcode_params(params: str, mode: ColorMode) -> str | None:
+    """Return the rewritten parameters of an SGR sequence, or None if the sequence should be dropped."""
+    if mode == ColorMode.NONE:
+        return None
+
+    parts = params.split(";")
+    rewritten: list[str] = []
+    changed = False
+
+    i = 0
+    while i < len(parts):
+        part = parts[i]
+
+        if ":" in part and part.split(":", 1)[0] in _COLOR_ROLES:
+            # 38:2::r:g:b (with an empty or numeric color space), 38:2:r:g:b, or 38:5:n
+            code, *args = part.split(":")
+            if args[:1] == ["2"] and len(args) == 5:
+                del args[1]
+
+            consumed = 1
+        elif part in _COLOR_ROLES:
+            code = part
+            count = {"2": 4, "5": 2}.get(parts[i + 1] if i + 1 < len(parts) else "", 0)
+            args = parts[i + 1:i + 1 + count]
+            consumed = 1 + count
+        else:
+            rewritten.append(part)
+            i += 1
+            continue
+
+        replacement = _transcode_color(_COLOR_ROLES[code], args, mode)
+        if replacement is None:
+            rewritten.extend(parts[i:i + consumed])
+        else:
+            rewritten.extend(replacement)
+            changed = True
+
+        i += consumed
+
+    return ";".join(rewritten) if changed else params
+
+
+def _transcode_sequence(match: "re.Match[AnyStr]", mode: ColorMode) -> AnyStr:
+    sequence = match.group()
+    key = (sequence, mode)
+
+    transcoded = _transcoded.get(key)
+    if transcoded is None:
+        params = match.group(1)
+        if isinstance(params, str):
+            rewritten = _transcode_params(params, mode)
+            transcoded = "" if rewritten is None else f"\033[{rewritten}m"
+        else:
+            rewritten = _transcode_params(params.decode("ascii"), mode)
+            transcoded = b"" if rewritten is None else f"\033[{rewritten}m".encode("ascii")
+
+        _transcoded.put(key, transcoded)
+
+    return transcoded  # type: ignore[return-value]
+
+
+def transcode(s: AnyStr, /, mode: ColorMode) -> AnyStr:
+    """Rewrite the SGR codes in an already-rendered str or bytes for a different color mode.
+
+    Truecolor (38;2;r;g;b and 48;2;r;g;b) and 256-color (38;5;n and 48;5;n) colors are quantized down to the target
+    mode, and every SGR code is removed for ColorMode.NONE. Other escape sequences are left alone, as is anything which
+    is already supported by the target mode.
+    """
+    if mode == ColorMode.AUTO:
+        raise ValueError(f"transcode(..., mode={mode!r}) is not supported.")
+
+    if isinstance(s, str):
+        if mode == ColorMode.TRUE_COLOR or "\x1b[" not in s:
+            return s
+
+        return _SGR.sub(lambda match: _transcode_sequence(match, mode), s)
+
+    if mode == ColorMode.TRUE_COLOR or b"\x1b[" not in s:
+        return s
+
+    return _SGR_BYTES.sub(lambda match: _transcode_sequence(match, mode), s)
+
+
+def iter_transcode(source: Iterable[AnyStr] | IO[AnyStr], /, mode: ColorMode, *,
+                   chunk_size: int = 1 << 16) -> Iterator[AnyStr]:
+    """Transcode a stream of str or bytes chunks (or a file object, read chunk_size at a time) for the given mode, like
+    `transcode`, yielding the rewritten chunks. Codes which are split across chunks are rewritten as well.
+    """
+    if mode == ColorMode.AUTO:
+        raise ValueError(f"iter_transcode(..., mode={mode!r}) is not supported.")
+
+    chunks = _read_chunks(source, chunk_size) if hasattr(source, "read") else source
+
+    pending: AnyStr | None = None
+    for chunk in chunks:
+        head, pending = split_unfinished(pending + chunk if pending else chunk)
+
+        if head:
+            yield transcode(head, mode)
+
+    if pending:
+        yield transcode(pending, mode)
+
+
+def get_transcode_cache() -> LRUCache:
+    """Return the cache of rewritten SGR sequences, e.g., to inspect its stats() or to resize it."""
+    return _transcoded
@@ -0,0 +1,292 @@
+import functools
+import unicodedata
+
+from .ansi import TokenKind, _scan
+from .core import ANSI_RESET
+
+_CLOSE_HYPERLINK = "\033]8;;\033\\"
+
+
+@functools.cache
+def char_width(char: str, /) -> int:
+    """Return the number of terminal columns taken up by the character: 2 for East Asian Wide and Fullwidth characters
+    (including most emoji), 0 for combining marks, control and format characters (such as zero-width joiners), and 1
+    for everything else.
+    """
+    if char.isascii():
+        return 1 if char.isprintable() else 0
+
+    if unicodedata.category(char) in ("Mn", "Me", "Cc", "Cf"):
+        return 0
+
+    return 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+
+
+def _text_width(text: str) -> int:
+    if text.isascii() and text.isprintable():
+        return len(text)
+
+    return sum(map(char_width, text))
+
+
+def visible_width(s: str, /) -> int:
+    """Return the number of terminal columns the string takes up when printed, ignoring its escape sequences."""
+    if "\033" not in s:
+        return _text_width(s)
+
+    return sum(_text_width(payload) for kind, payload, _, _ in _scan(s) if kind == TokenKind.TEXT)
+
+
+def _last_sgr_reset(params: list[str]) -> int | None:
+    """Return the index of the last reset ("0" or empty) among the SGR parameters, skipping over the arguments of
+    extended colors (e.g., the zeros in 38;2;255;0;0)."""
+    last_reset = None
+
+    i = 0
+    while i < len(params):
+        param = params[i]
+        if param in ("", "0"):
+            last_reset = i
+        elif param in ("38", "48", "58") and i + 1 < len(params):
+            # 38;5;n and 38;2;r;g;b
+            i += {"5": 2, "2": 4}.get(params[i + 1], 0)
+
+        i += 1
+
+    return last_reset
+
+
+class _EscapeState:
+    """Track the SGR codes and hyperlink which are in effect at some point in a string."""
+
+    def __init__(self) -> None:
+        self.sgr: list[str] = []  # the SGR sequences applied since the last reset
+        self.link: str | None = None  # the sequence which opened the current hyperlink
+
+    def update(self, kind: TokenKind, payload: str, raw: str) -> None:
+        if kind == TokenKind.CSI and payload.endswith("m"):
+            params = payload[:-1].split(";")
+            last_reset = _last_sgr_reset(params)
+            if last_reset is None:
+                self.sgr.append(raw)
+                return
+
+            self.sgr.clear()
+            if rest := params[last_reset + 1:]:
+                self.sgr.append(f"\033[{';'.join(rest)}m")
+
+        elif kind == TokenKind.OSC and payload.startswith("8;"):
+            # OSC 8 ; params ; URI opens a hyperlink, and an empty URI closes it
+            self.link = raw if payload.split(";", 2)[-1] else None
+
+    def restore(self) -> str:
+        """Return the sequences which put a terminal back into this state."""
+        return "".join(self.sgr) + (self.link or "")
+
+    def close(self) -> str:
+        """Return the sequences which undo this state."""
+        return (ANSI_RESET if self.sgr else "") + (_CLOSE_HYPERLINK if self.link else "")
+
+
+def truncate(s: str, width: int, /, placeholder: str = "") -> str:
+    """Cut the string down to at most the given visible width, keeping its escape sequences.
+
+    If the string has to be cut, the placeholder (e.g., "…") is added at the end (and counts towards the width), and
+    any styling or hyperlink still open at the cut is closed.
+    """
+    if visible_width(s) <= width:
+        return s
+
+    available = width - visible_width(placeholder)
+    if available < 0:
+        raise ValueError(f"Placeholder {placeholder!r} is wider than the width to truncate to ({width}).")
+
+    state = _EscapeState()
+    parts: list[str] = []
+    used = 0
+
+    for kind, payload, start, end in _scan(s):
+        if kind != TokenKind.TEXT:
+            parts.append(s[start:end])
+            state.update(kind, payload, s[start:end])
+            continue
+
+        if used + (text_width := _text_width(payload)) <= available:
+            parts.append(payload)
+            used += text_width
+            continue
+
+        for i, char in enumerate(payload):
+            if used + (w := char_width(char)) > available:
+                parts.append(payload[:i])
+                break
+
+            used += w
+
+        break
+
+    parts.append(state.close())
+    parts.append(placeholder)
+    return "".join(parts)
+
+
+def _padding(s: str, width: int, fillchar: str) -> int:
+    if len(fillchar) != 1 or char_width(fillchar) != 1:
+        raise TypeError(f"The fill character must be a single-column character, not {fillchar!r}.")
+
+    return max(width - visible_width(s), 0)
+
+
+def ljust(s: str, width: int, fillchar: str = " ", /) -> str:
+    """Like str.ljust, but padding the string to a visible width."""
+    return s + fillchar * _padding(s, width, fillchar)
+
+
+def rjust(s: str, width: int, fillchar: str = " ", /) -> str:
+    """Like str.rjust, but padding the string to a visible width."""
+    return fillchar * _padding(s, width, fillchar) + s
+
+
+def _center_left(padding: int, width: int) -> int:
+    """Return how much of the padding goes on the left when centering in the given width."""
+    # the same split as str.center, so that plain strings are centered identically
+    return padding // 2 + (padding & width & 1)
+
+
+def center(s: str, width: int, fillchar: str = " ", /) -> str:
+    """Like str.center, but padding the string to a visible width."""
+    padding = _padding(s, width, fillchar)
+    left = _center_left(padding, width)
+    return fillchar * left + s + fillchar * (padding - left)
+
+
+def _wrap_ranges(chars: list[str], widths: list[int], width: int) -> list[tuple[int, int]]:
+    """Greedily fill lines of at most the given width with the words of the text, returning each line's [start, end)
+    range of character indices. Newlines always break, spaces at a break are dropped, and words longer than a whole line
+    are split.
+    """
+    lines: list[tuple[int, int]] = []
+
+    paragraph_start = 0
+    for paragraph_end in [i for i, char in enumerate(chars) if char == "\n"] + [len(chars)]:
+        line: list[int] | None = None  # [start, end, width] of the current line
+        pending_space = 0  # the width of the spaces between the line and the next word
+        first_line = True
+
+        i = paragraph_start
+        while i < paragraph_end:
+            j = i
+            is_space = chars[i].isspace()
+            while j < paragraph_end and chars[j].isspace() == is_space:
+                j += 1
+
+            run_width = sum(widths[i:j])
+
+            if is_space:
+                if line is not None:
+                    pending_space = run_width
+                elif first_line:
+                    # leading whitespace of a paragraph is kept
+                    line = [i, j, run_width]
+
+                i = j
+                continue
+
+            while True:
+                if line is not None and line[2] + pending_space + run_width <= width:
+                    line[1] = j
+                    line[2] += pending_space + run_width
+                    break
+
+                if run_width > width:
+                    # a word which can't fit on a line of its own is split, filling up the current line first
+                    # (and taking at least one character on a new line)
+                    used = line[2] + pending_space if line is not None else 0
+                    k, taken = i, 0
+                    while k < j and (used + taken + widths[k] <= width or (line is None and k == i)):
+                        taken += widths[k]
+                        k += 1
+
+                    if k > i:
+                        line = [i if line is None else line[0], k, used + taken]
+                        i, run_width = k, run_width - taken
+
+                elif line is None:
+                    line = [i, j, run_width]
+                    break
+
+                if not chars[line[1] - 1].isspace():
+                    # (a line of only leading whitespace is dropped rather than left on its own)
+                    lines.append((line[0], line[1]))
+                    first_line = False
+
+                line = None
+                pending_space = 0
+
+            pending_space = 0
+            i = j
+
+        if line is not None:
+            lines.append((line[0], line[1]))
+        elif first_line:
+            lines.append((paragraph_start, paragraph_start))
+
+        paragraph_start = paragraph_end + 1
+
+    return lines
+
+
+def wrap(s: str, width: int, /) -> list[str]:
+    """Wrap the string into lines of at most the given visible width, keeping its escape sequences.
+
+    Lines are broken at spaces (which are dropped at the break) and at newlines, and words longer than a line are split.
+    Styling and hyperlinks which are open at the end of a line are closed there and reopened at the start of the next
+    one, so every line can be printed on its own.
+    """
+    if width < 1:
+        raise ValueError(f"Wrapping width should be at least 1, not {width!r}.")
+
+    # split the string into visible characters and escape sequences,
+    # remembering where each character sits among the pieces
+    pieces: list[tuple[TokenKind, str, str]] = []  # (kind, payload, raw)
+    chars: list[str] = []
+    piece_of_char: list[int] = []
+
+    for kind, payload, start, end in _scan(s):
+        if kind == TokenKind.TEXT:
+            for char in payload:
+                piece_of_char.append(len(pieces))
+                chars.append(char)
+                pieces.append((kind, char, char))
+        else:
+            pieces.append((kind, payload, s[start:end]))
+
+    piece_of_char.append(len(pieces))  # so that a range's end can always be looked up
+
+    widths = [char_width(char) for char in chars]
+    ranges = _wrap_ranges(chars, widths, width)
+
+    state = _EscapeState()
+    lines: list[str] = []
+    next_piece = 0
+
+    for line_number, (start, end) in enumerate(ranges):
+        # each line takes every escape sequence up to its end (or, for the last line, all the remaining ones),
+        # but only the characters within its range
+        first_text, end_text = piece_of_char[start], piece_of_char[end]
+        last_piece = len(pieces) if line_number == len(ranges) - 1 else end_text
+
+        parts = [state.restore()]
+        for index in range(next_piece, last_piece):
+            kind, payload, raw = pieces[index]
+            if kind != TokenKind.TEXT:
+                parts.append(raw)
+                state.update(kind, payload, raw)
+            elif first_text <= index < end_text:
+                parts.append(raw)
+
+        parts.append(state.close())
+        lines.append("".join(parts))
+        next_piece = last_piece
+
+    return lines
@@ -0,0 +1,102 @@
+import sys
+from types import TracebackType
+from typing import TextIO
+
+from . import instrumentation
+from .color_modes import ColorMode, get_color_mode
+from .colors import ColorInput
+from .compiled_style import Style
+from .core import ANSI_RESET, get_ansi_code
+from .styles import TextStyle
+
+
+class ColorWriter:
+    """Buffer styled text for a stream, writing it out in large batches.
+
+    The color mode is resolved once, when the writer is created. Consecutive writes which use the same style are merged
+    into one styled run, so they share a single ANSI prefix and reset. The buffer is written to the file when it reaches
+    buffer_size characters, on flush(), and when leaving a `with` block.
+    """
+
+    def __init__(self, file: TextIO = sys.stdout, *, mode: ColorMode = ColorMode.AUTO, buffer_size: int = 8192) -> None:
+        if buffer_size < 1:
+            raise ValueError(f"Buffer size should be at least 1, not {buffer_size!r}.")
+
+        self.file = file
+        self.mode = get_color_mode(file) if mode == ColorMode.AUTO else mode
+        self.buffer_size = buffer_size
+
+        self._parts: list[str] = []  # finished output
+        self._size = 0  # total length of _parts and _run
+
+        self._run: list[str] = []  # the text of the styled run currently being merged
+        self._run_prefix = ""  # the ANSI prefix of that run ("" for plain text)
+
+    def write(self, text: str, style: Style | None = None, *, fg: ColorInput | None = None,
+              bg: ColorInput | None = None, styles: TextStyle | None = None) -> None:
+        """Buffer the text, formatted with either the given Style or the given fg/bg/styles configuration."""
+        if style is not None:
+            if fg is not None or bg is not None or styles is not None:
+                raise ValueError("ColorWriter.write takes either a style or fg/bg/styles, not both.")
+
+            prefix = style.prefix(self.mode)
+        elif (code := get_ansi_code(fg=fg, bg=bg, styles=styles, mode=self.mode)):
+            prefix = f"\033[{code}m"
+        else:
+            prefix = ""
+
+        if prefix != self._run_prefix:
+            self._close_run()
+            self._run_prefix = prefix
+
+        self._run.append(text)
+        self._size += len(text)
+
+        if self._size >= self.buffer_size:
+            self._write_buffer()
+
+    def print(self, text: str, style: Style | None = None, *, fg: ColorInput | None = None,
+              bg: ColorInput | None = None, styles: TextStyle | None = None, end: str = "\n") -> None:
+        """Buffer the text like cprint would print it: formatted, followed by an unformatted end."""
+        self.write(text, style, fg=fg, bg=bg, styles=styles)
+
+        if end:
+            self.write(end)
+
+    def flush(self) -> None:
+        """Write out everything that is buffered and flush the file."""
+        self._write_buffer()
+        self.file.flush()
+
+    def _close_run(self) -> None:
+        if not self._run:
+            return
+
+        if self._run_prefix:
+            self._parts.append(self._run_prefix)
+            self._parts.extend(self._run)
+            self._parts.append(ANSI_RESET)
+        else:
+            self._parts.extend(self._run)
+
+        self._run = []
+
+    def _write_buffer(self) -> None:
+        self._close_run()
+
+        if self._parts:
+            if instrumentation._enabled:
+                instrumentation.timed_write(self.file.write, "".join(self._parts))
+            else:
+                self.file.write("".join(self._parts))
+
+            self._parts = []
+
+        self._size = 0
+
+    def __enter__(self) -> "ColorWriter":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.flush()
@@ -0,0 +1,33 @@
+from collections.abc import Sequence
+
+import pytest
+
+from niji import RGBColor, refresh_color_mode
+from niji.colors import color_distance
+
+
+@pytest.fixture(autouse=True)
+def fresh_color_mode_detection():
+    # tests patch isatty() on the same streams, which the detection cache can't see
+    refresh_color_mode()
+    yield
+    refresh_color_mode()
+
+
+def _find_quantized_index_linear(target: RGBColor, pool: Sequence[RGBColor]) -> int:
+    """Return the index of the color in pool closest to the target, preferring the lowest index on ties."""
+    best_index = 0
+    best_distance = float("inf")
+
+    for index, color in enumerate(pool):
+        if (distance := color_distance(color, target)) < best_distance:
+            best_index = index
+            best_distance = distance
+
+    return best_index
+
+
+@pytest.fixture
+def linear_scan():
+    # the reference implementation the faster quantizers are checked against
+    return _find_quantized_index_linear
@@ -0,0 +1,199 @@
+import asyncio
+import os
+
+import pytest
+
+from niji import ColorMode, RGBColor, Style
+from niji.aio import AsyncColorWriter, _PipeProtocol, _PipeWriter, acprint, from_pipe
+
+RED = Style(fg=RGBColor(255, 0, 0))
+RED_PREFIX = "\033[38;2;255;0;0m"
+
+
+class FakeTransport(asyncio.WriteTransport):
+    """Collect the written bytes, pausing the protocol when more than `limit` bytes are waiting to be read."""
+
+    def __init__(self, protocol, limit=None):
+        super().__init__()
+        self.protocol = protocol
+        self.limit = limit
+        self.writes = []
+        self.pending = 0
+        self.closing = False
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+        self.pending += len(data)
+        if self.limit is not None and self.pending > self.limit and not self.protocol._paused:
+            self.protocol.pause_writing()
+
+    def read(self):
+        """Consume everything written so far, resuming the protocol."""
+        data = b"".join(self.writes)
+        self.writes.clear()
+        self.pending = 0
+        if self.protocol._paused:
+            self.protocol.resume_writing()
+        return data
+
+    def is_closing(self):
+        return self.closing
+
+    def close(self):
+        self.closing = True
+        self.protocol.connection_lost(None)
+
+
+def make_writer(limit=None, **kwargs):
+    protocol = _PipeProtocol()
+    transport = FakeTransport(protocol, limit)
+    return AsyncColorWriter(_PipeWriter(transport, protocol), **kwargs), transport
+
+
+def test_async_writer_batches_one_loop_iteration():
+    async def main():
+        writer, transport = make_writer(mode=ColorMode.TRUE_COLOR)
+
+        async def log(i):
+            await writer.aprint(f"task {i}", RED)
+
+        await asyncio.gather(*(log(i) for i in range(100)))
+        await asyncio.sleep(0)
+        return transport.writes
+
+    writes = asyncio.run(main())
+    assert len(writes) == 1
+    assert writes[0].decode() == "".join(f"{RED_PREFIX}task {i}\033[0m\n" for i in range(100))
+
+
+def test_async_writer_merges_styles_and_encodes():
+    async def main():
+        writer, transport = make_writer(mode=ColorMode.TRUE_COLOR, encoding="latin-1")
+        writer.write("a", RED)
+        writer.write("b", fg="#FF0000")
+        writer.write("é")
+        await writer.drain()
+        return transport.writes
+
+    assert asyncio.run(main()) == [f"{RED_PREFIX}ab\033[0mé".encode("latin-1")]
+
+
+def test_async_writer_flushes_when_the_buffer_is_full():
+    async def main():
+        writer, transport = make_writer(mode=ColorMode.NONE, buffer_size=4)
+        writer.write("ab")
+        assert transport.writes == []
+
+        writer.write("cd")
+        assert transport.writes == [b"abcd"]
+
+        writer.write("e")
+        await asyncio.sleep(0)  # the rest is handed over at the end of the loop iteration
+        return transport.writes
+
+    assert asyncio.run(main()) == [b"abcd", b"e"]
+
+
+def test_async_writer_waits_for_backpressure():
+    async def main():
+        writer, transport = make_writer(limit=4, mode=ColorMode.NONE, buffer_size=1)
+        printed = []
+
+        async def log(i):
+            await writer.aprint(f"line {i}")
+            printed.append(i)
+
+        tasks = [asyncio.create_task(log(i)) for i in range(3)]
+        await asyncio.sleep(0)
+
+        # the first line filled the transport, so every task is waiting for the reader
+        assert printed == []
+        assert transport.protocol._paused
+
+        # the tasks finish as the reader catches up
+        received = b""
+        while not all(task.done() for task in tasks):
+            received += transport.read()
+            await asyncio.sleep(0)
+
+        received += transport.read()
+        return printed, received
+
+    printed, received = asyncio.run(main())
+    assert printed == [0, 1, 2]
+    assert received == b"line 0\nline 1\nline 2\n"
+
+
+def test_async_writer_context_and_close():
+    async def main():
+        writer, transport = make_writer(mode=ColorMode.TRUE_COLOR)
+        async with writer:
+            writer.write("x", RED)
+
+        assert transport.writes == [f"{RED_PREFIX}x\033[0m".encode()]
+        await writer.aclose()
+        return transport.closing
+
+    assert asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    "env, expected",
+    [
+        ({}, ColorMode.NONE),
+        ({"FORCE_COLOR": "1", "COLORTERM": "truecolor"}, ColorMode.TRUE_COLOR),
+    ]
+)
+def test_async_writer_auto_mode_without_pipe(monkeypatch, env, expected):
+    for name in ("NO_COLOR", "FORCE_COLOR", "COLORTERM"):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    async def main():
+        writer, _ = make_writer()
+        return writer.mode
+
+    assert asyncio.run(main()) == expected
+
+
+def test_from_pipe():
+    read_fd, write_fd = os.pipe()
+
+    async def main():
+        with open(write_fd, "w") as pipe:
+            pipe.write("before ")
+            writer = await from_pipe(pipe, mode=ColorMode.TRUE_COLOR)
+            assert not os.get_blocking(write_fd)
+
+            await acprint("after", RED, file=writer)
+            await writer.aclose()
+
+            # closing the writer leaves the pipe open, and puts it back in blocking mode
+            assert not pipe.closed
+            assert os.get_blocking(write_fd)
+
+    asyncio.run(main())
+    with open(read_fd, "rb") as reader:
+        assert reader.read() == f"before {RED_PREFIX}after\033[0m\n".encode()
+
+
+def test_from_pipe_waits_for_the_reader():
+    read_fd, write_fd = os.pipe()
+    data = "x" * (1 << 20)  # far more than the pipe holds
+
+    def read_all():
+        with open(read_fd, "rb") as reader:
+            return reader.read()
+
+    async def main():
+        received = asyncio.get_running_loop().run_in_executor(None, read_all)
+
+        with open(write_fd, "w") as pipe:
+            writer = await from_pipe(pipe, mode=ColorMode.NONE)
+            await acprint(data, file=writer, end="")
+            await writer.aclose()
+
+        return await received
+
+    assert asyncio.run(main()) == data.encode()
@@ -0,0 +1,75 @@
+import pytest
+
+from niji import ColorMode, RGBColor, TextStyle, disable_ansi_code_cache, enable_ansi_code_cache, get_ansi_code
+from niji.core import get_ansi_code_cache
+
+
+@pytest.fixture
+def cache():
+    cache = enable_ansi_code_cache(maxsize=8)
+    cache.clear()
+    yield cache
+    disable_ansi_code_cache()
+
+
+def test_ansi_code_cache_is_disabled_by_default():
+    assert get_ansi_code_cache() is None
+
+
+def test_ansi_code_cache_hit_returns_same_code(cache):
+    first = get_ansi_code(fg="#808393", styles=TextStyle.BOLD, mode=ColorMode.TRUE_COLOR)
+    second = get_ansi_code(fg="#808393", styles=TextStyle.BOLD, mode=ColorMode.TRUE_COLOR)
+
+    assert first == second == "1;38;2;128;131;147"
+    assert cache.stats().hits == 1
+    assert cache.stats().misses == 1
+
+
+def test_ansi_code_cache_is_keyed_on_mode(cache):
+    assert get_ansi_code(fg=RGBColor(0, 0, 100), mode=ColorMode.TRUE_COLOR) == "38;2;0;0;100"
+    assert get_ansi_code(fg=RGBColor(0, 0, 100), mode=ColorMode.EXTENDED_256) == "38;5;17"
+    assert cache.stats().misses == 2
+
+
+def test_ansi_code_cache_normalizes_unhashable_colors(cache):
+    get_ansi_code(fg=[1, 2, 3], mode=ColorMode.TRUE_COLOR)
+    get_ansi_code(fg=(1, 2, 3), mode=ColorMode.TRUE_COLOR)
+    get_ansi_code(fg=RGBColor(1, 2, 3), mode=ColorMode.TRUE_COLOR)
+
+    assert cache.stats().hits == 2
+    assert cache.stats().size == 1
+
+
+def test_ansi_code_cache_still_validates_inputs(cache):
+    get_ansi_code(fg=(1, 2, 3), mode=ColorMode.TRUE_COLOR)
+
+    # (1.0, 2, 3) == (1, 2, 3), so this would be a hit if it weren't normalized first
+    with pytest.raises(TypeError, match="RGB color triple must be integers"):
+        get_ansi_code(fg=(1.0, 2, 3), mode=ColorMode.TRUE_COLOR)
+
+    with pytest.raises(ValueError, match="Should be a hex string."):
+        get_ansi_code(fg="red", mode=ColorMode.TRUE_COLOR)
+
+    assert cache.stats().size == 1
+
+
+def test_ansi_code_cache_evicts_beyond_maxsize(cache):
+    for blue in range(10):
+        get_ansi_code(fg=RGBColor(0, 0, blue), mode=ColorMode.TRUE_COLOR)
+
+    assert cache.stats().size == 8
+    assert cache.stats().evictions == 2
+
+
+def test_enable_ansi_code_cache_keeps_existing_cache(cache):
+    get_ansi_code(fg=RGBColor(0, 0, 0), mode=ColorMode.TRUE_COLOR)
+
+    assert enable_ansi_code_cache(maxsize=16) is cache
+    assert cache.maxsize == 16
+    assert len(cache) == 1
+
+
+def test_disable_ansi_code_cache(cache):
+    disable_ansi_code_cache()
+    assert get_ansi_code_cache() is None
+    assert get_ansi_code(fg=RGBColor(0, 0, 0), mode=ColorMode.TRUE_COLOR) == "38;2;0;0;0"
@@ -0,0 +1,137 @@
+import time
+
+import pytest
+
+from niji import RGBColor, colored, iter_remove_ansi_codes, remove_ansi_codes
+from niji.ansi import MAX_STRING_LENGTH, Token, TokenKind, split_unfinished, strip_escape_sequences, tokenize
+
+T = TokenKind
+
+
+@pytest.mark.parametrize(
+    "s, expected",
+    [
+        ("plain text", [(T.TEXT, "plain text")]),
+        ("", []),
+        ("\033[1;31mred\033[0m", [(T.CSI, "1;31m"), (T.TEXT, "red"), (T.CSI, "0m")]),
+        ("a\033[2Kb\033[10;20H", [(T.TEXT, "a"), (T.CSI, "2K"), (T.TEXT, "b"), (T.CSI, "10;20H")]),
+        ("\033[?25l", [(T.CSI, "?25l")]),
+        ("\033[38:2::1:2:3m", [(T.CSI, "38:2::1:2:3m")]),
+        # OSC 8 hyperlinks, terminated by ST or BEL
+        (
+            "\033]8;;https://example.com\033\\link\033]8;;\007",
+            [(T.OSC, "8;;https://example.com"), (T.TEXT, "link"), (T.OSC, "8;;")],
+        ),
+        ("\033]0;window title\007text", [(T.OSC, "0;window title"), (T.TEXT, "text")]),
+        ("\033P1$r0m\033\\x", [(T.DCS, "1$r0m"), (T.TEXT, "x")]),
+        ("\033Xsos\033\\\033^pm\033\\\033_apc\033\\", [(T.SOS, "sos"), (T.PM, "pm"), (T.APC, "apc")]),
+        ("\0337saved\0338", [(T.ESC, "7"), (T.TEXT, "saved"), (T.ESC, "8")]),
+        ("\033(Bascii", [(T.ESC, "(B"), (T.TEXT, "ascii")]),
+        ("\033c", [(T.ESC, "c")]),
+    ]
+)
+def test_tokenize(s, expected):
+    assert list(tokenize(s)) == [Token(kind, payload) for kind, payload in expected]
+
+
+@pytest.mark.parametrize(
+    "s, expected",
+    [
+        # an ESC cuts the previous sequence short
+        ("\033[12\033[0m", [(T.CSI, "12"), (T.CSI, "0m")]),
+        ("\033]0;title\033[1m", [(T.OSC, "0;title"), (T.CSI, "1m")]),
+        # so does the end of the input
+        ("a\033[1;", [(T.TEXT, "a"), (T.CSI, "1;")]),
+        ("a\033]8;;http", [(T.TEXT, "a"), (T.OSC, "8;;http")]),
+        ("a\033", [(T.TEXT, "a"), (T.ESC, "")]),
+        # an unterminated string sequence also ends at a newline
+        ("\033]0;title\nlog", [(T.OSC, "0;title"), (T.TEXT, "\nlog")]),
+        ("\033Pdata\nlog", [(T.DCS, "data"), (T.TEXT, "\nlog")]),
+        # a malformed CSI only loses its introducer
+        ("\033[1\nx", [(T.ESC, "["), (T.TEXT, "1\nx")]),
+        # an ESC followed by a control character is a lone ESC
+        ("\033\033[0m", [(T.ESC, ""), (T.CSI, "0m")]),
+        ("\033\ttab", [(T.ESC, ""), (T.TEXT, "\ttab")]),
+    ]
+)
+def test_tokenize_unfinished_and_malformed(s, expected):
+    assert list(tokenize(s)) == [Token(kind, payload) for kind, payload in expected]
+
+
+def test_tokenize_bytes():
+    tokens = list(tokenize(b"\033[1mbold\033]8;;x\007\033Pdcs\033\\"))
+    assert tokens == [(T.CSI, b"1m"), (T.TEXT, b"bold"), (T.OSC, b"8;;x"), (T.DCS, b"dcs")]
+
+
+CAPTURE = (
+    "\033]0;~/src\007\033[?2004h$ ls\r\n"
+    + colored("dir", fg=RGBColor(0, 0, 255)) + "  file\r\n"
+    + "\033]8;;file:///tmp\033\\tmp\033]8;;\033\\\033[K\033[3A\0337\033(0lqk\033(B\0338\n"
+    + "\033P+q544e\033\\done\033"
+)
+
+
+def test_strip_escape_sequences_matches_tokenize():
+    expected = "".join(payload for kind, payload in tokenize(CAPTURE) if kind == T.TEXT)
+
+    assert strip_escape_sequences(CAPTURE) == expected
+    assert strip_escape_sequences(CAPTURE.encode()) == expected.encode()
+    assert remove_ansi_codes(CAPTURE) == expected
+    assert expected == "$ ls\r\ndir  file\r\ntmplqk\ndone"
+
+
+@pytest.mark.parametrize("i", range(len(CAPTURE) + 1))
+def test_stream_stripping_matches_at_every_split(i):
+    assert "".join(iter_remove_ansi_codes([CAPTURE[:i], CAPTURE[i:]])) == remove_ansi_codes(CAPTURE)
+
+
+@pytest.mark.parametrize(
+    "buffer, head, tail",
+    [
+        ("abc", "abc", ""),
+        ("abc\033[1;3", "abc", "\033[1;3"),
+        ("abc\033[1;3m", "abc\033[1;3m", ""),
+        ("abc\033]8;;http", "abc", "\033]8;;http"),
+        ("abc\033]8;;http\007", "abc\033]8;;http\007", ""),
+        ("abc\033P...\033", "abc\033P...", "\033"),
+        ("abc\033", "abc", "\033"),
+        ("abc\033(", "abc", "\033("),
+        ("abc\033(B", "abc\033(B", ""),
+        ("\033[1\n", "\033[1\n", ""),
+        ("\033]0;title\n", "\033]0;title\n", ""),
+        ("\033]" + "x" * MAX_STRING_LENGTH, "\033]" + "x" * MAX_STRING_LENGTH, ""),
+    ]
+)
+def test_split_unfinished(buffer, head, tail):
+    assert split_unfinished(buffer) == (head, tail)
+    assert split_unfinished(buffer.encode()) == (head.encode(), tail.encode())
+
+
+def test_tokenize_is_linear_on_unterminated_sequences():
+    # a pathological input for backtracking patterns: many sequence starts that never finish
+    s = "\033[" + "1;" * 20000 + "\n" + "\033[1" * 20000
+
+    start = time.perf_counter()
+    tokens = list(tokenize(s))
+    assert time.perf_counter() - start < 2
+
+    assert len(tokens) == 20002
+
+
+def test_unterminated_string_sequences_keep_the_following_text():
+    s = "line one\n\033]0;title\n" + "important log line\n" * 5
+    assert remove_ansi_codes(s) == "line one\n\n" + "important log line\n" * 5
+
+    s = "\033_" + "x" * (MAX_STRING_LENGTH + 10)
+    assert list(tokenize(s)) == [Token(T.APC, "x" * MAX_STRING_LENGTH), Token(T.TEXT, "x" * 10)]
+
+
+def test_stream_stripping_holds_back_a_bounded_tail():
+    # one stray OSC introducer near the start, and no newlines at all
+    chunks = ["ab\033]0;"] + ["y" * 1000] * 1000
+
+    start = time.perf_counter()
+    cleaned = "".join(iter_remove_ansi_codes(chunks))
+    assert time.perf_counter() - start < 2
+
+    assert cleaned == "ab" + ("y" * 1000000)[MAX_STRING_LENGTH - 2:]
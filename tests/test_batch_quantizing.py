@@ -0,0 +1,116 @@
+import itertools
+from array import array
+
+import pytest
+
+from niji import ColorMode, RGBColor
+from niji import indexed_colors
+from niji.indexed_colors import find_quantized_index, find_quantized_indices
+
+COLORS = [RGBColor(r, g, b) for r, g, b in itertools.product(range(0, 256, 15), repeat=3)]
+COLORS += [RGBColor(64, 64, 64), RGBColor(215, 215, 115), RGBColor(175, 255, 235), RGBColor(191, 0, 0)]
+
+MODES = [ColorMode.STANDARD_16, ColorMode.EXTENDED_256]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(indexed_colors, "_import_numpy", lambda: None)
+
+    return request.param
+
+
+def expected_indices(colors, mode):
+    return array("B", [find_quantized_index(color, mode) for color in colors])
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_find_quantized_indices_sequence(backend, mode):
+    assert find_quantized_indices(COLORS, mode) == expected_indices(COLORS, mode)
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("wrap", [bytes, bytearray, lambda b: array("B", b), lambda b: memoryview(bytes(b))])
+def test_find_quantized_indices_flat_buffer(backend, mode, wrap):
+    buffer = wrap(bytes(channel for color in COLORS for channel in color))
+    assert find_quantized_indices(buffer, mode) == expected_indices(COLORS, mode)
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("typecode", ["I", "L"])
+def test_find_quantized_indices_packed_array(backend, mode, typecode):
+    packed = array(typecode, [color.packed for color in COLORS])
+    assert find_quantized_indices(packed, mode) == expected_indices(COLORS, mode)
+
+
+def test_find_quantized_indices_raises_on_invalid_packed_color(backend):
+    with pytest.raises(ValueError, match="0 <= x <= 0xFFFFFF"):
+        find_quantized_indices(array("I", [0, 0x1000000]), ColorMode.EXTENDED_256)
+
+
+@pytest.mark.parametrize("typecode", ["b", "H", "i", "Q", "f"])
+def test_find_quantized_indices_raises_on_other_array_typecodes(backend, typecode):
+    with pytest.raises(TypeError, match=repr(typecode)):
+        find_quantized_indices(array(typecode, [1, 2, 3]), ColorMode.EXTENDED_256)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_find_quantized_indices_empty(backend, mode):
+    assert find_quantized_indices([], mode) == array("B")
+    assert find_quantized_indices(b"", mode) == array("B")
+    assert find_quantized_indices(array("I"), mode) == array("B")
+
+
+def test_find_quantized_indices_raises_on_ragged_buffer(backend):
+    with pytest.raises(ValueError, match="multiple of 3"):
+        find_quantized_indices(b"\x00\x00\x00\x00", ColorMode.EXTENDED_256)
+
+
+def test_find_quantized_indices_validates_sequence_colors(backend):
+    with pytest.raises(ValueError, match="RGB color triple should have values 0 <= x <= 255"):
+        find_quantized_indices([(0, 0, 0), (0, 0, 256)], ColorMode.EXTENDED_256)
+
+
+@pytest.mark.parametrize("mode", [ColorMode.AUTO, ColorMode.TRUE_COLOR, ColorMode.NONE])
+def test_find_quantized_indices_raises_when_not_indexed_mode(mode):
+    with pytest.raises(ValueError, match="Quantizing is only valid on 16/256 color modes"):
+        find_quantized_indices(COLORS, mode)
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("dtype", ["uint8", "int64"])
+def test_find_quantized_indices_numpy_array(mode, dtype):
+    np = pytest.importorskip("numpy")
+
+    indices = find_quantized_indices(np.array(COLORS, dtype=dtype), mode)
+
+    assert isinstance(indices, np.ndarray)
+    assert indices.dtype == np.uint8
+    assert indices.tolist() == expected_indices(COLORS, mode).tolist()
+
+
+def test_find_quantized_indices_numpy_array_in_chunks(monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(indexed_colors, "_NUMPY_CHUNK_ROWS", 100)
+
+    indices = find_quantized_indices(np.array(COLORS, dtype=np.uint8), ColorMode.EXTENDED_256)
+    assert indices.tolist() == expected_indices(COLORS, ColorMode.EXTENDED_256).tolist()
+
+
+@pytest.mark.parametrize(
+    "values, error, match",
+    [
+        ([[0, 0]], ValueError, "shape"),
+        ([[0.5, 0, 0]], TypeError, "must hold integers"),
+        ([[0, 0, 256]], ValueError, "0 <= x <= 255"),
+        ([[-1, 0, 0]], ValueError, "0 <= x <= 255"),
+    ]
+)
+def test_find_quantized_indices_numpy_array_invalid(values, error, match):
+    np = pytest.importorskip("numpy")
+
+    with pytest.raises(error, match=match):
+        find_quantized_indices(np.array(values), ColorMode.EXTENDED_256)
@@ -0,0 +1,108 @@
+import io
+import json
+
+import pytest
+
+from niji import bench
+from niji.bench import (BenchmarkResult, bench_thread_scaling, find_regressions, format_results, load_baseline,
+                        run_benchmarks, save_baseline)
+
+
+def result(name, ops_per_sec):
+    return BenchmarkResult(name, ops_per_sec, peak_bytes=100, retained_bytes=0)
+
+
+def test_benchmarks_cover_every_mode_and_input_type():
+    with open(__file__) as stream:
+        names = [benchmark.name for benchmark in bench._benchmarks(stream, terminal=stream)]
+
+    assert len(names) == len(set(names))
+    for mode in bench.MODES:
+        for input_name in bench.COLOR_INPUTS:
+            assert f"colored[{mode.name},{input_name}]" in names
+
+    for input_name in bench.COLOR_INPUTS:
+        assert f"parse_color_input[{input_name}]" in names
+
+    for prefix in ("find_quantized_index[", "remove_ansi_codes[", "get_color_mode["):
+        assert any(name.startswith(prefix) for name in names)
+
+    # the detection cache is compared with detecting every time, on both kinds of stream
+    for kind in ("cached", "detect"):
+        for stream_name in ("file", "tty"):
+            assert f"get_color_mode[{kind},{stream_name}]" in names
+
+
+def test_run_benchmarks_filters_by_name():
+    results = run_benchmarks(["parse_color_input[int]"], repeat=1)
+
+    assert [r.name for r in results] == ["parse_color_input[int]"]
+    assert results[0].ops_per_sec > 0
+    assert results[0].peak_bytes >= 0 and results[0].retained_bytes >= 0
+
+
+def test_baseline_round_trip(tmp_path):
+    path = tmp_path / "baseline.json"
+    results = [result("a", 1000.0), result("b", 2000.0)]
+
+    save_baseline(results, path)
+    assert load_baseline(path) == {"a": results[0], "b": results[1]}
+    assert "python" in json.loads(path.read_text())
+
+
+@pytest.mark.parametrize(
+    "ops_per_sec, threshold, regressed",
+    [
+        (1000.0, 0.1, False),
+        (901.0, 0.1, False),
+        (899.0, 0.1, True),
+        (899.0, 0.2, False),
+        (2000.0, 0.0, False),
+        (999.0, 0.0, True),
+    ]
+)
+def test_find_regressions(ops_per_sec, threshold, regressed):
+    baseline = {"a": result("a", 1000.0)}
+    results = [result("a", ops_per_sec), result("new", 1.0)]
+
+    assert find_regressions(results, baseline, threshold) == ([results[0]] if regressed else [])
+
+
+@pytest.mark.parametrize("threshold", [-0.1, 1, 1.5])
+def test_find_regressions_rejects_invalid_thresholds(threshold):
+    with pytest.raises(ValueError):
+        find_regressions([], {}, threshold)
+
+
+def test_format_results():
+    table = format_results([result("a", 1100.0), result("new", 5.0)], {"a": result("a", 1000.0)})
+    lines = table.splitlines()
+
+    assert lines[0].split() == ["benchmark", "ops/s", "peak", "B", "kept", "B", "vs", "baseline"]
+    assert lines[1].split() == ["a", "1,100", "100", "0", "+10.0%"]
+    assert lines[2].split() == ["new", "5", "100", "0"]
+
+
+def test_main_exits_with_1_on_regression(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(bench, "run_benchmarks", lambda names, repeat: [result("a", 500.0)])
+
+    path = tmp_path / "baseline.json"
+    save_baseline([result("a", 1000.0)], path)
+
+    assert bench.main(["--baseline", str(path), "--threshold", "0.6"]) == 0
+    assert bench.main(["--baseline", str(path)]) == 1
+    assert "1 benchmark(s) more than 10% slower than the baseline:\n  a\n" in capsys.readouterr().out
+
+
+def test_main_saves_baseline(tmp_path, monkeypatch):
+    monkeypatch.setattr(bench, "run_benchmarks", lambda names, repeat: [result("a", 500.0)])
+
+    path = tmp_path / "baseline.json"
+    assert bench.main(["--save", str(path)]) == 0
+    assert load_baseline(path) == {"a": result("a", 500.0)}
+
+
+def test_bench_thread_scaling():
+    results = bench_thread_scaling(io.StringIO(), [1, 2], lines_per_thread=10)
+    assert [threads for threads, _, _ in results] == [1, 2]
+    assert all(safe > 0 and locked > 0 for _, safe, locked in results)
@@ -0,0 +1,87 @@
+from io import BytesIO
+
+import pytest
+
+from niji import (ColorMode, RGBColor, Style, TextStyle, colored, colored_bytes, cprint_bytes, get_ansi_code,
+                  get_ansi_code_bytes)
+
+MODES = [ColorMode.TRUE_COLOR, ColorMode.EXTENDED_256, ColorMode.STANDARD_16, ColorMode.NONE]
+CONFIGS = [
+    {"fg": RGBColor(255, 0, 0)},
+    {"fg": "#0D942B", "bg": (123, 44, 190)},
+    {"bg": 37, "styles": TextStyle.BOLD | TextStyle.ITALIC},
+    {"styles": TextStyle.UNDERLINE},
+    {},
+]
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("config", CONFIGS)
+def test_get_ansi_code_bytes_matches_str(mode, config):
+    assert get_ansi_code_bytes(**config, mode=mode) == get_ansi_code(**config, mode=mode).encode()
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("config", CONFIGS)
+def test_colored_bytes_matches_colored(mode, config):
+    expected = colored("some text", **config, mode=mode).encode()
+
+    assert colored_bytes(b"some text", **config, mode=mode) == expected
+    assert colored_bytes(b"some text", Style(**config), mode=mode) == expected
+
+
+@pytest.mark.parametrize("payload", [bytearray(b"payload"), memoryview(b"xxpayloadxx")[2:-2]])
+def test_colored_bytes_accepts_bytes_like(payload):
+    assert colored_bytes(payload, fg="#FF0000") == b"\033[38;2;255;0;0mpayload\033[0m"
+    assert colored_bytes(payload, mode=ColorMode.NONE) == b"payload"
+
+
+def test_colored_bytes_unstyled_bytes_are_returned_as_is():
+    payload = b"plain"
+    assert colored_bytes(payload, fg="#FF0000", mode=ColorMode.NONE) is payload
+
+
+def test_colored_bytes_non_ascii_payload():
+    payload = "日本語".encode()
+    assert colored_bytes(payload, styles=TextStyle.BOLD) == b"\033[1m" + payload + b"\033[0m"
+
+
+def test_colored_bytes_style_and_config():
+    with pytest.raises(ValueError):
+        colored_bytes(b"text", Style(fg="#FF0000"), bg="#000000")
+
+
+def test_colored_bytes_auto():
+    with pytest.raises(ValueError):
+        colored_bytes(b"text", fg="#FF0000", mode=ColorMode.AUTO)
+
+
+def test_cprint_bytes():
+    stream = BytesIO()
+    cprint_bytes(b"one", fg="#FF0000", mode=ColorMode.EXTENDED_256, file=stream)
+    cprint_bytes(memoryview(b"two"), Style(styles=TextStyle.BOLD), mode=ColorMode.TRUE_COLOR, file=stream, end=b"")
+
+    assert stream.getvalue() == b"\033[38;5;9mone\033[0m\n\033[1mtwo\033[0m"
+
+
+def test_cprint_bytes_auto_resolves_to_none():
+    stream = BytesIO()
+    cprint_bytes(b"some text", fg="#FF0000", file=stream)
+
+    assert stream.getvalue() == b"some text\n"
+
+
+def test_cprint_bytes_writes_once():
+    class Recorder(BytesIO):
+        def __init__(self):
+            super().__init__()
+            self.writes = 0
+
+        def write(self, data):
+            self.writes += 1
+            return super().write(data)
+
+    stream = Recorder()
+    cprint_bytes(b"text", fg="#FF0000", mode=ColorMode.TRUE_COLOR, file=stream)
+
+    assert stream.writes == 1
@@ -0,0 +1,140 @@
+import errno
+import os
+from io import BytesIO
+
+import pytest
+
+from niji import ColorMode, Style, TextStyle, colored, remove_ansi_codes, transcode
+from niji.__main__ import main, parse_rule, parse_style
+
+TEXT = (
+    colored("ERROR", fg="#FF0000", styles=TextStyle.BOLD) + ": disk 42 is full\n"
+    + "plain line\n"
+    + colored("info", fg="#0D942B", bg="#7B2CBE") + " done"
+)
+
+
+def run(argv, data=TEXT.encode()):
+    stdout = BytesIO()
+    assert main(argv, stdin=BytesIO(data), stdout=stdout) == 0
+    return stdout.getvalue()
+
+
+def test_strip_stdin():
+    assert run(["strip"]) == remove_ansi_codes(TEXT).encode()
+
+
+def test_strip_files(tmp_path):
+    first, second = tmp_path / "first.log", tmp_path / "second.log"
+    first.write_bytes(TEXT.encode())
+    second.write_bytes(b"\033[1mmore\033[0m\n")
+    empty = tmp_path / "empty.log"
+    empty.write_bytes(b"")
+
+    output = run(["strip", str(first), str(empty), "-", str(second)], data=b"\033[31mfrom stdin\n")
+    assert output == (remove_ansi_codes(TEXT) + "from stdin\nmore\n").encode()
+
+
+@pytest.mark.parametrize("command", [["strip"], ["downgrade", "-m", "16"], ["highlight", "more=bold", "-i"]])
+def test_unreadable_files_are_skipped(tmp_path, capsys, command):
+    first, second = tmp_path / "first.log", tmp_path / "second.log"
+    first.write_bytes(b"first\n")
+    second.write_bytes(b"second\n")
+    missing = tmp_path / "missing.log"
+
+    paths = [str(first), str(missing), str(tmp_path), str(second)]
+    if command[0] == "highlight":
+        paths = [arg for path in paths for arg in (path, "-i")][:-1]
+
+    stdout = BytesIO()
+    assert main([*command, *paths], stdin=BytesIO(), stdout=stdout) == 1
+
+    assert remove_ansi_codes(stdout.getvalue().decode()) == "first\nsecond\n"
+    missing_error, directory_error = capsys.readouterr().err.splitlines()
+    assert missing_error == f"niji: {missing}: {os.strerror(errno.ENOENT)}"
+    assert directory_error.startswith(f"niji: {tmp_path}: ")
+
+
+@pytest.mark.parametrize("option, mode", [("256", ColorMode.EXTENDED_256), ("16", ColorMode.STANDARD_16),
+                                          ("none", ColorMode.NONE)])
+def test_downgrade(tmp_path, option, mode):
+    path = tmp_path / "colored.log"
+    path.write_bytes(TEXT.encode())
+
+    assert run(["downgrade", "--mode", option, str(path)]) == transcode(TEXT, mode).encode()
+    assert run(["downgrade", "-m", option]) == transcode(TEXT, mode).encode()
+
+
+def test_chunks_split_sequences(monkeypatch, tmp_path):
+    monkeypatch.setattr("niji.__main__.CHUNK_SIZE", 3)
+    path = tmp_path / "colored.log"
+    path.write_bytes(TEXT.encode())
+
+    assert run(["strip", str(path)]) == remove_ansi_codes(TEXT).encode()
+    assert run(["downgrade", "-m", "16"]) == transcode(TEXT, ColorMode.STANDARD_16).encode()
+
+
+def test_highlight():
+    output = run(["highlight", "-m", "16", "ERROR|WARNING=bold,#FF0000", r"\d+=fg:#00AAFF"], data=b"ERROR 42\nok 7\n")
+    assert output == b"\033[1;91mERROR\033[0m \033[96m42\033[0m\nok \033[96m7\033[0m\n"
+
+
+def test_highlight_non_ascii_rules():
+    output = run(["highlight", "-m", "16", "[èx]=fg:1", "é+=bold"], data="è ééé\n".encode())
+    assert output == "\033[31mè\033[0m \033[1mééé\033[0m\n".encode()
+
+
+def test_highlight_first_rule_wins():
+    output = run(["highlight", "-m", "16", "disk=#FF0000", "d[a-z]+=#00FF00"], data=b"disk drive\n")
+    assert output == b"\033[91mdisk\033[0m \033[92mdrive\033[0m\n"
+
+
+def test_highlight_skips_existing_escape_sequences():
+    data = b"code \033[31mred 31\033[0m\n"
+    output = run(["highlight", "-m", "16", r"\d+=bold"], data=data)
+    assert output == b"code \033[31mred \033[1m31\033[0m\033[0m\n"
+
+
+def test_highlight_no_color():
+    assert run(["highlight", "-m", "none", "ERROR=bold"]) == TEXT.encode()
+
+
+def test_highlight_files(tmp_path, monkeypatch):
+    monkeypatch.setattr("niji.__main__.CHUNK_SIZE", 4)
+    path = tmp_path / "app.log"
+    path.write_bytes(b"one ERROR\n" * 10)
+
+    output = run(["highlight", "-m", "256", "ERROR=#FF0000", "-i", str(path)])
+    assert output == b"one \033[38;5;9mERROR\033[0m\n" * 10
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("bold", Style(styles=TextStyle.BOLD)),
+        ("Bold, ITALIC", Style(styles=TextStyle.BOLD | TextStyle.ITALIC)),
+        ("#FF0000", Style(fg="#FF0000")),
+        ("ff0000", Style(fg="#FF0000")),
+        ("fg:#00FF00,bg:#000080,underline", Style(fg="#00FF00", bg="#000080", styles=TextStyle.UNDERLINE)),
+        ("fg:196", Style(fg=196)),
+    ]
+)
+def test_parse_style(spec, expected):
+    assert parse_style(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["loud", "fg:#GG0000", "xx:#FF0000", "bg:300"])
+def test_parse_style_invalid(spec):
+    with pytest.raises(ValueError):
+        parse_style(spec)
+
+
+def test_parse_rule():
+    assert parse_rule("a=b=bold") == ("a=b", Style(styles=TextStyle.BOLD))
+
+
+@pytest.mark.parametrize("argv", [["highlight", "nostyle"], ["highlight", "=bold"], ["highlight", "[=bold"],
+                                  ["downgrade", "-m", "8"], []])
+def test_invalid_arguments(argv):
+    with pytest.raises(SystemExit):
+        main(argv, stdin=BytesIO(), stdout=BytesIO())
@@ -0,0 +1,141 @@
+import os
+
+import pytest
+
+from niji import ColorMode, get_color_mode, refresh_color_mode
+
+
+class FakeTerminal:
+    def __init__(self, fd: int = 1000, tty: bool = True):
+        self.fd = fd
+        self.tty = tty
+        self.isatty_calls = 0
+
+    def fileno(self):
+        return self.fd
+
+    def isatty(self):
+        self.isatty_calls += 1
+        return self.tty
+
+
+@pytest.fixture
+def truecolor_env(monkeypatch):
+    monkeypatch.delenv("NO_COLOR", raising=False)
+    monkeypatch.delenv("FORCE_COLOR", raising=False)
+    monkeypatch.setenv("TERM", "xterm-256color")
+    monkeypatch.setenv("COLORTERM", "truecolor")
+
+
+def test_get_color_mode_caches_per_file_descriptor(truecolor_env):
+    stream = FakeTerminal()
+
+    assert get_color_mode(stream) == ColorMode.TRUE_COLOR
+    assert get_color_mode(stream) == ColorMode.TRUE_COLOR
+    assert stream.isatty_calls == 1
+
+
+@pytest.mark.parametrize("tty", [True, False])
+def test_get_color_mode_cache_hits_skip_os_environ(truecolor_env, monkeypatch, tty):
+    # looking up a missing variable through os.environ raises and catches a KeyError, which made a cache hit slower
+    # than detecting the mode from scratch
+    stream = FakeTerminal(fd=1004, tty=tty)
+    get_color_mode(stream)
+
+    lookups = []
+    environ_type = type(os.environ)
+    getitem = environ_type.__getitem__
+    monkeypatch.setattr(environ_type, "__getitem__", lambda self, key: lookups.append(key) or getitem(self, key))
+
+    assert get_color_mode(stream) == (ColorMode.TRUE_COLOR if tty else ColorMode.NONE)
+    assert lookups == []
+    assert stream.isatty_calls == 1
+
+
+def test_get_color_mode_without_os_environ_dict(truecolor_env, monkeypatch):
+    # (os.environ might be replaced by a plain dict)
+    monkeypatch.setattr(os, "environ", {"TERM": "xterm-256color"})
+    monkeypatch.setattr(FakeTerminal, "isatty", lambda self: True)
+
+    stream = FakeTerminal(fd=1005)
+    assert get_color_mode(stream) == ColorMode.EXTENDED_256
+
+    os.environ["NO_COLOR"] = "1"
+    assert get_color_mode(stream) == ColorMode.NONE
+
+
+def test_get_color_mode_shares_cache_for_same_descriptor(truecolor_env):
+    get_color_mode(FakeTerminal(fd=1001))
+
+    other = FakeTerminal(fd=1001)
+    assert get_color_mode(other) == ColorMode.TRUE_COLOR
+    assert other.isatty_calls == 0
+
+
+def test_get_color_mode_separates_descriptors(truecolor_env):
+    assert get_color_mode(FakeTerminal(fd=1002, tty=True)) == ColorMode.TRUE_COLOR
+    assert get_color_mode(FakeTerminal(fd=1003, tty=False)) == ColorMode.NONE
+
+
+@pytest.mark.parametrize(
+    "name, value, expected",
+    [
+        ("NO_COLOR", "1", ColorMode.NONE),
+        ("COLORTERM", "", ColorMode.EXTENDED_256),
+        ("TERM", "dumb", ColorMode.TRUE_COLOR),
+    ]
+)
+def test_get_color_mode_invalidates_on_env_change(truecolor_env, monkeypatch, name, value, expected):
+    stream = FakeTerminal()
+    get_color_mode(stream)
+
+    monkeypatch.setenv(name, value)
+
+    assert get_color_mode(stream) == expected
+    assert stream.isatty_calls == (1 if name == "NO_COLOR" else 2)
+
+
+def test_get_color_mode_invalidates_on_env_removal(truecolor_env, monkeypatch):
+    stream = FakeTerminal()
+    get_color_mode(stream)
+
+    monkeypatch.delenv("COLORTERM")
+
+    assert get_color_mode(stream) == ColorMode.EXTENDED_256
+
+
+def test_refresh_color_mode_single_stream(truecolor_env):
+    stream = FakeTerminal()
+    get_color_mode(stream)
+
+    stream.tty = False
+    assert get_color_mode(stream) == ColorMode.TRUE_COLOR
+
+    refresh_color_mode(stream)
+    assert get_color_mode(stream) == ColorMode.NONE
+
+
+def test_refresh_color_mode_all_streams(truecolor_env):
+    streams = [FakeTerminal(fd=1010), FakeTerminal(fd=1011)]
+    for stream in streams:
+        get_color_mode(stream)
+
+    refresh_color_mode()
+
+    for stream in streams:
+        get_color_mode(stream)
+        assert stream.isatty_calls == 2
+
+
+class FakeTerminalWithoutDescriptor(FakeTerminal):
+    def fileno(self):
+        raise OSError("no file descriptor")
+
+
+def test_get_color_mode_does_not_cache_streams_without_descriptor(truecolor_env):
+    stream = FakeTerminalWithoutDescriptor()
+
+    get_color_mode(stream)
+    get_color_mode(stream)
+
+    assert stream.isatty_calls == 2
@@ -0,0 +1,98 @@
+import sys
+from io import StringIO
+
+import pytest
+
+from niji import ColorMode, ColorWriter, RGBColor, Style, TextStyle, cprint
+
+RED = Style(fg=RGBColor(255, 0, 0))
+RED_PREFIX = "\033[38;2;255;0;0m"
+
+
+def test_color_writer_buffers_until_flush():
+    stream = StringIO()
+    writer = ColorWriter(stream, mode=ColorMode.TRUE_COLOR)
+
+    writer.write("some text", RED)
+    assert stream.getvalue() == ""
+
+    writer.flush()
+    assert stream.getvalue() == f"{RED_PREFIX}some text\033[0m"
+
+
+def test_color_writer_flushes_on_context_exit():
+    stream = StringIO()
+
+    with ColorWriter(stream, mode=ColorMode.TRUE_COLOR) as writer:
+        writer.write("some text", fg=RGBColor(255, 0, 0))
+
+    assert stream.getvalue() == f"{RED_PREFIX}some text\033[0m"
+
+
+def test_color_writer_merges_identical_styles():
+    stream = StringIO()
+
+    with ColorWriter(stream, mode=ColorMode.TRUE_COLOR) as writer:
+        writer.write("a", RED)
+        writer.write("b", fg="#FF0000")
+        writer.write("c", RED)
+        writer.write("d")
+        writer.write("e")
+        writer.write("f", RED)
+
+    assert stream.getvalue() == f"{RED_PREFIX}abc\033[0mde{RED_PREFIX}f\033[0m"
+
+
+def test_color_writer_print_matches_cprint():
+    expected = StringIO()
+    cprint("some text", fg=RGBColor(255, 0, 0), styles=TextStyle.BOLD, mode=ColorMode.EXTENDED_256, file=expected)
+    cprint("more text", mode=ColorMode.EXTENDED_256, file=expected, end="!")
+
+    stream = StringIO()
+    with ColorWriter(stream, mode=ColorMode.EXTENDED_256) as writer:
+        writer.print("some text", fg=RGBColor(255, 0, 0), styles=TextStyle.BOLD)
+        writer.print("more text", end="!")
+
+    assert stream.getvalue() == expected.getvalue()
+
+
+def test_color_writer_writes_when_buffer_is_full():
+    stream = StringIO()
+    writer = ColorWriter(stream, mode=ColorMode.TRUE_COLOR, buffer_size=10)
+
+    writer.write("12345", RED)
+    assert stream.getvalue() == ""
+
+    writer.write("67890")
+    assert stream.getvalue() == f"{RED_PREFIX}12345\033[0m67890"
+
+
+def test_color_writer_none_mode_writes_plain_text():
+    stream = StringIO()
+
+    with ColorWriter(stream, mode=ColorMode.NONE) as writer:
+        writer.write("a", RED)
+        writer.write("b", fg=RGBColor(0, 0, 255))
+
+    assert stream.getvalue() == "ab"
+
+
+def test_color_writer_resolves_auto_mode_once(monkeypatch):
+    monkeypatch.setenv("COLORTERM", "truecolor")
+    monkeypatch.delenv("NO_COLOR", raising=False)
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+
+    writer = ColorWriter(sys.stdout)
+    assert writer.mode == ColorMode.TRUE_COLOR
+
+    assert ColorWriter(StringIO()).mode == ColorMode.NONE
+
+
+def test_color_writer_raises_with_style_and_colors():
+    with pytest.raises(ValueError, match="either a style or fg/bg/styles"):
+        ColorWriter(StringIO(), mode=ColorMode.TRUE_COLOR).write("a", RED, fg=RGBColor(0, 0, 0))
+
+
+def test_color_writer_raises_on_invalid_buffer_size():
+    with pytest.raises(ValueError, match="Buffer size should be at least 1"):
+        ColorWriter(StringIO(), buffer_size=0)
@@ -0,0 +1,102 @@
+import pytest
+
+from niji import ColoredText, ColorMode, RGBColor, Style, TextStyle, colored
+
+RED = Style(fg=RGBColor(255, 0, 0))
+BOLD = Style(styles=TextStyle.BOLD)
+
+
+def test_colored_text_renders_like_colored():
+    text = ColoredText("some text", RED)
+
+    for mode in (ColorMode.TRUE_COLOR, ColorMode.EXTENDED_256, ColorMode.STANDARD_16, ColorMode.NONE):
+        assert text.render(mode) == colored("some text", fg=RGBColor(255, 0, 0), mode=mode)
+
+
+def test_colored_text_render_is_memoized():
+    text = ColoredText("some text", RED)
+    assert text.render(ColorMode.EXTENDED_256) is text.render(ColorMode.EXTENDED_256)
+
+
+@pytest.mark.parametrize(
+    "spec, mode",
+    [
+        ("", ColorMode.TRUE_COLOR),
+        ("256", ColorMode.EXTENDED_256),
+        ("16", ColorMode.STANDARD_16),
+        ("plain", ColorMode.NONE),
+        ("extended_256", ColorMode.EXTENDED_256),
+        ("NONE", ColorMode.NONE),
+    ]
+)
+def test_colored_text_format(spec, mode):
+    text = ColoredText("a", RED) + "b"
+    assert format(text, spec) == text.render(mode)
+
+
+def test_colored_text_format_in_fstring():
+    text = ColoredText("a", RED)
+    assert f"[{text:256}]" == "[\033[38;5;9ma\033[0m]"
+    assert str(text) == text.render(ColorMode.TRUE_COLOR)
+
+
+def test_colored_text_format_raises_on_invalid_spec():
+    with pytest.raises(ValueError, match="Invalid format spec"):
+        format(ColoredText("a"), "<10")
+
+
+def test_colored_text_concatenation():
+    text = "> " + ColoredText("a", RED) + ColoredText("b", RED) + " " + ColoredText("c", BOLD)
+
+    assert text.spans == (("> ", None), ("ab", RED), (" ", None), ("c", BOLD))
+    assert text.plain == "> ab c"
+    assert len(text) == 6
+
+
+def test_colored_text_join():
+    separator = ColoredText(", ", BOLD)
+    text = separator.join([ColoredText("a", RED), "b", ColoredText("c", RED)])
+
+    assert text.spans == (("a", RED), (", ", BOLD), ("b", None), (", ", BOLD), ("c", RED))
+
+
+def test_colored_text_join_empty():
+    assert ColoredText(", ").join([]) == ColoredText()
+
+
+@pytest.mark.parametrize(
+    "key, expected",
+    [
+        (slice(None), (("ab", RED), ("cd", None), ("ef", BOLD))),
+        (slice(1, 5), (("b", RED), ("cd", None), ("e", BOLD))),
+        (slice(2, 4), (("cd", None),)),
+        (slice(-3, None), (("d", None), ("ef", BOLD))),
+        (slice(4, 2), ()),
+        (0, (("a", RED),)),
+        (-1, (("f", BOLD),)),
+    ]
+)
+def test_colored_text_slicing(key, expected):
+    text = ColoredText("ab", RED) + "cd" + ColoredText("ef", BOLD)
+    assert text[key].spans == expected
+
+
+def test_colored_text_slicing_raises_on_step():
+    with pytest.raises(ValueError, match="steps"):
+        ColoredText("abc")[::2]
+
+
+def test_colored_text_index_out_of_range():
+    with pytest.raises(IndexError):
+        ColoredText("abc")[3]
+
+
+def test_colored_text_equality():
+    assert ColoredText("ab", RED) == ColoredText("a", RED) + ColoredText("b", Style(fg="#FF0000"))
+    assert ColoredText("ab", RED) != ColoredText("ab")
+    assert len({ColoredText("ab", RED), ColoredText("a", RED) + ColoredText("b", RED)}) == 1
+
+
+def test_colored_text_merges_adjacent_spans_when_rendered():
+    text = ColoredText("a", RED) + ColoredText("b", RED)
+    assert text.render() == "\033[38;2;255;0;0mab\033[0m"
@@ -0,0 +1,76 @@
+import pytest
+
+from niji import ColorMode, TextStyle, colored, remove_ansi_codes, strip_file, transcode, transcode_file
+
+TEXT = "".join(
+    colored(f"line {i}", fg=(i % 256, 100, 200), styles=TextStyle.BOLD if i % 3 else None) + " plain\n"
+    for i in range(200)
+) + "\033]0;a title\nspanning lines\007after\n\033]8;;https://example.com\033\\link\033]8;;\033\\ no newline at the end"
+
+
+@pytest.fixture
+def src(tmp_path):
+    path = tmp_path / "src.log"
+    path.write_bytes(TEXT.encode())
+    return path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("chunk_size", [1, 17, 1000, 1 << 24])
+def test_strip_file(tmp_path, src, workers, chunk_size):
+    dst = tmp_path / "dst.log"
+    written = strip_file(src, dst, workers=workers, chunk_size=chunk_size)
+
+    assert dst.read_bytes() == remove_ansi_codes(TEXT).encode()
+    assert written == dst.stat().st_size
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+@pytest.mark.parametrize("mode", [ColorMode.EXTENDED_256, ColorMode.STANDARD_16, ColorMode.NONE])
+def test_transcode_file(tmp_path, src, workers, mode):
+    dst = tmp_path / "dst.log"
+    transcode_file(str(src), str(dst), mode, workers=workers, chunk_size=50)
+
+    assert dst.read_bytes() == transcode(TEXT, mode).encode()
+
+
+def test_strip_empty_file(tmp_path):
+    src, dst = tmp_path / "empty.log", tmp_path / "dst.log"
+    src.write_bytes(b"")
+
+    assert strip_file(src, dst, workers=2) == 0
+    assert dst.read_bytes() == b""
+
+
+@pytest.mark.parametrize("kwargs", [{"workers": 0}, {"chunk_size": 0}])
+def test_strip_file_invalid_arguments(tmp_path, src, kwargs):
+    with pytest.raises(ValueError):
+        strip_file(src, tmp_path / "dst.log", **kwargs)
+
+
+def test_transcode_file_auto(tmp_path, src):
+    with pytest.raises(ValueError):
+        transcode_file(src, tmp_path / "dst.log", ColorMode.AUTO)
+
+
+@pytest.mark.parametrize("process", [strip_file, lambda src, dst: transcode_file(src, dst, ColorMode.STANDARD_16)])
+def test_same_source_and_destination(tmp_path, src, process):
+    link = tmp_path / "link.log"
+    link.hardlink_to(src)
+
+    for dst in (src, link):
+        with pytest.raises(ValueError):
+            process(src, dst)
+
+    assert src.read_bytes() == TEXT.encode()
+
+
+def test_strip_file_with_stray_string_sequence(tmp_path):
+    # an unterminated OSC near the start must neither swallow the rest of the file nor stall the chunking
+    text = "ab\033]0;\n" + "some log line\n" * 200_000
+    src = tmp_path / "stray.log"
+    src.write_bytes(text.encode())
+
+    dst = tmp_path / "dst.log"
+    strip_file(src, dst, workers=1, chunk_size=4096)
+    assert dst.read_bytes() == ("ab\n" + "some log line\n" * 200_000).encode()
@@ -0,0 +1,157 @@
+import re
+from io import BytesIO, StringIO
+
+import pytest
+
+from niji import ColorMode, Highlighter, Style, TextStyle, remove_ansi_codes
+
+RED = Style(fg="#FF0000")
+BOLD = Style(styles=TextStyle.BOLD)
+BLUE = Style(fg="#0000FF")
+
+LEVELS = Highlighter([
+    (r"\b(ERROR|FATAL)\b", RED),
+    (r"\b\d+(\.\d+)?ms\b", BLUE),
+    (r"\b\d+\b", BOLD),
+])
+
+
+def test_highlight():
+    line = "ERROR after 12.5ms (attempt 3)"
+    assert LEVELS.highlight(line) == (
+        f"{RED.render('ERROR')} after {BLUE.render('12.5ms')} (attempt {BOLD.render('3')})"
+    )
+
+
+def test_highlight_call():
+    assert LEVELS("FATAL", ColorMode.STANDARD_16) == RED.render("FATAL", ColorMode.STANDARD_16)
+
+
+@pytest.mark.parametrize("mode", [ColorMode.TRUE_COLOR, ColorMode.EXTENDED_256, ColorMode.STANDARD_16])
+def test_highlight_bytes(mode):
+    line = "ERROR after 12.5ms (attempt 3) — 日本"
+    assert LEVELS.highlight(line.encode(), mode) == LEVELS.highlight(line, mode).encode()
+
+
+@pytest.mark.parametrize(
+    "pattern, text, expected",
+    [
+        ("[èx]", "è!", "\033[91mè\033[0m!"),
+        ("é+", "ééé", "\033[91mééé\033[0m"),
+        (r"(?u)\w+", "naïve!", "\033[91mnaïve\033[0m!"),
+    ]
+)
+def test_highlight_bytes_matches_characters(pattern, text, expected):
+    highlighter = Highlighter([(pattern, RED)])
+    assert highlighter.highlight(text.encode(), ColorMode.STANDARD_16) == expected.encode()
+
+
+def test_highlight_bytes_keeps_invalid_utf8():
+    highlighter = Highlighter([("x", RED)])
+    assert highlighter.highlight(b"\xffx\xe9", ColorMode.STANDARD_16) == b"\xff\033[91mx\033[0m\xe9"
+
+    data = b"\xff\xe9 no match"
+    assert highlighter.highlight(data, ColorMode.STANDARD_16) is data
+
+
+def test_highlight_keeps_plain_text():
+    line = "ERROR after 12.5ms (attempt 3)"
+    assert remove_ansi_codes(LEVELS.highlight(line)) == line
+
+
+def test_highlight_no_matches_returns_text():
+    line = "nothing to see here"
+    assert LEVELS.highlight(line) is line
+
+
+def test_highlight_no_color():
+    line = "ERROR 42"
+    assert LEVELS.highlight(line, ColorMode.NONE) is line
+
+
+def test_highlight_first_rule_wins_at_the_same_place():
+    highlighter = Highlighter([("disk", RED), (r"d\w+", BLUE)])
+    assert highlighter.highlight("disk drive diskette") == (
+        f"{RED.render('disk')} {BLUE.render('drive')} {RED.render('disk')}ette"
+    )
+
+
+def test_highlight_leftmost_match_wins():
+    highlighter = Highlighter([("world", RED), ("lo wo", BLUE)])
+    assert highlighter.highlight("hello world") == f"hel{BLUE.render('lo wo')}rld"
+
+
+def test_highlight_unstyled_rule_shields_later_rules():
+    highlighter = Highlighter([(r"v\d+", None), (r"\d+", BOLD)])
+    assert highlighter.highlight("v2 has 3") == f"v2 has {BOLD.render('3')}"
+
+
+def test_highlight_skips_existing_escape_sequences():
+    line = "\033[31mred 31\033[0m \033]8;;http://x/31\033\\link\033]8;;\033\\"
+    highlighter = Highlighter([(r"\d+", BOLD)])
+
+    assert highlighter.highlight(line) == (
+        f"\033[31mred {BOLD.render('31')}\033[0m \033]8;;http://x/31\033\\link\033]8;;\033\\"
+    )
+
+
+def test_highlight_ignores_empty_matches():
+    highlighter = Highlighter([(r"x*", RED)])
+    assert highlighter.highlight("abxc") == f"ab{RED.render('x')}c"
+
+
+def test_highlight_flags():
+    highlighter = Highlighter([("error", RED)], flags=re.IGNORECASE)
+    assert highlighter.highlight("Error") == RED.render("Error")
+
+
+def test_highlight_prefixes_are_resolved_once(monkeypatch):
+    highlighter = Highlighter([("a", RED)])
+    highlighter.highlight("a")
+    expected = RED.render("a") * 2
+
+    monkeypatch.setattr(Style, "prefix", lambda *args: pytest.fail("prefix was resolved again"))
+    assert highlighter.highlight("aa") == expected
+
+
+@pytest.mark.parametrize("size", [1, 3, 10, 1000])
+def test_iter_highlight_chunks(size):
+    text = "ERROR at line 10\nok 200ms\n\nFATAL 3" * 3
+    chunks = [text[i:i + size] for i in range(0, len(text), size)]
+
+    assert "".join(LEVELS.iter_highlight(chunks)) == LEVELS.highlight(text)
+
+
+def test_iter_highlight_files():
+    text = "ERROR at line 10\nok 200ms\n"
+    assert "".join(LEVELS.iter_highlight(StringIO(text), chunk_size=4)) == LEVELS.highlight(text)
+    assert b"".join(LEVELS.iter_highlight(BytesIO(text.encode()), chunk_size=4)) == LEVELS.highlight(text).encode()
+
+
+@pytest.mark.parametrize("pattern, text, expected", [
+    (r"(\w)\1", "aabc", "\033[91maa\033[0mbc"),
+    (r"(?P<x>\w)(?P=x)", "abcc", "ab\033[91mcc\033[0m"),
+    (r"(x)?y(?(1)z|w)", "yw xyz", "\033[91myw\033[0m \033[91mxyz\033[0m"),
+    (r"[\1](b)\1", "\x01bb 1bb", "\033[91m\x01bb\033[0m 1bb"),
+    (r"(?i)error", "ERROR error", "\033[91mERROR\033[0m \033[91merror\033[0m"),
+    (r"(?x) e r r  # a comment", "err", "\033[91merr\033[0m"),
+    (r"(?P<csi>a)(?P<esc>b)", "ab", "\033[91mab\033[0m"),
+])
+def test_highlight_rules_are_independent(pattern, text, expected):
+    # each rule is matched as if on its own, after the escape sequence rule and another rule with groups
+    highlighter = Highlighter([(r"(q)(q)\2", BLUE), (pattern, RED)])
+    assert highlighter.highlight(text, ColorMode.STANDARD_16) == expected
+
+
+def test_highlight_invalid():
+    with pytest.raises(ValueError):
+        Highlighter([])
+
+    with pytest.raises(re.error, match="rule 1"):
+        Highlighter([("a", RED), ("(", RED)])
+
+    with pytest.raises(re.error, match="reserved"):
+        Highlighter([("(?P<_niji_r0>a)", RED)])
+
+    with pytest.raises(ValueError):
+        LEVELS.highlight("ERROR", ColorMode.AUTO)
@@ -0,0 +1,117 @@
+import io
+
+import pytest
+
+import niji
+from niji import ColorMode, ColorWriter, RGBColor, Style, ThreadSafePrinter, cprint, cprint_bytes, instrumentation
+from niji.colors import parse_color_input
+from niji.indexed_colors import find_quantized_index
+
+RED_PREFIX = "\033[38;2;255;0;0m"
+
+
+@pytest.fixture(autouse=True)
+def fresh_instrumentation():
+    instrumentation.disable()
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def calls():
+    return {stage: stage_stats.calls for stage, stage_stats in niji.stats().stages.items()}
+
+
+def test_disabled_by_default():
+    parse_color_input("#FF0000")
+    cprint("text", fg="#FF0000", mode=ColorMode.TRUE_COLOR, file=io.StringIO())
+
+    assert not instrumentation.is_enabled()
+    assert niji.stats() == instrumentation.Stats(dict.fromkeys(instrumentation.STAGES, (0, 0)), 0, 0)
+
+
+def test_stages_are_counted():
+    instrumentation.enable()
+
+    parse_color_input("#FF0000")
+    find_quantized_index(RGBColor(255, 0, 0), ColorMode.EXTENDED_256)
+    niji.get_color_mode(io.StringIO())
+    niji.get_ansi_code(fg=(255, 0, 0), mode=ColorMode.STANDARD_16)
+
+    # get_ansi_code parses and quantizes its color too
+    assert calls() == {"parse": 2, "quantize": 2, "style": 1, "detect": 1, "write": 0}
+    assert all(stage_stats.total_ns > 0 for stage_stats in niji.stats().stages.values() if stage_stats.calls)
+
+
+def test_calls_which_raise_are_counted():
+    instrumentation.enable()
+
+    with pytest.raises(ValueError):
+        parse_color_input("not a color")
+
+    assert calls()["parse"] == 1
+
+
+@pytest.mark.parametrize(
+    "write, escape_bytes, payload_bytes",
+    [
+        (lambda: cprint("héllo", fg="#FF0000", mode=ColorMode.TRUE_COLOR, file=io.StringIO()), 19, 7),
+        (lambda: cprint("héllo", mode=ColorMode.TRUE_COLOR, file=io.StringIO()), 0, 7),
+        (lambda: cprint_bytes(b"hello", fg="#FF0000", mode=ColorMode.TRUE_COLOR, file=io.BytesIO()), 19, 6),
+        (lambda: ThreadSafePrinter(io.StringIO(), mode=ColorMode.TRUE_COLOR).print("hello", fg="#FF0000"), 19, 6),
+        (lambda: ThreadSafePrinter(io.StringIO(), mode=ColorMode.NONE).print("hello", fg="#FF0000"), 0, 6),
+    ]
+)
+def test_writes_count_escape_and_payload_bytes(write, escape_bytes, payload_bytes):
+    instrumentation.enable()
+    write()
+
+    stats = niji.stats()
+    assert stats.stages["write"].calls == 1
+    assert (stats.escape_bytes, stats.payload_bytes) == (escape_bytes, payload_bytes)
+
+
+def test_color_writer_writes_are_counted_when_flushed():
+    instrumentation.enable()
+
+    with ColorWriter(io.StringIO(), mode=ColorMode.TRUE_COLOR) as writer:
+        writer.write("a", Style(fg="#FF0000"))
+        writer.write("b")
+        assert calls()["write"] == 0
+
+    stats = niji.stats()
+    assert stats.stages["write"].calls == 1
+    assert (stats.escape_bytes, stats.payload_bytes) == (len(RED_PREFIX) + 4, 2)
+    assert stats.escape_ratio == pytest.approx(19 / 21)
+
+
+def test_callback_receives_every_event():
+    events = []
+    instrumentation.enable(events.append)
+
+    parse_color_input((255, 0, 0))
+    cprint("hi", mode=ColorMode.NONE, file=io.StringIO())
+
+    assert [(event.stage, event.escape_bytes, event.payload_bytes) for event in events] == [
+        ("parse", 0, 0),
+        ("style", 0, 0),
+        ("write", 0, 3),
+    ]
+    assert all(event.elapsed_ns >= 0 for event in events)
+
+    instrumentation.disable()
+    parse_color_input((255, 0, 0))
+    assert len(events) == 3
+
+
+def test_disable_keeps_counts_and_reset_clears_them():
+    instrumentation.enable()
+    parse_color_input(1)
+    instrumentation.disable()
+    parse_color_input(1)
+
+    assert calls()["parse"] == 1
+
+    instrumentation.reset()
+    assert calls()["parse"] == 0
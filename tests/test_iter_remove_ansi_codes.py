@@ -0,0 +1,57 @@
+from io import BytesIO, StringIO
+
+import pytest
+
+from niji import RGBColor, TextStyle, colored, iter_remove_ansi_codes, remove_ansi_codes
+
+TEXT = (
+    colored("some text", fg=RGBColor(13, 148, 43), bg=RGBColor(123, 44, 190), styles=TextStyle.BOLD)
+    + " plain \033 not a code\n"
+    + colored("more text", styles=TextStyle.ITALIC)
+    + "\033[unterminated\nend \033["
+)
+
+
+def split_every(s, n):
+    return [s[i:i + n] for i in range(0, len(s), n)]
+
+
+def test_remove_ansi_codes_returns_input_without_escapes():
+    s = "some normal string"
+    assert remove_ansi_codes(s) is s
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16, 1000])
+def test_iter_remove_ansi_codes_str_chunks(size):
+    assert "".join(iter_remove_ansi_codes(split_every(TEXT, size))) == remove_ansi_codes(TEXT)
+
+
+def test_iter_remove_ansi_codes_every_split_point():
+    for i in range(len(TEXT)):
+        assert "".join(iter_remove_ansi_codes([TEXT[:i], TEXT[i:]])) == remove_ansi_codes(TEXT)
+
+
+@pytest.mark.parametrize("size", [1, 5, 1000])
+def test_iter_remove_ansi_codes_bytes_chunks(size):
+    data = TEXT.encode()
+    assert b"".join(iter_remove_ansi_codes(split_every(data, size))) == remove_ansi_codes(TEXT).encode()
+
+
+def test_iter_remove_ansi_codes_text_file():
+    cleaned = iter_remove_ansi_codes(StringIO(TEXT), chunk_size=4)
+    assert "".join(cleaned) == remove_ansi_codes(TEXT)
+
+
+def test_iter_remove_ansi_codes_binary_file():
+    cleaned = iter_remove_ansi_codes(BytesIO(TEXT.encode()), chunk_size=4)
+    assert b"".join(cleaned) == remove_ansi_codes(TEXT).encode()
+
+
+def test_iter_remove_ansi_codes_holds_back_only_the_unfinished_code():
+    cleaned = iter_remove_ansi_codes(["abc\033[1", ";2mdef"])
+    assert next(cleaned) == "abc"
+    assert next(cleaned) == "def"
+
+
+def test_iter_remove_ansi_codes_empty():
+    assert list(iter_remove_ansi_codes([])) == []
@@ -0,0 +1,178 @@
+import io
+import os
+import logging
+import sys
+
+import pytest
+
+from niji import ColorMode, Style, TextStyle
+from niji.logging import DEFAULT_LEVEL_STYLES, ColorFormatter
+
+BLUE = Style(fg="#0000FF")
+DIM = Style(styles=TextStyle.DIM)
+
+
+def make_record(level=logging.INFO, msg="hello %s", args=("world",), name="app"):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_formatter_styles_levelname():
+    formatter = ColorFormatter("%(levelname)s: %(message)s", mode=ColorMode.TRUE_COLOR)
+
+    for level, style in DEFAULT_LEVEL_STYLES.items():
+        name = logging.getLevelName(level)
+        assert formatter.format(make_record(level)) == f"{style.render(name)}: hello world"
+
+
+def test_formatter_styles_fields():
+    formatter = ColorFormatter("%(name)-5s|%(levelname)s|%(message)s", level_styles={}, field_styles={"name": BLUE},
+                               mode=ColorMode.EXTENDED_256)
+
+    assert formatter.format(make_record()) == f"{BLUE.render('app  ', ColorMode.EXTENDED_256)}|INFO|hello world"
+
+
+def test_formatter_custom_levels_use_the_nearest_lower_style():
+    formatter = ColorFormatter("%(levelname)s", level_styles={logging.WARNING: BLUE}, mode=ColorMode.TRUE_COLOR)
+
+    assert formatter.format(make_record(logging.INFO)) == "INFO"
+    assert formatter.format(make_record(35)) == BLUE.render("Level 35")
+    assert formatter.format(make_record(logging.CRITICAL)) == BLUE.render("CRITICAL")
+
+
+@pytest.mark.parametrize(
+    "fmt, style",
+    [
+        ("%(asctime)s [%(levelname)8s] %(message)s", "%"),
+        ("{asctime} [{levelname:>8}] {message}", "{"),
+        ("$asctime [${levelname}] $message", "$"),
+    ]
+)
+def test_formatter_matches_plain_formatter_without_styles(fmt, style):
+    plain = logging.Formatter(fmt, style=style, datefmt="%H")
+    colored = ColorFormatter(fmt, style=style, datefmt="%H", level_styles={}, mode=ColorMode.TRUE_COLOR)
+
+    record = make_record(logging.ERROR)
+    assert colored.format(record) == plain.format(record)
+
+
+@pytest.mark.parametrize(
+    "fmt, style, expected",
+    [
+        ("%(levelname)-8s|%(message)s", "%", "{ERROR   }|hello world"),
+        ("{levelname:<8}|{message}", "{", "{ERROR   }|hello world"),
+        ("${levelname}|${message}", "$", "{ERROR}|hello world"),
+    ]
+)
+def test_formatter_styles(fmt, style, expected):
+    level_style = DEFAULT_LEVEL_STYLES[logging.ERROR]
+    formatter = ColorFormatter(fmt, style=style, mode=ColorMode.STANDARD_16)
+
+    prefix = level_style.prefix(ColorMode.STANDARD_16)
+    assert formatter.format(make_record(logging.ERROR)) == expected.replace("{", prefix).replace("}", "\033[0m")
+
+
+def test_formatter_no_color():
+    formatter = ColorFormatter("%(levelname)s %(name)s %(message)s", field_styles={"name": BLUE}, mode=ColorMode.NONE)
+    assert formatter.format(make_record()) == "INFO app hello world"
+
+
+def test_formatter_keeps_exception_text():
+    formatter = ColorFormatter("%(levelname)s %(message)s", mode=ColorMode.TRUE_COLOR)
+
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        record = logging.LogRecord("app", logging.ERROR, __file__, 1, "failed", (), sys.exc_info())
+
+    output = formatter.format(record)
+    assert output.startswith(DEFAULT_LEVEL_STYLES[logging.ERROR].render("ERROR") + " failed\nTraceback")
+    assert output.endswith("RuntimeError: boom")
+
+
+def test_formatter_auto_mode_uses_stream(monkeypatch):
+    monkeypatch.setenv("COLORTERM", "truecolor")
+    stream = io.StringIO()
+    stream.isatty = lambda: True
+
+    formatter = ColorFormatter("%(levelname)s", stream=stream)
+    assert formatter.mode == ColorMode.TRUE_COLOR
+
+    assert ColorFormatter("%(levelname)s", stream=io.StringIO()).mode == ColorMode.NONE
+
+
+def test_formatter_auto_mode_without_a_stream(monkeypatch, capsys):
+    # a formatter set with setFormatter can't see its handler's stream, so it must not guess (e.g., from sys.stderr),
+    # and it must not fail on every record either
+    monkeypatch.delenv("NO_COLOR", raising=False)
+    monkeypatch.delenv("FORCE_COLOR", raising=False)
+    monkeypatch.setenv("COLORTERM", "truecolor")
+    monkeypatch.setattr(sys.stderr, "isatty", lambda: True)
+
+    output = io.StringIO()
+    handler = logging.StreamHandler(output)
+    handler.setFormatter(ColorFormatter("%(levelname)s %(message)s"))
+
+    logger = logging.getLogger("niji.test_set_formatter")
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        logger.error("x")
+    finally:
+        logger.removeHandler(handler)
+
+    assert output.getvalue() == "ERROR x\n"
+    assert capsys.readouterr().err == ""
+
+    monkeypatch.setenv("FORCE_COLOR", "1")
+    assert ColorFormatter("%(levelname)s").mode == ColorMode.TRUE_COLOR
+
+
+def test_install_without_a_stream(monkeypatch):
+    monkeypatch.delenv("FORCE_COLOR", raising=False)
+    monkeypatch.setenv("COLORTERM", "truecolor")
+    monkeypatch.setattr(sys.stderr, "isatty", lambda: True)
+    formatter = ColorFormatter("%(levelname)s %(message)s")
+
+    handler = logging.FileHandler(os.devnull)
+    try:
+        formatter.install(handler)
+        assert formatter.mode == ColorMode.NONE
+        assert formatter.format(make_record(logging.ERROR, "x", ())) == "ERROR x"
+    finally:
+        handler.close()
+
+    formatter.install(logging.NullHandler())
+    assert formatter.mode == ColorMode.NONE
+
+
+def test_install_detects_mode_from_handler_stream(monkeypatch):
+    monkeypatch.setenv("COLORTERM", "truecolor")
+    terminal = io.StringIO()
+    terminal.isatty = lambda: True
+
+    handler = logging.StreamHandler(terminal)
+    formatter = ColorFormatter("%(levelname)s %(message)s").install(handler)
+    assert handler.formatter is formatter
+
+    logger = logging.getLogger("niji.test_install")
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        logger.warning("careful")
+    finally:
+        logger.removeHandler(handler)
+
+    assert terminal.getvalue() == DEFAULT_LEVEL_STYLES[logging.WARNING].render("WARNING") + " careful\n"
+
+    file_handler = logging.StreamHandler(io.StringIO())
+    formatter.install(file_handler)
+    assert formatter.mode == ColorMode.NONE
+
+
+def test_formatter_builds_each_level_format_once(monkeypatch):
+    formatter = ColorFormatter("%(levelname)s %(message)s", field_styles={"message": DIM}, mode=ColorMode.TRUE_COLOR)
+    formatter.format(make_record())
+    expected = formatter.format(make_record())
+
+    monkeypatch.setattr(Style, "prefix", lambda *args: pytest.fail("prefix was resolved again"))
+    assert formatter.format(make_record()) == expected
@@ -0,0 +1,55 @@
+import pytest
+
+from niji.cache import CacheStats, LRUCache
+
+
+def test_lru_cache_hits_and_misses():
+    cache: LRUCache[str, int] = LRUCache(4)
+
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+
+    assert cache.stats() == CacheStats(hits=1, misses=1, evictions=0, size=1, maxsize=4)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.stats().evictions == 1
+
+
+def test_lru_cache_shrinking_maxsize_evicts():
+    cache: LRUCache[int, int] = LRUCache(4)
+    for i in range(4):
+        cache.put(i, i)
+
+    cache.maxsize = 1
+
+    assert len(cache) == 1
+    assert 3 in cache
+    assert cache.stats().evictions == 3
+
+
+def test_lru_cache_clear_resets_entries_and_counters():
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    cache.clear()
+
+    assert cache.stats() == CacheStats(hits=0, misses=0, evictions=0, size=0, maxsize=2)
+
+
+@pytest.mark.parametrize("maxsize", [0, -1])
+def test_lru_cache_raises_on_invalid_size(maxsize):
+    with pytest.raises(ValueError, match="Cache size should be at least 1"):
+        LRUCache(maxsize)
@@ -0,0 +1,29 @@
+import pytest
+
+from niji import RGBColor
+from niji.colors import COLOR_MAP_256, COLOR_MAP_256_PACKED
+
+
+@pytest.mark.parametrize(
+    "color, packed",
+    [
+        (RGBColor(0, 0, 0), 0x000000),
+        (RGBColor(255, 255, 255), 0xFFFFFF),
+        (RGBColor(0x12, 0x34, 0x56), 0x123456),
+        (RGBColor(255, 0, 0), 0xFF0000),
+        (RGBColor(0, 0, 255), 0x0000FF),
+    ]
+)
+def test_packed(color, packed):
+    assert color.packed == packed
+    assert RGBColor.from_packed(packed) == color
+
+
+@pytest.mark.parametrize("packed", [-1, 0x1000000])
+def test_from_packed_out_of_range(packed):
+    with pytest.raises(ValueError):
+        RGBColor.from_packed(packed)
+
+
+def test_packed_color_map():
+    assert [RGBColor.from_packed(packed) for packed in COLOR_MAP_256_PACKED] == COLOR_MAP_256
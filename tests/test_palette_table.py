@@ -0,0 +1,99 @@
+import itertools
+
+import pytest
+
+from niji import ColorMode, RGBColor
+from niji.colors import COLOR_MAP_256
+from niji.indexed_colors import get_palette_table
+from niji.palettes import PaletteTable
+
+GRID = list(itertools.product(range(0, 256, 15), repeat=3))
+
+
+@pytest.mark.parametrize("bits", [1, 3, 4, 5])
+def test_palette_table_matches_linear_scan_16(bits, linear_scan):
+    palette = COLOR_MAP_256[:16]
+    table = PaletteTable(palette, bits=bits)
+
+    for r, g, b in GRID:
+        color = RGBColor(r, g, b)
+        assert table.lookup(color) == linear_scan(color, palette)
+
+
+def test_palette_table_matches_linear_scan_custom_palette(linear_scan):
+    # includes a duplicate entry (the lower index should win) and colors sitting off the grid cell boundaries
+    palette = [
+        RGBColor(12, 200, 31),
+        RGBColor(250, 250, 250),
+        RGBColor(12, 200, 31),
+        RGBColor(99, 0, 180),
+        RGBColor(0, 0, 0),
+        RGBColor(130, 128, 127),
+    ]
+    table = PaletteTable(palette)
+
+    for r, g, b in GRID:
+        color = RGBColor(r, g, b)
+        assert table.lookup(color) == linear_scan(color, palette)
+
+    assert table.lookup(RGBColor(12, 200, 31)) == 0
+
+
+@pytest.mark.parametrize(
+    "color",
+    [
+        RGBColor(64, 64, 64),  # halfway between 0 -> (0, 0, 0) and 8 -> (128, 128, 128)
+        RGBColor(191, 0, 0),
+        RGBColor(192, 0, 0),
+    ]
+)
+def test_palette_table_tiebreaks_like_linear_scan(color, linear_scan):
+    palette = COLOR_MAP_256[:16]
+    assert PaletteTable(palette).lookup(color) == linear_scan(color, palette)
+
+
+def test_palette_table_is_built_lazily():
+    table = PaletteTable(COLOR_MAP_256[:16], bits=3)
+
+    assert not table.is_built
+    assert table.stats().built is False
+
+    table.lookup(RGBColor(1, 2, 3))
+
+    stats = table.stats()
+    assert table.is_built
+    assert stats.built is True
+    assert stats.cells == 8 ** 3
+    assert stats.build_time_ns > 0
+    assert stats.nbytes > 0
+
+
+def test_palette_table_build_is_idempotent():
+    table = PaletteTable(COLOR_MAP_256[:16], bits=2)
+    table.build()
+    stats = table.stats()
+    table.build()
+
+    assert table.stats() == stats
+
+
+def test_get_palette_table_16():
+    table = get_palette_table(ColorMode.STANDARD_16)
+    assert table.palette == tuple(COLOR_MAP_256[:16])
+
+
+@pytest.mark.parametrize("mode", [ColorMode.AUTO, ColorMode.TRUE_COLOR, ColorMode.NONE, ColorMode.EXTENDED_256])
+def test_get_palette_table_raises_without_table(mode):
+    with pytest.raises(ValueError, match="There is no palette lookup table"):
+        get_palette_table(mode)
+
+
+def test_palette_table_raises_on_empty_palette():
+    with pytest.raises(ValueError, match="empty palette"):
+        PaletteTable([])
+
+
+@pytest.mark.parametrize("bits", [0, 7, 8])
+def test_palette_table_raises_on_invalid_resolution(bits):
+    with pytest.raises(ValueError, match="Lookup table resolution"):
+        PaletteTable(COLOR_MAP_256[:16], bits=bits)
@@ -1,3 +1,5 @@
+import itertools
+
 import pytest
 
 from niji import ColorMode, RGBColor
@@ -121,3 +123,27 @@ def test_finding_quantized_index_for_nonquantized_color_16_tiebreak(truecolor, q
 def test_find_quantized_index_raises_when_not_indexed_mode(mode):
     with pytest.raises(ValueError, match="Quantizing is only valid on 16/256 color modes"):
         find_quantized_index(RGBColor(0, 0, 0), mode)
+
+
+# channel values on and around the cube levels and their midpoints, where tie-breaking matters most
+BOUNDARY_CHANNEL_VALUES = [0, 1, 4, 5, 47, 48, 94, 95, 96, 114, 115, 116, 155, 195, 235, 236, 254, 255]
+
+
+@pytest.mark.parametrize("red", BOUNDARY_CHANNEL_VALUES)
+def test_find_quantized_index_256_matches_linear_scan_at_boundaries(red, linear_scan):
+    for green, blue in itertools.product(BOUNDARY_CHANNEL_VALUES, repeat=2):
+        color = RGBColor(red, green, blue)
+        assert find_quantized_index(color, ColorMode.EXTENDED_256) == linear_scan(color, COLOR_MAP_256)
+
+
+@pytest.mark.parametrize("red", range(0, 256, 15))
+def test_find_quantized_index_256_matches_linear_scan_on_grid(red, linear_scan):
+    for green, blue in itertools.product(range(0, 256, 15), repeat=2):
+        color = RGBColor(red, green, blue)
+        assert find_quantized_index(color, ColorMode.EXTENDED_256) == linear_scan(color, COLOR_MAP_256)
+
+
+@pytest.mark.parametrize("value", range(256))
+def test_find_quantized_index_256_matches_linear_scan_on_grays(value, linear_scan):
+    color = RGBColor(value, value, value)
+    assert find_quantized_index(color, ColorMode.EXTENDED_256) == linear_scan(color, COLOR_MAP_256)
@@ -0,0 +1,150 @@
+import itertools
+import re
+
+import pytest
+
+from niji import ColorMode, RGBColor, Style, TextStyle, colored
+from niji.spans import SGRState, render_spans, sgr_transition
+
+OFF_CODES = {22: (1, 2), 23: (3,), 24: (4,), 25: (5,), 27: (7,), 28: (8,), 29: (9,)}
+
+
+def simulate(rendered: str) -> list[tuple[str, tuple]]:
+    """Interpret the SGR codes in the rendered string like a terminal would, returning each character with the
+    (attributes, fg, bg) state it is displayed in, and finally the state left behind.
+    """
+    attributes: set[int] = set()
+    fg = bg = None
+    cells = []
+
+    for part in re.split(r"(\033\[[0-9;]*m)", rendered):
+        if not part.startswith("\033["):
+            cells.extend((char, (frozenset(attributes), fg, bg)) for char in part)
+            continue
+
+        params = [int(p) for p in part[2:-1].split(";")]
+        while params:
+            code = params.pop(0)
+            if code == 0:
+                attributes.clear()
+                fg = bg = None
+            elif code in OFF_CODES:
+                attributes.difference_update(OFF_CODES[code])
+            elif 1 <= code <= 9:
+                attributes.add(code)
+            elif code in (38, 48):
+                kind = params.pop(0)
+                value = tuple(params[:3 if kind == 2 else 1])
+                del params[:len(value)]
+                if code == 38:
+                    fg = (kind, value)
+                else:
+                    bg = (kind, value)
+            elif code == 39:
+                fg = None
+            elif code == 49:
+                bg = None
+            elif 30 <= code <= 37 or 90 <= code <= 97:
+                fg = (code,)
+            elif 40 <= code <= 47 or 100 <= code <= 107:
+                bg = (code,)
+            else:
+                raise AssertionError(f"unexpected code {code}")
+
+    cells.append(("", (frozenset(attributes), fg, bg)))
+    return cells
+
+
+STYLES = [
+    None,
+    Style(fg=RGBColor(255, 0, 0)),
+    Style(fg=RGBColor(255, 0, 0), styles=TextStyle.BOLD),
+    Style(fg=RGBColor(0, 255, 0), styles=TextStyle.BOLD | TextStyle.DIM),
+    Style(styles=TextStyle.DIM | TextStyle.UNDERLINE),
+    Style(bg=RGBColor(0, 0, 255), styles=TextStyle.ITALIC),
+    Style(fg=RGBColor(10, 20, 30), bg=RGBColor(0, 0, 255), styles=TextStyle.STRIKEOUT | TextStyle.REVERSE),
+    Style(styles=TextStyle.NONE),
+]
+
+MODES = [ColorMode.TRUE_COLOR, ColorMode.EXTENDED_256, ColorMode.STANDARD_16]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_render_spans_displays_like_colored(mode):
+    for first, second, third in itertools.product(STYLES, repeat=3):
+        spans = [("ab", first), ("cd", second), ("ef", third)]
+
+        rendered = render_spans(spans, mode)
+        expected = "".join(colored(text, fg=s and s.fg, bg=s and s.bg, styles=s and s.styles, mode=mode)
+                           for text, s in spans)
+
+        rendered_cells = simulate(rendered)
+        expected_cells = simulate(expected)
+        assert rendered_cells == expected_cells
+
+        # the terminal is always left in its default state
+        assert rendered_cells[-1][1] == (frozenset(), None, None)
+
+
+def test_render_spans_emits_only_the_changes():
+    bold_red = Style(fg=RGBColor(255, 0, 0), styles=TextStyle.BOLD)
+    red = Style(fg=RGBColor(255, 0, 0))
+
+    rendered = render_spans([("a", bold_red), ("b", red), ("c", bold_red)])
+
+    assert rendered == "\033[1;38;2;255;0;0ma\033[22mb\033[1mc\033[0m"
+
+
+def test_render_spans_keeps_dim_when_turning_off_bold():
+    rendered = render_spans([
+        ("a", Style(fg=RGBColor(255, 0, 0), styles=TextStyle.BOLD | TextStyle.DIM)),
+        ("b", Style(fg=RGBColor(255, 0, 0), styles=TextStyle.DIM)),
+    ])
+    assert rendered == "\033[1;2;38;2;255;0;0ma\033[22;2mb\033[0m"
+
+
+def test_render_spans_resets_when_shorter():
+    rendered = render_spans([("a", Style(styles=TextStyle.BOLD | TextStyle.DIM)), ("b", Style(styles=TextStyle.DIM))])
+    assert rendered == "\033[1;2ma\033[0;2mb\033[0m"
+
+
+def test_render_spans_uses_default_color_codes():
+    rendered = render_spans([
+        ("a", Style(fg=RGBColor(255, 0, 0), bg=RGBColor(0, 0, 255), styles=TextStyle.ITALIC)),
+        ("b", Style(bg=RGBColor(0, 0, 255), styles=TextStyle.ITALIC)),
+    ])
+    assert rendered == "\033[3;38;2;255;0;0;48;2;0;0;255ma\033[39mb\033[0m"
+
+
+def test_render_spans_skips_repeated_styles_and_empty_spans():
+    red = Style(fg=RGBColor(255, 0, 0))
+    rendered = render_spans([("a", red), ("", None), ("b", Style(fg="#FF0000"))])
+    assert rendered == "\033[38;2;255;0;0mab\033[0m"
+
+
+def test_render_spans_plain_text():
+    assert render_spans([("a", None), ("b", None)]) == "ab"
+
+
+def test_render_spans_none_mode():
+    assert render_spans([("a", Style(fg=RGBColor(255, 0, 0))), ("b", None)], ColorMode.NONE) == "ab"
+
+
+def test_render_spans_raises_with_auto_mode():
+    with pytest.raises(ValueError, match="is not supported"):
+        render_spans([("a", None)], ColorMode.AUTO)
+
+
+@pytest.mark.parametrize(
+    "old, new, expected",
+    [
+        (SGRState(), SGRState(), ""),
+        (SGRState(TextStyle.BOLD), SGRState(), "0"),
+        (SGRState(TextStyle.BOLD, fg="31"), SGRState(fg="31"), "22"),
+        (SGRState(fg="31"), SGRState(fg="32"), "32"),
+        (SGRState(fg="31", bg="44"), SGRState(bg="44"), "39"),
+        (SGRState(TextStyle.ITALIC | TextStyle.UNDERLINE), SGRState(TextStyle.ITALIC), "24"),
+    ]
+)
+def test_sgr_transition(old, new, expected):
+    assert sgr_transition(old, new) == expected
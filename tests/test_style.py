@@ -0,0 +1,69 @@
+import pytest
+
+from niji import ColorMode, RGBColor, Style, TextStyle, colored
+from niji.colors import COLOR_MAP_256
+
+
+def test_style_parses_colors_once():
+    style = Style(fg="#FF0000", bg=[0, 0, 255], styles=TextStyle.BOLD)
+
+    assert style.fg == RGBColor(255, 0, 0)
+    assert style.bg == RGBColor(0, 0, 255)
+    assert style.styles == TextStyle.BOLD
+
+
+def test_style_raises_on_invalid_color():
+    with pytest.raises(ValueError, match="Should be a hex string."):
+        Style(fg="red")
+
+
+@pytest.mark.parametrize("mode", [ColorMode.TRUE_COLOR, ColorMode.EXTENDED_256, ColorMode.STANDARD_16, ColorMode.NONE])
+@pytest.mark.parametrize(
+    "fg, bg, styles",
+    [
+        (RGBColor(128, 131, 147), None, None),
+        (None, "#0BFF2C", None),
+        (None, None, TextStyle.ITALIC | TextStyle.DIM),
+        (COLOR_MAP_256[37], COLOR_MAP_256[112], TextStyle.UNDERLINE),
+        ((1, 2, 3), 200, TextStyle.NONE),
+        (None, None, None),
+    ]
+)
+def test_style_render_matches_colored(mode, fg, bg, styles):
+    style = Style(fg=fg, bg=bg, styles=styles)
+    assert style.render("some text", mode) == colored("some text", fg=fg, bg=bg, styles=styles, mode=mode)
+
+
+def test_style_call_defaults_to_truecolor():
+    style = Style(fg=RGBColor(128, 131, 147))
+    assert style("some text") == "\033[38;2;128;131;147msome text\033[0m"
+
+
+def test_style_prefix():
+    style = Style(fg=COLOR_MAP_256[56], styles=TextStyle.BOLD)
+
+    assert style.prefix(ColorMode.EXTENDED_256) == "\033[1;38;5;56m"
+    assert style.prefix(ColorMode.NONE) == ""
+
+
+def test_style_prefix_is_cached_per_mode():
+    style = Style(fg=RGBColor(128, 131, 147))
+
+    assert style.prefix(ColorMode.TRUE_COLOR) is style.prefix(ColorMode.TRUE_COLOR)
+    assert style.prefix(ColorMode.TRUE_COLOR) != style.prefix(ColorMode.EXTENDED_256)
+
+
+def test_style_raises_with_auto_mode():
+    with pytest.raises(ValueError, match="is not supported"):
+        Style(fg=RGBColor(255, 0, 0)).render("some text", ColorMode.AUTO)
+
+
+def test_style_equality_and_hash():
+    a = Style(fg="#FF0000", styles=TextStyle.BOLD)
+    b = Style(fg=(255, 0, 0), styles=TextStyle.BOLD)
+    c = Style(fg=(255, 0, 0))
+
+    assert a == b
+    assert hash(a) == hash(b)
+    assert a != c
+    assert len({a, b, c}) == 2
@@ -0,0 +1,122 @@
+import itertools
+
+import pytest
+
+from niji import ColoredText, ColorMode, Style, TextStyle, center, remove_ansi_codes, render_table, visible_width
+
+BOLD = Style(styles=TextStyle.BOLD)
+GREEN = Style(fg="#00FF00")
+ROWS = [("alice", 3, "ok"), ("bob", 12345, "failed"), ("日本", 1, "ok")]
+
+
+def test_render_table_plain():
+    lines = list(render_table(ROWS, header=["name", "n", "status"], align=["<", ">", "^"], mode=ColorMode.NONE))
+
+    assert lines == [
+        "name       n  status",
+        "alice      3    ok  ",
+        "bob    12345  failed",
+        "日本       1    ok  ",
+    ]
+
+
+def test_render_table_styles_columns():
+    lines = list(render_table(ROWS, [BOLD, None, GREEN], mode=ColorMode.TRUE_COLOR))
+
+    assert lines[0] == "\033[1malice\033[0m  3      \033[38;2;0;255;0mok    \033[0m"
+    assert lines[1] == "\033[1mbob  \033[0m  12345  \033[38;2;0;255;0mfailed\033[0m"
+
+
+def test_render_table_header_style():
+    header, *_ = render_table(ROWS, [BOLD, None, GREEN], header=["name", "n", "status"], header_style=BOLD,
+                              mode=ColorMode.EXTENDED_256)
+
+    assert header == "\033[1mname \033[0m  \033[1mn    \033[0m  \033[1mstatus\033[0m"
+
+
+def test_render_table_colored_text_cells():
+    red = Style(fg="#FF0000")
+    lines = list(render_table([[ColoredText("error", red), "x"]], mode=ColorMode.STANDARD_16))
+
+    assert lines == [f"{red.render('error', ColorMode.STANDARD_16)}  x"]
+
+
+def test_render_table_column_style_applies_after_cell_resets():
+    red = Style(fg="#FF0000")
+    cell = ColoredText("err", red) + ColoredText("or!", BOLD)
+    lines = list(render_table([[cell], ["ok"]], [GREEN], widths=[7], mode=ColorMode.TRUE_COLOR))
+
+    green, code = GREEN.prefix(), GREEN.prefix()[2:-1]
+    assert lines[0] == f"{green}{red.prefix()}err\033[0;{code};1mor!\033[0;{code}m \033[0m"
+    assert lines[1] == f"{green}ok     \033[0m"
+
+    # the "…" of a truncated cell is in the column's style too
+    truncated = next(render_table([[cell]], [GREEN], widths=[4], mode=ColorMode.TRUE_COLOR))
+    assert truncated == f"{green}{red.prefix()}err\033[0;{code};1m\033[0;{code}m…\033[0m"
+
+
+@pytest.mark.parametrize("text", ["a", "ab", "abc", "日本"])
+@pytest.mark.parametrize("width", [4, 5, 6, 7])
+def test_render_table_centers_like_center(text, width):
+    assert next(render_table([[text]], widths=[width], align="^", mode=ColorMode.NONE)) == center(text, width)
+
+
+@pytest.mark.parametrize("mode", [ColorMode.TRUE_COLOR, ColorMode.EXTENDED_256, ColorMode.STANDARD_16, ColorMode.NONE])
+def test_render_table_columns_line_up(mode):
+    rows = [(name, i * 37, "日本" * (i % 3)) for i, name in enumerate(["a", "bbbb", "cc", "dddddddd"])]
+    lines = list(render_table(rows, [BOLD, GREEN, None], header=["name", "value", "text"], mode=mode))
+
+    assert len({visible_width(line) for line in lines}) == 1
+
+
+def test_render_table_fixed_widths_truncate():
+    lines = list(render_table(ROWS, [BOLD, None, None], widths=[3, 3, 4], mode=ColorMode.NONE))
+
+    assert lines == ["al…  3    ok  ", "bob  12…  fai…", "日…  1    ok  "]
+
+
+def test_render_table_sample_truncates_later_rows():
+    rows = [("a",), ("bb",), ("a very long cell",)]
+    lines = list(render_table(rows, sample=2, mode=ColorMode.NONE))
+
+    assert lines == ["a ", "bb", "a…"]
+
+
+def test_render_table_short_rows_are_padded():
+    lines = list(render_table([("a", "b"), ("c",)], mode=ColorMode.NONE, separator="|"))
+
+    assert lines == ["a|b", "c| "]
+
+
+def test_render_table_is_lazy():
+    rows = (("row", i) for i in itertools.count())
+    lines = render_table(rows, widths=[3, 5], mode=ColorMode.NONE)
+
+    assert list(itertools.islice(lines, 3)) == ["row  0    ", "row  1    ", "row  2    "]
+
+
+def test_render_table_only_samples_the_first_rows():
+    rows = (("row", i) for i in itertools.count())
+    lines = render_table(rows, sample=10, mode=ColorMode.NONE)
+
+    assert next(lines) == "row  0"
+    assert remove_ansi_codes(next(lines)) == "row  1"
+
+
+def test_render_table_too_many_cells():
+    with pytest.raises(ValueError):
+        list(render_table([("a",), ("b", "c")], widths=[1], mode=ColorMode.NONE))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"mode": ColorMode.AUTO},
+        {"align": "?"},
+        {"align": ["<"]},
+        {"styles": [BOLD]},
+    ]
+)
+def test_render_table_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        list(render_table(ROWS, **kwargs))
@@ -1,6 +1,6 @@
 import pytest
 
-from niji.styles import TextStyle, get_style_ansi_code_component
+from niji.styles import _SGR_ATTRIBUTE_CODES, TextStyle, get_style_ansi_code_component, get_style_sgr_codes
 
 
 @pytest.mark.parametrize(
@@ -32,3 +32,35 @@ def test_style_ansi_code_multiple(style: TextStyle, expected_ansi: str):
 
 def test_style_ansi_code_none():
     assert get_style_ansi_code_component(styles=None) == ""
+
+
+def _all_combinations():
+    flags = [style for style in _SGR_ATTRIBUTE_CODES if style != TextStyle.NONE]
+    for value in range(1 << len(flags)):
+        combination = TextStyle.NONE
+        for i, flag in enumerate(flags):
+            if value & (1 << i):
+                combination |= flag
+
+        yield combination
+
+
+def test_style_ansi_code_every_combination():
+    for styles in _all_combinations():
+        codes = sorted(code for style, code in _SGR_ATTRIBUTE_CODES.items() if style & styles)
+        expected = ";".join(map(str, codes)) if codes else "0"
+
+        assert get_style_ansi_code_component(styles) == expected
+        assert get_style_sgr_codes(styles) == tuple(codes)
+
+
+@pytest.mark.parametrize(
+    "style, expected_codes",
+    [
+        (TextStyle.NONE, ()),
+        (TextStyle.BOLD, (1,)),
+        (TextStyle.STRIKEOUT | TextStyle.BOLD | TextStyle.REVERSE, (1, 7, 9)),
+    ]
+)
+def test_style_sgr_codes(style: TextStyle, expected_codes: tuple[int, ...]):
+    assert get_style_sgr_codes(style) == expected_codes
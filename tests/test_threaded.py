@@ -0,0 +1,120 @@
+import io
+import re
+import threading
+
+import pytest
+
+from niji import ColorMode, RGBColor, Style, ThreadSafePrinter
+
+RED = Style(fg=RGBColor(255, 0, 0))
+RED_PREFIX = "\033[38;2;255;0;0m"
+BLUE_PREFIX = "\033[38;2;0;0;255m"
+
+
+class RecordingStream(io.StringIO):
+    """Record each write call separately."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write(self, s):
+        self.writes.append(s)
+        return super().write(s)
+
+
+def test_print_is_a_single_write_ending_in_a_reset():
+    stream = RecordingStream()
+    printer = ThreadSafePrinter(stream, mode=ColorMode.TRUE_COLOR)
+
+    printer.print("hello", RED)
+    printer.print("plain", end="!")
+
+    assert stream.writes == [f"{RED_PREFIX}hello\033[0m\n", "plain\033[0m!"]
+
+
+def test_line_assembles_segments():
+    stream = RecordingStream()
+    printer = ThreadSafePrinter(stream, mode=ColorMode.TRUE_COLOR)
+
+    with printer.line():
+        printer.write("a", RED)
+        printer.write("b", fg="#FF0000")
+        printer.write(" and ")
+        printer.write("c", fg="#0000FF")
+        assert stream.writes == []
+
+    assert stream.writes == [f"{RED_PREFIX}ab\033[0m and {BLUE_PREFIX}c\033[0m\n"]
+
+
+def test_nested_lines_and_prints_join_the_outer_line():
+    stream = RecordingStream()
+    printer = ThreadSafePrinter(stream, mode=ColorMode.NONE)
+
+    with printer.line(end=""):
+        printer.print("first")
+        with printer.line(end="; "):
+            printer.write("second")
+        printer.write("third")
+
+    assert stream.writes == ["first\nsecond; third"]
+
+
+def test_write_outside_a_line_is_written_immediately():
+    stream = RecordingStream()
+    printer = ThreadSafePrinter(stream, mode=ColorMode.TRUE_COLOR)
+
+    printer.write("x", RED)
+    assert stream.writes == [f"{RED_PREFIX}x\033[0m"]
+
+
+def test_line_is_written_even_if_the_block_raises():
+    stream = RecordingStream()
+    printer = ThreadSafePrinter(stream, mode=ColorMode.NONE)
+
+    with pytest.raises(RuntimeError):
+        with printer.line():
+            printer.write("partial")
+            raise RuntimeError
+
+    printer.print("next")
+    assert stream.writes == ["partial\n", "next\n"]
+
+
+def test_style_and_colors_are_exclusive():
+    printer = ThreadSafePrinter(io.StringIO(), mode=ColorMode.TRUE_COLOR)
+
+    with pytest.raises(ValueError):
+        printer.print("x", RED, fg="#FF0000")
+
+
+def test_printers_share_a_lock_per_stream():
+    stream = io.StringIO()
+    assert ThreadSafePrinter(stream)._lock is ThreadSafePrinter(stream)._lock
+    assert ThreadSafePrinter(stream)._lock is not ThreadSafePrinter(io.StringIO())._lock
+
+
+def test_threads_never_interleave():
+    stream = RecordingStream()
+    printer = ThreadSafePrinter(stream, mode=ColorMode.TRUE_COLOR)
+
+    def work(n):
+        for i in range(200):
+            with printer.line():
+                printer.write(f"thread {n} ", RED)
+                printer.write(f"line {i}", fg="#0000FF")
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    pattern = re.compile(rf"{re.escape(RED_PREFIX)}thread (\d) \033\[0m{re.escape(BLUE_PREFIX)}line (\d+)\033\[0m\n")
+    lines = stream.getvalue().splitlines(keepends=True)
+    assert len(lines) == 8 * 200
+    assert all(pattern.fullmatch(line) for line in lines)
+
+    for n in range(8):
+        assert [int(m[2]) for m in map(pattern.fullmatch, lines) if m[1] == str(n)] == list(range(200))
+
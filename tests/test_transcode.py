@@ -0,0 +1,101 @@
+import random
+from io import BytesIO
+
+import pytest
+
+from niji import ColorMode, RGBColor, TextStyle, colored, iter_transcode, transcode
+from niji.colors import COLOR_MAP_256
+from niji.transcode import get_transcode_cache
+
+MODES = [ColorMode.EXTENDED_256, ColorMode.STANDARD_16, ColorMode.NONE]
+
+
+def random_configs(n, seed=0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        fg = RGBColor(*(rng.randrange(256) for _ in range(3)))
+        bg = RGBColor(*(rng.randrange(256) for _ in range(3))) if rng.random() < 0.5 else None
+        styles = rng.choice([None, TextStyle.BOLD, TextStyle.ITALIC | TextStyle.UNDERLINE])
+        yield fg, bg, styles
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_transcode_matches_colored(mode):
+    for fg, bg, styles in random_configs(500):
+        rendered = colored("text", fg=fg, bg=bg, styles=styles)
+        assert transcode(rendered, mode) == colored("text", fg=fg, bg=bg, styles=styles, mode=mode)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_transcode_bytes(mode):
+    for fg, bg, styles in random_configs(100, seed=1):
+        rendered = colored("text", fg=fg, bg=bg, styles=styles).encode()
+        assert transcode(rendered, mode) == colored("text", fg=fg, bg=bg, styles=styles, mode=mode).encode()
+
+
+def test_transcode_256_to_16():
+    for index, color in enumerate(COLOR_MAP_256):
+        rendered = f"\033[38;5;{index};48;5;{index}mx"
+        assert transcode(rendered, ColorMode.STANDARD_16) == colored("x", fg=color, bg=color,
+                                                                      mode=ColorMode.STANDARD_16)[:-4]
+
+
+@pytest.mark.parametrize(
+    "s, mode, expected",
+    [
+        # colon-separated colors, with and without a color space
+        ("\033[38:2::255:0:0mx", ColorMode.STANDARD_16, "\033[91mx"),
+        ("\033[48:2:0:0:255mx", ColorMode.STANDARD_16, "\033[104mx"),
+        ("\033[38:2:0:255:0:0mx", ColorMode.EXTENDED_256, "\033[38;5;9mx"),
+        # 256 colors are already supported in 256-color mode
+        ("\033[38;5;123mx", ColorMode.EXTENDED_256, "\033[38;5;123mx"),
+        # malformed colors are left alone
+        ("\033[38;2;300;0;0mx", ColorMode.STANDARD_16, "\033[38;2;300;0;0mx"),
+        ("\033[38;2;1mx", ColorMode.STANDARD_16, "\033[38;2;1mx"),
+        # other sequences are left alone
+        ("\033[2K\033]8;;https://example.com\033\\link", ColorMode.NONE,
+         "\033[2K\033]8;;https://example.com\033\\link"),
+        ("\033[1;4mx\033[0m", ColorMode.STANDARD_16, "\033[1;4mx\033[0m"),
+        ("\033[1;4mx\033[0m", ColorMode.NONE, "x"),
+    ]
+)
+def test_transcode_sequences(s, mode, expected):
+    assert transcode(s, mode) == expected
+
+
+def test_transcode_true_color_is_unchanged():
+    s = colored("text", fg="#123456")
+    assert transcode(s, ColorMode.TRUE_COLOR) is s
+
+
+def test_transcode_auto():
+    with pytest.raises(ValueError):
+        transcode("text", ColorMode.AUTO)
+
+
+def test_transcode_memoizes_sequences():
+    cache = get_transcode_cache()
+    cache.clear()
+
+    line = colored("warning", fg="#FFAA00", styles=TextStyle.BOLD) + "\n"
+    transcode(line * 100, ColorMode.STANDARD_16)
+
+    stats = cache.stats()
+    assert stats.misses == 2  # the color and the reset
+    assert stats.hits == 198
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+@pytest.mark.parametrize("mode", MODES)
+def test_iter_transcode_chunks(size, mode):
+    text = "".join(colored("text ", fg=fg, bg=bg, styles=styles) for fg, bg, styles in random_configs(20, seed=2))
+    chunks = [text[i:i + size] for i in range(0, len(text), size)]
+
+    assert "".join(iter_transcode(chunks, mode)) == transcode(text, mode)
+
+
+def test_iter_transcode_binary_file():
+    text = colored("some text", fg="#0D942B", bg="#7B2CBE") + "\nplain\n"
+    transcoded = iter_transcode(BytesIO(text.encode()), ColorMode.EXTENDED_256, chunk_size=4)
+
+    assert b"".join(transcoded) == transcode(text, ColorMode.EXTENDED_256).encode()
@@ -0,0 +1,156 @@
+import textwrap
+
+import pytest
+
+from niji import center, colored, ljust, remove_ansi_codes, rjust, truncate, visible_width, wrap
+from niji.width import char_width
+
+RED = "\033[31m"
+BOLD = "\033[1m"
+RESET = "\033[0m"
+LINK = "\033]8;;https://example.com\033\\"
+CLOSE_LINK = "\033]8;;\033\\"
+
+
+@pytest.mark.parametrize(
+    "char, expected",
+    [
+        ("a", 1),
+        (" ", 1),
+        ("\t", 0),
+        ("é", 1),
+        ("日", 2),
+        ("Ａ", 2),  # fullwidth
+        ("😀", 2),
+        ("́", 0),  # combining acute accent
+        ("‍", 0),  # zero-width joiner
+    ]
+)
+def test_char_width(char, expected):
+    assert char_width(char) == expected
+
+
+@pytest.mark.parametrize(
+    "s, expected",
+    [
+        ("", 0),
+        ("hello", 5),
+        (f"{RED}hello{RESET}", 5),
+        (colored("hello", fg="#FF8000", bg=(0, 0, 255)), 5),
+        ("日本語", 6),
+        (f"{BOLD}日本{RESET} text", 9),
+        ("é", 1),
+        (f"{LINK}link{CLOSE_LINK}", 4),
+        ("\033[2K\033[10;20Hcursor", 6),
+    ]
+)
+def test_visible_width(s, expected):
+    assert visible_width(s) == expected
+
+
+@pytest.mark.parametrize(
+    "s, width, placeholder, expected",
+    [
+        ("hello", 10, "", "hello"),
+        ("hello", 5, "…", "hello"),
+        ("hello world", 5, "", "hello"),
+        ("hello world", 6, "…", "hello…"),
+        (f"{RED}hello world{RESET}", 5, "", f"{RED}hello{RESET}"),
+        (f"{RED}hello{RESET} world", 7, "", f"{RED}hello{RESET} w"),
+        (f"{RED}he{BOLD}llo world", 4, "", f"{RED}he{BOLD}ll{RESET}"),
+        ("\033[38;2;255;0;0mhello world", 3, "", f"\033[38;2;255;0;0mhel{RESET}"),
+        (f"{LINK}hello world{CLOSE_LINK}", 5, "", f"{LINK}hello{CLOSE_LINK}"),
+        # wide characters are never split
+        ("日本語", 5, "", "日本"),
+        ("日本語", 4, "…", "日…"),
+    ]
+)
+def test_truncate(s, width, placeholder, expected):
+    assert truncate(s, width, placeholder=placeholder) == expected
+
+
+def test_truncate_placeholder_too_wide():
+    with pytest.raises(ValueError):
+        truncate("hello world", 2, placeholder="...")
+
+
+@pytest.mark.parametrize("s", ["", "a", "ab", "abc", "hello", "hello world"])
+@pytest.mark.parametrize("width", range(13))
+@pytest.mark.parametrize("fillchar", [" ", "*"])
+def test_justify_matches_str_methods_on_plain_text(s, width, fillchar):
+    assert ljust(s, width, fillchar) == s.ljust(width, fillchar)
+    assert rjust(s, width, fillchar) == s.rjust(width, fillchar)
+    assert center(s, width, fillchar) == s.center(width, fillchar)
+
+
+@pytest.mark.parametrize("s", [f"{RED}abc{RESET}", f"{BOLD}日本{RESET}", colored("text", fg="#00FF00")])
+@pytest.mark.parametrize("width", range(10))
+def test_justify_uses_visible_width(s, width):
+    plain = remove_ansi_codes(s)
+    padding = max(width - visible_width(s), 0)
+
+    for justified in (ljust(s, width), rjust(s, width), center(s, width)):
+        assert visible_width(justified) == max(width, visible_width(s))
+        assert justified.count(" ") == padding + plain.count(" ")
+        assert s in justified
+
+
+def test_justify_invalid_fillchar():
+    with pytest.raises(TypeError):
+        ljust("text", 10, "ab")
+
+    with pytest.raises(TypeError):
+        center("text", 10, "日")
+
+
+@pytest.mark.parametrize(
+    "s",
+    [
+        "the quick brown fox jumps over the lazy dog",
+        "a bb ccc dddd eeeee ffffff ggggggg",
+        "   leading whitespace is kept",
+        "short",
+    ]
+)
+@pytest.mark.parametrize("width", range(6, 20))
+def test_wrap_matches_textwrap_on_plain_text(s, width):
+    # (textwrap occasionally leaves a trailing space on a line before a split word)
+    expected = [line.rstrip() for line in textwrap.wrap(s, width, break_on_hyphens=False)]
+    assert wrap(s, width) == expected
+
+
+@pytest.mark.parametrize(
+    "s, width, expected",
+    [
+        ("hello world", 5, ["hello", "world"]),
+        ("abcdefghij", 3, ["abc", "def", "ghi", "j"]),
+        ("line one\nline two", 20, ["line one", "line two"]),
+        ("a\n\nb", 5, ["a", "", "b"]),
+        ("日本語テキスト", 5, ["日本", "語テ", "キス", "ト"]),
+        (f"{RED}hello world{RESET}", 5, [f"{RED}hello{RESET}", f"{RED}world{RESET}"]),
+        (f"{RED}hello{RESET} world", 5, [f"{RED}hello{RESET}", "world"]),
+        (f"hello {BOLD}world{RESET}", 5, ["hello", f"{BOLD}world{RESET}"]),
+        (f"{RED}ab{BOLD}cdef{RESET}", 3, [f"{RED}ab{BOLD}c{RESET}", f"{RED}{BOLD}def{RESET}"]),
+        (
+            f"see {LINK}the docs{CLOSE_LINK}",
+            4,
+            ["see", f"{LINK}the{CLOSE_LINK}", f"{LINK}docs{CLOSE_LINK}"],
+        ),
+    ]
+)
+def test_wrap(s, width, expected):
+    assert wrap(s, width) == expected
+
+
+@pytest.mark.parametrize("width", range(1, 15))
+def test_wrap_keeps_visible_text(width):
+    s = colored("the quick brown", fg="#FF0000") + " fox " + colored("jumps over 日本語", styles=None, bg="#0000FF")
+    lines = wrap(s, width)
+
+    assert all(visible_width(line) <= max(width, 2) for line in lines)
+    assert "".join(remove_ansi_codes(line) for line in lines).replace(" ", "") == remove_ansi_codes(s).replace(" ", "")
+
+
+def test_wrap_invalid_width():
+    with pytest.raises(ValueError):
+        wrap("text", 0)